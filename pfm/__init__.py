@@ -0,0 +1,7 @@
+"""
+Personal Finance Manager.
+
+Run the interactive menus with `python -m pfm` (or `python main.py`), or
+a non-interactive command with `python -m pfm <command> ...` (see cli.py).
+Submodules are not imported here, so importing the package is cheap.
+"""
@@ -0,0 +1,8 @@
+import sys
+
+if len(sys.argv) > 1:
+    from .cli import main
+    raise SystemExit(main())
+else:
+    from .app import main
+    main()
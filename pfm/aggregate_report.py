@@ -0,0 +1,260 @@
+"""
+Installation-wide report: totals across every user's transaction file.
+
+Map-reduce over data/transactions/transactions_*.json: each file is turned
+into a small partial aggregate (income, expenses by category, expenses by
+month and category, all in cents) in a process pool, using the same sums
+as category_breakdown() and spending_trends(), and the partials are added
+up.
+
+Archived months (see archive.py) are added from each user's archive
+index, without decompressing the archives.
+
+Partials are cached in data/reports/aggregate_cache.json keyed on each
+file's (and archive index's) modification time and size, so a rerun only
+re-reads the users whose transactions changed.
+"""
+import datetime # For date/time handling
+import glob
+import os # For file operations
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .archive import ARCHIVE_DIR
+from .file_lock import read_json, write_json
+from .models import Transaction
+from .money import from_cents
+from .transaction_manager import category_totals, monthly_spending_totals
+
+
+TRANSACTIONS_DIR = os.path.join('data', 'transactions')
+AGGREGATE_CACHE_FILE = os.path.join('data', 'reports', 'aggregate_cache.json')
+
+# Below this many changed files a process pool costs more than it saves
+MIN_FILES_FOR_POOL = 4
+
+# Bumped when the partials change shape, so cached partials of the old shape are recomputed
+PARTIAL_FORMAT = 2
+
+
+def transaction_files(directory=TRANSACTIONS_DIR):
+    """Return every user's transaction file (backups excluded), sorted by name."""
+    return sorted(
+        path for path in glob.glob(os.path.join(directory, 'transactions_*.json'))
+        if not path.endswith('_backup.json')
+    )
+
+
+def archive_index_of(path):
+    """Return the archive index that belongs to a transaction file."""
+    owner = os.path.basename(path)[len('transactions_'):-len('.json')]  # "<name>_<id>"
+    return os.path.join(ARCHIVE_DIR, owner, 'index.json')
+
+
+def _file_key(path):
+    stat = os.stat(path)
+    key = [PARTIAL_FORMAT, stat.st_mtime_ns, stat.st_size]
+    try:
+        archive_stat = os.stat(archive_index_of(path))
+        key += [archive_stat.st_mtime_ns, archive_stat.st_size]
+    except FileNotFoundError:
+        pass
+    return key
+
+
+# =============================================================Map=================================================================
+
+def file_partial(path):
+    """
+    Compute one file's partial aggregate (runs inside a worker process).
+
+    Returns:
+        dict: {"transactions", "income_cents", "expense_cents_by_category",
+               "expense_cents_by_month": {"YYYY-MM": {category: cents}}}
+    """
+    records, _ = read_json(path, default=[])
+    transaction_list = [Transaction.from_dict(r) for r in records or []]
+    income, by_category = category_totals(transaction_list)
+    by_month = monthly_spending_totals(transaction_list, by_category=True)
+    partial = {
+        "transactions": len(transaction_list),
+        "income_cents": income,
+        "expense_cents_by_category": by_category,
+        "expense_cents_by_month": {f"{year}-{month:02d}": categories
+                                   for (year, month), categories in by_month.items()},
+    }
+
+    # Add the archived months from their summaries
+    index, _ = read_json(archive_index_of(path), default=None)
+    for year_entry in (index or {}).get("years", {}).values():
+        for month, summary in year_entry["months"].items():
+            partial["transactions"] += summary["transactions"]
+            partial["income_cents"] += summary["income_cents"]
+            month_totals = partial["expense_cents_by_month"].setdefault(month, {})
+            by_category = partial["expense_cents_by_category"]
+            for category, cents in summary["expense_cents_by_category"].items():
+                by_category[category] = by_category.get(category, 0) + cents
+                month_totals[category] = month_totals.get(category, 0) + cents
+    return partial
+
+
+def _safe_partial(path):
+    try:
+        return file_partial(path), None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        # ValueError covers corrupted JSON and bad dates
+        return None, f"{type(e).__name__}: {e}"
+
+
+# =============================================================Reduce=================================================================
+
+def reduce_partials(partials):
+    """
+    Add partial aggregates together (exactly, in cents).
+
+    Returns:
+        dict: {"users", "transactions", "income", "expenses", "net",
+               "expenses_by_category", "expenses_by_month"} in currency units, sorted for display
+    """
+    transactions = 0
+    income = 0
+    by_category = {}
+    by_month = {}
+    for partial in partials:
+        transactions += partial["transactions"]
+        income += partial["income_cents"]
+        for category, cents in partial["expense_cents_by_category"].items():
+            by_category[category] = by_category.get(category, 0) + cents
+        for month, categories in partial["expense_cents_by_month"].items():
+            month_totals = by_month.setdefault(month, {})
+            for category, cents in categories.items():
+                month_totals[category] = month_totals.get(category, 0) + cents
+
+    expenses = sum(by_category.values())
+    return {
+        "users": len(partials),
+        "transactions": transactions,
+        "income": from_cents(income),
+        "expenses": from_cents(expenses),
+        "net": from_cents(income - expenses),
+        "expenses_by_category": {
+            c: from_cents(a) for c, a in sorted(by_category.items(), key=lambda item: item[1], reverse=True)
+        },
+        "expenses_by_month": {
+            month: {c: from_cents(a) for c, a in sorted(categories.items())}
+            for month, categories in sorted(by_month.items())
+        },
+    }
+
+
+def _load_cache(cache_file):
+    try:
+        cache, _ = read_json(cache_file, default={})
+        return cache or {}
+    except ValueError:
+        return {}  # Corrupted cache: recompute everything
+
+
+def aggregate_report(workers=None, use_cache=True, directory=TRANSACTIONS_DIR, cache_file=AGGREGATE_CACHE_FILE):
+    """
+    Aggregate every user's transactions.
+
+    Args:
+        workers: Worker processes (default: CPU count; 1 runs in this process)
+        use_cache: Reuse partials of files that did not change since the last run
+        directory: Folder with the transaction files
+        cache_file: Where the per-file partials are kept
+
+    Returns:
+        dict: reduce_partials() result plus "processed", "cached", "errors" and "seconds"
+    """
+    start = time.perf_counter()
+    paths = transaction_files(directory)
+    cache = _load_cache(cache_file) if use_cache else {}
+
+    # Step 1: Work out which files changed since their partial was cached
+    partials = {}
+    keys = {}
+    changed = []
+    for path in paths:
+        try:
+            keys[path] = _file_key(path)
+        except OSError:
+            continue  # Deleted since the glob
+        entry = cache.get(path)
+        if entry and entry["key"] == keys[path]:
+            partials[path] = entry["partial"]
+        else:
+            changed.append(path)
+
+    # Step 2: Map the changed files
+    errors = []
+    if len(changed) >= MIN_FILES_FOR_POOL and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_safe_partial, changed, chunksize=max(1, len(changed) // 32)))
+    else:
+        results = [_safe_partial(path) for path in changed]
+    for path, (partial, error) in zip(changed, results):
+        if error:
+            errors.append({"file": path, "error": error})
+        else:
+            partials[path] = partial
+
+    # Step 3: Keep the partials for the next run (only of files that still exist)
+    if use_cache and (changed or len(cache) != len(partials)):
+        write_json(cache_file, {path: {"key": keys[path], "partial": partial} for path, partial in partials.items()},
+                   indent=None)
+
+    # Step 4: Reduce
+    result = reduce_partials(list(partials.values()))
+    result.update({
+        "processed": len(changed) - len(errors),
+        "cached": len(paths) - len(changed),
+        "errors": errors,
+        "seconds": time.perf_counter() - start,
+    })
+    return result
+
+
+# =============================================================Display=================================================================
+
+def render_aggregate_report(result, months=12):
+    """
+    Display the aggregate in the layout of category_breakdown() and spending_trends().
+
+    Args:
+        result: Dictionary returned by aggregate_report()
+        months: How many of the most recent months to chart
+    """
+    print("\n" + "="*80)
+    print("🌍 ALL USERS - AGGREGATE REPORT")
+    print("="*80)
+    print(f"Users: {result['users']}   Transactions: {result['transactions']:,}   "
+          f"(re-read {result['processed']}, cached {result['cached']}, {result['seconds']:.2f}s)")
+    print(f"Total Income:   ${result['income']:>14,.2f}")
+    print(f"Total Expenses: ${result['expenses']:>14,.2f}")
+    print(f"Net Balance:    ${result['net']:>14,.2f}")
+
+    print(f"\n💸 EXPENSES BY CATEGORY")
+    print("-"*80)
+    total_expense = result["expenses"]
+    for category, amount in result["expenses_by_category"].items():
+        percentage = (amount / total_expense) * 100 if total_expense > 0 else 0
+        bar = "█" * int(percentage / 5)
+        print(f"   {str(category).capitalize():<15} ${amount:>14,.2f}  {percentage:>5.1f}% {bar}")
+
+    recent = list(result["expenses_by_month"].items())[-months:]
+    if recent:
+        print(f"\n📊 MONTHLY SPENDING BY CATEGORY (last {len(recent)} months)")
+        print("-"*80)
+        max_spending = max(sum(categories.values()) for _, categories in recent)
+        for month, categories in recent:
+            amount = sum(categories.values())
+            month_name = datetime.datetime.strptime(month, "%Y-%m").strftime("%b %Y")
+            bar = "█" * (int((amount / max_spending) * 40) if max_spending > 0 else 0)
+            top = max(categories, key=categories.get)
+            print(f"{month_name:<10} ${amount:>14,.2f}  top: {str(top):<14} {bar}")
+
+    for error in result["errors"]:
+        print(f"⚠️ Skipped {error['file']}: {error['error']}")
+    print("="*80 + "\n")
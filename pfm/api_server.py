@@ -0,0 +1,443 @@
+"""
+Local HTTP JSON API over the transaction store.
+
+Serves users, transactions (with filters, sorting and paging), reports
+and recurring items to dashboards and other tools, read-only. Every
+connection gets its own thread and is kept alive (HTTP/1.1), so a client
+can reuse one connection and pipeline several requests on it.
+
+Each user's transaction and recurring files are loaded once into a shared
+in-memory store and reused by every thread until the file's version
+number changes, so a request costs one version check instead of a full
+read and parse. Reports are cached with the data they were computed from.
+Transactions and reports include the archived months, like the CLI.
+
+Endpoints (GET):
+    /health
+    /users
+    /users/<name>
+    /users/<name>/transactions   ?from=&to=&category=&type=&min=&max=&sort=&order=&limit=&offset=
+    /users/<name>/recurring
+    /users/<name>/reports/summary    ?month=YYYY-MM
+    /users/<name>/reports/monthly
+    /users/<name>/reports/forecast   ?months=12
+
+Run from the project folder (the data paths are relative):
+    python -m pfm.api_server --port 8765
+    python -m pfm serve --port 8765
+"""
+import argparse
+import contextlib
+import datetime # For date/time handling
+import json # For JSON responses
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .archive import archived_totals, has_archive, iter_archived_records, read_archive_index
+from .file_lock import get_version, read_json
+from .metrics import measure
+from .models import Transaction, RecurringTransaction
+from .money import from_cents, public_record, record_cents, to_cents
+from .paths import transaction_file_path, recurring_transaction_file_path
+from .user_registry import User_Registry
+from .write_ahead_log import recover
+
+
+class Api_Error(Exception):
+    """An error returned to the client as {"error": message} with the given HTTP status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# =============================================================Shared Store=================================================================
+
+class _Snapshot:
+    """One version of a data file: the raw records, objects built on demand and cached results."""
+
+    def __init__(self, version, records, factory):
+        self.version = version
+        self.records = records
+        self._factory = factory
+        self._objects = None
+        self.cache = {}
+
+    def objects(self):
+        if self._objects is None:
+            self._objects = [self._factory(record) for record in self.records]
+        return self._objects
+
+
+class Transaction_Store:
+    """
+    In-memory copy of every user's data files, shared by all request threads.
+
+    A snapshot is reloaded only when the file's version number (bumped by
+    every write, see file_lock.write_json) differs from the cached one.
+    Snapshots are never modified once loaded, so threads read them without
+    locking; only loading and registry lookups are serialized.
+    """
+
+    def __init__(self, registry):
+        self.registry = registry
+        self._registry_lock = threading.Lock()
+        self._load_locks = {}
+        self._locks_lock = threading.Lock()
+        self._snapshots = {}
+
+    def get_user(self, username):
+        with self._registry_lock:
+            user = self.registry.get_user(username)
+        if user is None:
+            raise Api_Error(404, f"unknown user '{username}'")
+        user.setdefault("name", username)
+        return user
+
+    def list_users(self):
+        with self._registry_lock:
+            return [
+                {"name": name, "id": record.get("id"), "balance": record.get("balance", 0.0),
+                 "transactions": record.get("number_of_transactions", 0)}
+                for name, record in self.registry.iter_users()
+            ]
+
+    def _load_lock(self, path):
+        with self._locks_lock:
+            return self._load_locks.setdefault(path, threading.Lock())
+
+    def _snapshot(self, path, factory):
+        """Return the cached snapshot of a data file, reloading it if the file changed."""
+        cached = self._snapshots.get(path)
+        if cached is not None and cached.version == get_version(path):
+            return cached
+
+        # One thread reloads; the others wait and then use its result
+        with self._load_lock(path):
+            cached = self._snapshots.get(path)
+            if cached is not None and cached.version == get_version(path):
+                return cached
+            try:
+                records, version = read_json(path, default=[])
+            except json.JSONDecodeError:
+                raise Api_Error(500, "data file is corrupted")
+            snapshot = _Snapshot(version, records or [], factory)
+            self._snapshots[path] = snapshot
+            return snapshot
+
+    def transactions(self, user):
+        return self._snapshot(transaction_file_path(user), Transaction.from_dict)
+
+    def history(self, user):
+        """
+        Return the user's archived and hot transactions as one snapshot (like archive.with_archive()).
+
+        It is cached on the hot snapshot under the archive index version, so
+        it is rebuilt when either the transactions file or the archive changes.
+        """
+        hot = self.transactions(user)
+        if not has_archive(user):
+            return hot
+        key = ("history", read_archive_index(user)[1])
+        if key not in hot.cache:
+            hot_ids = {record.get("transaction_id") for record in hot.records}
+            archived = [r for r in iter_archived_records(user) if r["transaction_id"] not in hot_ids]
+            hot.cache[key] = _Snapshot(hot.version, archived + hot.records, Transaction.from_dict)
+        return hot.cache[key]
+
+    def recurring(self, user):
+        return self._snapshot(recurring_transaction_file_path(user), RecurringTransaction.from_dict)
+
+
+# =============================================================Queries=================================================================
+
+SORT_FIELDS = ("date", "amount", "category")
+
+
+def _one(query, name, default=None):
+    values = query.get(name)
+    return values[-1] if values else default
+
+
+def _number(query, name, cast=float, default=None):
+    value = _one(query, name)
+    if value is None:
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        raise Api_Error(400, f"invalid {name} '{value}'")
+
+
+def _date(query, name):
+    value = _one(query, name)
+    if value is None:
+        return None
+    try:
+        return datetime.date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise Api_Error(400, f"invalid {name} '{value}' (expected YYYY-MM-DD)")
+
+
+def _month(query):
+    value = _one(query, "month")
+    if value is None:
+        return None
+    try:
+        return datetime.datetime.strptime(value, "%Y-%m").strftime("%Y-%m")
+    except ValueError:
+        raise Api_Error(400, f"invalid month '{value}' (expected YYYY-MM)")
+
+
+def filter_records(records, query):
+    """
+    Apply the transaction query parameters to a list of stored records.
+
+    Args:
+        records: Transaction dicts as stored in the file (ISO date strings)
+        query: Parsed query string (parse_qs); category may repeat or be comma-separated
+
+    Returns:
+        dict: {"total": matches before paging, "offset", "transactions": the page}
+    """
+    start = _date(query, "from")
+    end = _date(query, "to")
+    categories = {c.strip().lower() for value in query.get("category", []) for c in value.split(",") if c.strip()}
+    t_type = _one(query, "type")
+    min_cents = _number(query, "min", to_cents)
+    max_cents = _number(query, "max", to_cents)
+    sort_by = _one(query, "sort")
+    descending = _one(query, "order", "asc") == "desc"
+    offset = _number(query, "offset", int, 0)
+    limit = _number(query, "limit", int)
+
+    if sort_by is not None and sort_by not in SORT_FIELDS:
+        raise Api_Error(400, f"invalid sort '{sort_by}' (expected one of {', '.join(SORT_FIELDS)})")
+    if offset < 0 or (limit is not None and limit < 0):
+        raise Api_Error(400, "offset and limit must not be negative")
+
+    matches = [
+        r for r in records
+        if (start is None or r["date"] >= start)
+        and (end is None or r["date"] <= end)
+        and (not categories or str(r.get("category", "")).lower() in categories)
+        and (t_type is None or r.get("type") == t_type)
+        and (min_cents is None or record_cents(r) >= min_cents)
+        and (max_cents is None or record_cents(r) <= max_cents)
+    ]
+    if sort_by == "amount":
+        matches.sort(key=record_cents, reverse=descending)
+    elif sort_by:
+        matches.sort(key=lambda r: r[sort_by], reverse=descending)
+    page = matches[offset:offset + limit if limit is not None else None]
+    return {"total": len(matches), "offset": offset, "transactions": [public_record(r) for r in page]}
+
+
+def monthly_totals(records):
+    """Income, expenses and net per "YYYY-MM", oldest month first."""
+    months = {}
+    for r in records:
+        totals = months.setdefault(r["date"][:7], {"income": 0, "expenses": 0, "transactions": 0})
+        totals["transactions"] += 1
+        if r["type"] == "income":
+            totals["income"] += record_cents(r)
+        elif r["type"] == "expense":
+            totals["expenses"] += record_cents(r)
+    return [
+        {"month": month, "transactions": t["transactions"], "income": from_cents(t["income"]),
+         "expenses": from_cents(t["expenses"]), "net": from_cents(t["income"] - t["expenses"])}
+        for month, t in sorted(months.items())
+    ]
+
+
+# =============================================================Routes=================================================================
+
+def route_health(store, query):
+    return {"status": "ok"}
+
+
+def route_users(store, query):
+    return store.list_users()
+
+
+def route_user(store, query, username):
+    user = store.get_user(username)
+    user.pop("password", None)
+    return user
+
+
+def route_transactions(store, query, username):
+    snapshot = store.history(store.get_user(username))
+    return filter_records(snapshot.records, query)
+
+
+def route_recurring(store, query, username):
+    snapshot = store.recurring(store.get_user(username))
+    if "public" not in snapshot.cache:
+        snapshot.cache["public"] = [dict(r, transaction=public_record(r["transaction"])) for r in snapshot.records]
+    return snapshot.cache["public"]
+
+
+def route_summary(store, query, username):
+    from .transaction_manager import summarize_transactions
+
+    user = store.get_user(username)
+    snapshot = store.history(user)
+    month = _month(query)
+    key = ("summary", month)
+    if key not in snapshot.cache:
+        snapshot.cache[key] = summarize_transactions(snapshot.objects(), month)
+    summary = dict(snapshot.cache[key], user=user["name"], budget_limit=user.get("monthly_budget_limit"))
+    return summary
+
+
+def route_monthly(store, query, username):
+    snapshot = store.history(store.get_user(username))
+    if "monthly" not in snapshot.cache:
+        snapshot.cache["monthly"] = monthly_totals(snapshot.records)
+    return snapshot.cache["monthly"]
+
+
+def route_forecast(store, query, username):
+    from .forecast import forecast_cash_flow
+
+    user = store.get_user(username)
+    months = _number(query, "months", int, 12)
+    if not 1 <= months <= 120:
+        raise Api_Error(400, "months must be between 1 and 120")
+    snapshot = store.transactions(user)
+    recurring = store.recurring(user)
+    today = datetime.date.today()
+    archive_version = read_archive_index(user)[1] if has_archive(user) else None
+    # The forecast also depends on the recurring items, the archive and on today's date
+    key = ("forecast", months, recurring.version, archive_version, today)
+    if key not in snapshot.cache:
+        forecast = forecast_cash_flow(snapshot.objects(), recurring.objects(), months=months, start_date=today,
+                                      archived=archived_totals(user))
+        # The per-day arrays are only used for drawing the chart
+        forecast.pop("daily_income")
+        forecast.pop("daily_expense")
+        snapshot.cache[key] = forecast
+    return snapshot.cache[key]
+
+
+# path segments -> handler; "*" matches a username
+ROUTES = {
+    ("health",): route_health,
+    ("users",): route_users,
+    ("users", "*"): route_user,
+    ("users", "*", "transactions"): route_transactions,
+    ("users", "*", "recurring"): route_recurring,
+    ("users", "*", "reports", "summary"): route_summary,
+    ("users", "*", "reports", "monthly"): route_monthly,
+    ("users", "*", "reports", "forecast"): route_forecast,
+}
+
+
+def resolve(path):
+    """Return (handler, captured path segments) for a request path."""
+    segments = tuple(unquote(s) for s in path.strip("/").split("/") if s)
+    for pattern, handler in ROUTES.items():
+        if len(pattern) == len(segments) and all(p == "*" or p == s for p, s in zip(pattern, segments)):
+            return handler, [s for p, s in zip(pattern, segments) if p == "*"]
+    raise Api_Error(404, f"no such endpoint '{path}'")
+
+
+# =============================================================Server=================================================================
+
+class Api_Request_Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive: one connection serves many (pipelined) requests
+    disable_nagle_algorithm = True  # Don't hold small responses back waiting for an ACK
+    server_version = "pfm-api"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        try:
+            handler, arguments = resolve(url.path)
+            with measure(f"api.{handler.__name__[len('route_'):]}"):
+                data = handler(self.server.store, parse_qs(url.query), *arguments)
+            self.send_json(200, data)
+        except Api_Error as e:
+            self.send_json(e.status, {"error": e.message})
+        except Exception as e:
+            self.log_error("error handling %s: %r", self.path, e)
+            self.send_json(500, {"error": "internal error"})
+
+    def do_POST(self):
+        # Read and drop the body so the connection can be reused
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self.send_json(405, {"error": "the API is read-only"})
+
+    do_PUT = do_PATCH = do_DELETE = do_POST
+
+    def send_json(self, status, data):
+        body = json.dumps(data, default=str, separators=(",", ":")).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if status == 405:
+            self.send_header("Allow", "GET")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class Api_Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # Room for many clients connecting at once
+
+
+def make_server(host="127.0.0.1", port=8765, db_file=None, verbose=False):
+    """
+    Create (but do not start) the API server.
+
+    Args:
+        host: Interface to listen on (the API has no authentication, keep it local)
+        port: TCP port, 0 for any free port (see server.server_address)
+        db_file: User registry database (default: data/users.db)
+        verbose: Log every request to stderr
+
+    Returns:
+        Api_Server: Call serve_forever() to start it
+    """
+    server = Api_Server((host, port), Api_Request_Handler)
+    server.store = Transaction_Store(User_Registry(db_file, shared=True))
+    server.verbose = verbose
+    return server
+
+
+def serve(host="127.0.0.1", port=8765, db_file=None, verbose=False):
+    """Run the API server until Ctrl+C."""
+    with contextlib.redirect_stdout(sys.stderr):
+        recover()  # Serve what a crashed session logged, not its half-written files
+    server = make_server(host, port, db_file, verbose)
+    host, port = server.server_address[:2]
+    print(f"🌐 Serving on http://{host}:{port} (Ctrl+C to stop)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.store.registry.close()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="pfm serve", description="Serve the transaction store as a JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="0 picks a free port")
+    parser.add_argument("--db", default=None, help="path to the user registry database")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+    return serve(args.host, args.port, args.db, args.verbose)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
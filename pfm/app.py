@@ -0,0 +1,96 @@
+"""
+Interactive entry point: start-up banner and the Register / Login menu.
+
+Modules are imported when a menu option first needs them, so the menu is
+on screen before the user registry or the transaction modules are loaded.
+"""
+
+
+def banner():
+    banner = r"""
+    /$$      /$$           /$$                                                  
+    | $$  /$ | $$          | $$                                                  
+    | $$ /$$$| $$  /$$$$$$ | $$  /$$$$$$$  /$$$$$$  /$$$$$$/$$$$   /$$$$$$       
+    | $$/$$ $$ $$ /$$__  $$| $$ /$$_____/ /$$__  $$| $$_  $$_  $$ /$$__  $$      
+    | $$$$_  $$$$| $$$$$$$$| $$| $$      | $$  \ $$| $$ \ $$ \ $$| $$$$$$$$      
+    | $$$/ \  $$$| $$_____/| $$| $$      | $$  | $$| $$ | $$ | $$| $$_____/      
+    | $$/   \  $$|  $$$$$$$| $$|  $$$$$$$|  $$$$$$/| $$ | $$ | $$|  $$$$$$$      
+    |__/     \__/ \_______/|__/ \_______/ \______/ |__/ |__/ |__/ \_______/      
+                                                                                
+                                                                                
+                                                                                
+    /$$                     /$$     /$$                                       
+    | $$                    |  $$   /$$/                                       
+    /$$$$$$    /$$$$$$        \  $$ /$$//$$$$$$  /$$   /$$  /$$$$$$             
+    |_  $$_/   /$$__  $$        \  $$$$//$$__  $$| $$  | $$ /$$__  $$            
+    | $$    | $$  \ $$         \  $$/| $$  \ $$| $$  | $$| $$  \__/            
+    | $$ /$$| $$  | $$          | $$ | $$  | $$| $$  | $$| $$                  
+    |  $$$$/|  $$$$$$/          | $$ |  $$$$$$/|  $$$$$$/| $$                  
+    \___/   \______/           |__/  \______/  \______/ |__/                  
+                                                                                
+                                                                                
+                                                                                
+    /$$$$$$$$ /$$                                                               
+    | $$_____/|__/                                                               
+    | $$       /$$ /$$$$$$$   /$$$$$$  /$$$$$$$   /$$$$$$$  /$$$$$$              
+    | $$$$$   | $$| $$__  $$ |____  $$| $$__  $$ /$$_____/ /$$__  $$             
+    | $$__/   | $$| $$  \ $$  /$$$$$$$| $$  \ $$| $$      | $$$$$$$$             
+    | $$      | $$| $$  | $$ /$$__  $$| $$  | $$| $$      | $$_____/             
+    | $$      | $$| $$  | $$|  $$$$$$$| $$  | $$|  $$$$$$$|  $$$$$$$             
+    |__/      |__/|__/  |__/ \_______/|__/  |__/ \_______/ \_______/             
+                                                                                
+                                                                                
+                                                                                
+    /$$      /$$                                                                
+    | $$$    /$$$                                                                
+    | $$$$  /$$$$  /$$$$$$  /$$$$$$$   /$$$$$$   /$$$$$$   /$$$$$$               
+    | $$ $$/$$ $$ |____  $$| $$__  $$ /$$__  $$ /$$__  $$ /$$__  $$              
+    | $$  $$$| $$  /$$$$$$$| $$  \ $$| $$  \ $$| $$$$$$$$| $$  \__/              
+    | $$\  $ | $$ /$$__  $$| $$  | $$| $$  | $$| $$_____/| $$                    
+    | $$ \/  | $$|  $$$$$$$| $$  | $$|  $$$$$$$|  $$$$$$$| $$                    
+    |__/     |__/ \_______/|__/  |__/ \____  $$ \_______/|__/                    
+                                    /$$  \ $$                                  
+                                    |  $$$$$$/                                  
+                                    \______/                                   
+                                    """
+    print(banner)
+
+
+def main():
+    """Run the interactive Register / Login loop."""
+    user_manager = None  # Opened on the first register/login
+
+    banner()
+
+    while True:
+        print("""
+        ╔══════════════════════════════════════════════════════╗
+        ║            💰 PERSONAL FINANCE MANAGER 💰           ║
+        ╠══════════════════════════════════════════════════════╣
+        ║ [1] Register                                         ║
+        ║ [2] Login                                            ║
+        ║ [3] Exit                                             ║
+        ╚══════════════════════════════════════════════════════╝
+        👉 Please enter your choice: """)
+
+        choice = input("Choose an option: ").strip()
+
+        if choice in ("1", "2") and user_manager is None:
+            from .user_manager import User_Manager
+            from .write_ahead_log import recover
+            recover()  # Finish what a crashed session left half-written before reading anything
+            user_manager = User_Manager()
+
+        if choice == "1":
+            user_manager.register_user()
+        elif choice == "2":
+            current_user = user_manager.login_user()
+            if current_user:
+                from .transaction_manager import Transaction_Manager
+                Transaction_Manager(current_user)
+                user_manager.save_users()
+        elif choice == "3":
+            print("👋 Goodbye!")
+            break
+        else:
+            print("❌ Invalid choice. Try again.")
@@ -0,0 +1,392 @@
+"""
+Cold storage for old months: compressed per-year archives of transactions.
+
+archive_transactions() moves every transaction dated before the start of
+the month ARCHIVE_AFTER_MONTHS months ago out of the user's (hot)
+transactions file into data/archive/<name>_<id>/<year>.json.gz (.json.zst
+when the optional zstandard package is installed), so the file that is
+read on every menu action only holds recent months.
+
+index.json next to the archives summarizes every archived month (count,
+income and expenses by category in cents), so totals, the month list of the Monthly
+Report and the all-users report never have to decompress anything. A year
+is only decompressed when one of its months is actually asked for
+(monthly report of an archived month, spending trends / category
+breakdown with archived months, CSV export of an archived period).
+
+Moving is crash-safe: the archives and the index are written (atomically)
+before the transactions are removed from the hot file, and the index says
+a move is in progress until then. finish_interrupted_archive() (run at
+login and before every archive run) completes a move that was cut short.
+"""
+import calendar
+import datetime # For date/time handling
+import gzip # For the compressed archives
+import json # For JSON data storage
+import os # For file operations
+import tempfile
+import time
+
+from .file_lock import Version_Conflict, locked, read_json, write_json
+from .models import Transaction
+from .money import record_cents
+from .paths import transaction_file_path
+
+# Optional: zstd compresses better and faster than gzip
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+ARCHIVE_DIR = os.path.join('data', 'archive')
+ARCHIVE_AFTER_MONTHS = 24  # Months (before the current one) that stay in the hot file
+
+_year_cache = {}  # archive file -> ((mtime_ns, size), records)
+YEAR_CACHE_ENTRIES = 8
+
+
+def archive_folder(user):
+    """Return the folder holding the user's archives."""
+    return os.path.join(ARCHIVE_DIR, f'{user["name"]}_{user["id"]}')
+
+
+def archive_index_path(user):
+    """Return the path of the user's archive summary index."""
+    return os.path.join(archive_folder(user), 'index.json')
+
+
+def archive_cutoff(months=ARCHIVE_AFTER_MONTHS, today=None):
+    """
+    Return the first day that stays in the hot file.
+
+    Args:
+        months: Closed months to keep besides the current one
+        today: Reference date (default: today)
+
+    Returns:
+        datetime.date: Transactions dated before this are archived
+    """
+    today = today or datetime.date.today()
+    month_number = today.year * 12 + (today.month - 1) - months
+    return datetime.date(month_number // 12, month_number % 12 + 1, 1)
+
+
+def month_bounds(year, month):
+    """Return the first and last day of a month as datetime.date objects."""
+    return datetime.date(year, month, 1), datetime.date(year, month, calendar.monthrange(year, month)[1])
+
+
+# =============================================================Index=================================================================
+
+def read_archive_index(user):
+    """
+    Load the user's archive index.
+
+    Returns:
+        tuple: (index dict {"years": {"YYYY": {"file", "transactions", "months"}}}, version)
+    """
+    index, version = read_json(archive_index_path(user), default=None)
+    return index or {"years": {}}, version
+
+
+def has_archive(user):
+    """Return True if the user has archived transactions."""
+    return os.path.exists(archive_index_path(user))
+
+
+def archived_months(user):
+    """Return {(year, month): month summary} for every archived month."""
+    index, _ = read_archive_index(user)
+    months = {}
+    for year_entry in index["years"].values():
+        for month, summary in year_entry["months"].items():
+            year, month_number = month.split("-")
+            months[(int(year), int(month_number))] = summary
+    return months
+
+
+def archived_totals(user):
+    """
+    Return the totals of the archived transactions, from the index.
+
+    Returns:
+        dict: {"transactions", "income_cents", "expense_cents"} (zeros without archive)
+    """
+    transactions = income = expense = 0
+    if has_archive(user):
+        for summary in archived_months(user).values():
+            transactions += summary["transactions"]
+            income += summary["income_cents"]
+            expense += sum(summary["expense_cents_by_category"].values())
+    return {"transactions": transactions, "income_cents": income, "expense_cents": expense}
+
+
+def summarize_month_records(records):
+    """Summarize archived records per "YYYY-MM": count, income and expenses by category (cents)."""
+    months = {}
+    for record in records:
+        summary = months.setdefault(record["date"][:7],
+                                    {"transactions": 0, "income_cents": 0, "expense_cents_by_category": {}})
+        summary["transactions"] += 1
+        if record["type"] == "income":
+            summary["income_cents"] += record_cents(record)
+        elif record["type"] == "expense":
+            by_category = summary["expense_cents_by_category"]
+            by_category[record["category"]] = by_category.get(record["category"], 0) + record_cents(record)
+    for summary in months.values():
+        summary["expense_cents_by_category"] = dict(sorted(summary["expense_cents_by_category"].items()))
+    return dict(sorted(months.items()))
+
+
+# =============================================================Archive Files=================================================================
+
+def _write_archive_file(path, records):
+    """Compress records into path atomically (temporary file, fsync, rename)."""
+    data = json.dumps(records, separators=(",", ":")).encode("utf-8")
+    directory = os.path.dirname(path)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            if path.endswith(".zst"):
+                raw.write(zstandard.ZstdCompressor(level=10).compress(data))
+            else:
+                with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6, mtime=0) as compressed:
+                    compressed.write(data)
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _read_archive_file(path):
+    """Return the records of one archive file (cached while the file is unchanged)."""
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _year_cache.get(path)
+    if cached and cached[0] == key:
+        return cached[1]
+
+    with open(path, "rb") as file:
+        data = file.read()
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"{path} is zstd-compressed; install the 'zstandard' package to read it")
+        data = zstandard.ZstdDecompressor().decompress(data)
+    else:
+        data = gzip.decompress(data)
+    records = json.loads(data)
+
+    _year_cache[path] = (key, records)
+    while len(_year_cache) > YEAR_CACHE_ENTRIES:
+        _year_cache.pop(next(iter(_year_cache)))
+    return records
+
+
+def _years_between(index, start=None, end=None):
+    """Archived years (sorted) that overlap the ISO date range [start, end]."""
+    return [
+        year for year in sorted(index["years"])
+        if (not start or year >= start[:4]) and (not end or year <= end[:4])
+    ]
+
+
+def iter_archived_records(user, start=None, end=None):
+    """
+    Yield archived transaction records (dicts) in date order, decompressing only the years needed.
+
+    Args:
+        user: User object
+        start: Only records on or after this ISO date ("YYYY-MM-DD")
+        end: Only records on or before this ISO date
+    """
+    if not has_archive(user):
+        return
+    index, _ = read_archive_index(user)
+    folder = archive_folder(user)
+    for year in _years_between(index, start, end):
+        for record in _read_archive_file(os.path.join(folder, index["years"][year]["file"])):
+            if (start and record["date"] < start) or (end and record["date"] > end):
+                continue
+            yield record
+
+
+def read_archived_transactions(user, start_date=None, end_date=None):
+    """Return the archived transactions in [start_date, end_date] as Transaction objects."""
+    start = start_date.isoformat() if start_date else None
+    end = end_date.isoformat() if end_date else None
+    return [Transaction.from_dict(r) for r in iter_archived_records(user, start, end)]
+
+
+def with_archive(user, transaction_list, start_date=None, end_date=None):
+    """
+    Return the archived transactions in the range followed by the hot ones.
+
+    A transaction that is in both (only possible while a move is being
+    finished) is taken from the hot list.
+
+    Args:
+        user: User object
+        transaction_list: Transactions from the hot file
+        start_date / end_date: Limit which archived years are read (datetime.date)
+
+    Returns:
+        list of Transaction objects
+    """
+    if not has_archive(user):
+        return transaction_list
+    hot_ids = {t.transaction_id for t in transaction_list}
+    archived = [t for t in read_archived_transactions(user, start_date, end_date) if t.transaction_id not in hot_ids]
+    return archived + list(transaction_list)
+
+
+# =============================================================Archiving=================================================================
+
+def _preferred_extension():
+    return ".json.zst" if zstandard is not None else ".json.gz"
+
+
+def _drop_archived(user, index, archived_ids):
+    """Remove the archived transactions from the hot file, then clear the index's move marker."""
+    hot_path = transaction_file_path(user)
+    before = index["moving"]["before"]
+    removed = 0
+    while True:
+        records, version = read_json(hot_path, default=[])
+        records = records or []
+        keep = [r for r in records if not (r["date"] < before and r["transaction_id"] in archived_ids)]
+        removed = len(records) - len(keep)
+        if not removed:
+            break
+        try:
+            write_json(hot_path, keep, expected_version=version)
+            user["number_of_transactions"] = len(keep)
+            break
+        except Version_Conflict:
+            continue  # Someone saved in between: drop from their version
+
+    del index["moving"]
+    write_json(archive_index_path(user), index)
+    return removed
+
+
+def finish_interrupted_archive(user):
+    """
+    Complete an archive run that died after writing the archives.
+
+    Returns:
+        int: Number of transactions removed from the hot file (0 if nothing was pending)
+    """
+    index_path = archive_index_path(user)
+    if not os.path.exists(index_path):
+        return 0
+    with locked(index_path, suffix=".archive.lock"):
+        index, _ = read_archive_index(user)
+        if "moving" not in index:
+            return 0
+        last_year = index["moving"]["before"][:4]
+        archived_ids = {
+            record["transaction_id"]
+            for year in _years_between(index, end=last_year)
+            for record in _read_archive_file(os.path.join(archive_folder(user), index["years"][year]["file"]))
+        }
+        return _drop_archived(user, index, archived_ids)
+
+
+def archive_transactions(user, months=ARCHIVE_AFTER_MONTHS, today=None):
+    """
+    Move the user's transactions from closed months older than `months` into the archives.
+
+    Args:
+        user: User object
+        months: Closed months to keep in the hot file besides the current one
+        today: Reference date (default: today)
+
+    Returns:
+        dict: {"archived", "kept", "years", "before", "seconds"}
+    """
+    start = time.perf_counter()
+    before = archive_cutoff(months, today).isoformat()
+    finish_interrupted_archive(user)
+
+    folder = archive_folder(user)
+    os.makedirs(folder, exist_ok=True)
+    index_path = archive_index_path(user)
+    with locked(index_path, suffix=".archive.lock"):
+        # Step 1: Split the hot file
+        records, _ = read_json(transaction_file_path(user), default=[])
+        old = [r for r in records or [] if r["date"] < before]
+        result = {"archived": 0, "kept": len(records or []) - len(old), "years": [], "before": before}
+        if not old:
+            result["seconds"] = time.perf_counter() - start
+            return result
+
+        by_year = {}
+        for record in old:
+            by_year.setdefault(record["date"][:4], []).append(record)
+
+        # Step 2: Merge each year into its archive (written before anything leaves the hot file)
+        index, _ = read_archive_index(user)
+        archived_ids = set()
+        for year, new_records in sorted(by_year.items()):
+            entry = index["years"].get(year)
+            existing = _read_archive_file(os.path.join(folder, entry["file"])) if entry else []
+            known = {r["transaction_id"] for r in existing}
+            merged = existing + [r for r in new_records if r["transaction_id"] not in known]
+            merged.sort(key=lambda r: r["date"])
+
+            file_name = year + _preferred_extension()
+            _write_archive_file(os.path.join(folder, file_name), merged)
+            if entry and entry["file"] != file_name:
+                os.remove(os.path.join(folder, entry["file"]))  # Re-compressed with the other codec
+            index["years"][year] = {"file": file_name, "transactions": len(merged),
+                                    "months": summarize_month_records(merged)}
+            archived_ids.update(r["transaction_id"] for r in new_records)
+            result["years"].append(year)
+
+        # Step 3: Publish the index (with the move marker), then empty the archived months
+        index["years"] = dict(sorted(index["years"].items()))
+        index["moving"] = {"before": before}
+        write_json(index_path, index)
+        result["archived"] = _drop_archived(user, index, archived_ids)
+
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def migrate_archive(folder):
+    """
+    Rewrite an archive written with float amounts in cents (records and month summaries).
+
+    Args:
+        folder: Archive folder of one user (data/archive/<name>_<id>)
+
+    Returns:
+        bool: True if anything was converted
+    """
+    index_path = os.path.join(folder, 'index.json')
+    if not os.path.exists(index_path):
+        return False
+    changed = False
+    with locked(index_path, suffix=".archive.lock"):
+        index, _ = read_json(index_path, default=None)
+        for entry in index["years"].values():
+            path = os.path.join(folder, entry["file"])
+            records = _read_archive_file(path)
+            summaries_current = all("income_cents" in month for month in entry["months"].values())
+            if summaries_current and not any("amount" in record for record in records):
+                continue
+            converted = []
+            for record in records:
+                record = dict(record, amount_cents=record_cents(record))  # Copy: the cache holds the originals
+                record.pop("amount", None)
+                converted.append(record)
+            _write_archive_file(path, converted)
+            entry["months"] = summarize_month_records(converted)
+            changed = True
+        if changed:
+            write_json(index_path, index)
+    return changed
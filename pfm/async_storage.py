@@ -0,0 +1,172 @@
+"""
+Async variants of the storage functions, for serving many users from one process.
+
+The blocking functions in transaction_manager / recurring_transactions_manager
+are run in a thread pool, so reading, parsing, serializing and writing one
+user's (possibly large) file never blocks the event loop and the other
+users' requests keep being served. Parsing still holds the GIL, but the
+interpreter switches threads every few milliseconds, so the loop stays
+responsive instead of waiting for the whole file.
+
+Writes are coordinated per user with an asyncio.Lock: coroutines of the
+same process queue up instead of racing into Version_Conflict retries.
+The file locks and version numbers of file_lock.py still protect against
+other processes.
+
+The user registry (SQLite) is only used from one dedicated thread, because
+a SQLite connection belongs to the thread that opened it: open the
+User_Manager with open_user_manager() and the ledger updates of
+add_transaction_async() run on that thread too.
+"""
+import asyncio
+import functools
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from . import ledger
+from .file_lock import Version_Conflict
+from .paths import transaction_file_path
+from .recurring_transactions_manager import read_recurring_transaction_file, save_recurring_transactions_to_file
+from .transaction_manager import read_transaction_file, save_transactions_to_file
+from .write_ahead_log import log_change
+
+
+# Threads that read/parse and serialize/write the data files
+STORAGE_WORKERS = 8
+
+_storage_executor = None
+_registry_executor = None
+_user_locks = weakref.WeakKeyDictionary()  # event loop -> {(name, id): asyncio.Lock}
+
+
+def _executors():
+    global _storage_executor, _registry_executor
+    if _storage_executor is None:
+        _storage_executor = ThreadPoolExecutor(STORAGE_WORKERS, thread_name_prefix="pfm-storage")
+        _registry_executor = ThreadPoolExecutor(1, thread_name_prefix="pfm-registry")
+    return _storage_executor, _registry_executor
+
+
+async def _in_storage_thread(function, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executors()[0], functools.partial(function, *args, **kwargs))
+
+
+async def _in_registry_thread(function, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executors()[1], functools.partial(function, *args, **kwargs))
+
+
+def user_lock(user):
+    """Return the asyncio.Lock that serializes writes to this user's files (per event loop)."""
+    locks = _user_locks.setdefault(asyncio.get_running_loop(), {})
+    key = (user["name"], user["id"])
+    if key not in locks:
+        locks[key] = asyncio.Lock()
+    return locks[key]
+
+
+def shutdown():
+    """Stop the worker threads (waiting for running jobs). They restart on the next call."""
+    global _storage_executor, _registry_executor
+    if _storage_executor is not None:
+        _storage_executor.shutdown()
+        _registry_executor.shutdown()
+        _storage_executor = _registry_executor = None
+
+
+# =============================================================Transactions=================================================================
+
+async def read_transaction_file_async(user, with_version=False):
+    """Async read_transaction_file(): read and parse in a worker thread."""
+    return await _in_storage_thread(read_transaction_file, user, with_version)
+
+
+async def save_transactions_to_file_async(user, transaction_list, expected_version=None):
+    """Async save_transactions_to_file(): serialize and write in a worker thread, one write per user at a time."""
+    async with user_lock(user):
+        return await _in_storage_thread(save_transactions_to_file, user, transaction_list, expected_version)
+
+
+async def add_transaction_async(user, new_transaction):
+    """
+    Async add_transaction(): append one transaction and update the running totals.
+
+    Args:
+        user: User object
+        new_transaction: Transaction object to add
+
+    Returns:
+        bool: True if saved
+    """
+    async with user_lock(user):
+        # Logging waits for an fsync, so it runs in a worker thread too
+        change = await _in_storage_thread(log_change, "transaction.add", transaction_file_path(user),
+                                          records=[new_transaction.to_dict()])
+        try:
+            while True:
+                transactions, version = await _in_storage_thread(read_transaction_file, user, True)
+                transactions.append(new_transaction)
+                try:
+                    if not await _in_storage_thread(save_transactions_to_file, user, transactions, version):
+                        await _in_storage_thread(change.cancel)
+                        return False
+                    break
+                except Version_Conflict:
+                    continue  # Another process saved in between
+        except BaseException:
+            await _in_storage_thread(change.cancel)
+            raise
+        await _in_storage_thread(change.finish)
+    await _in_registry_thread(ledger.update_ledger, user, added=[new_transaction])
+    return True
+
+
+# =============================================================Recurring=================================================================
+
+async def read_recurring_transaction_file_async(user, with_version=False):
+    """Async read_recurring_transaction_file(): read and parse in a worker thread."""
+    return await _in_storage_thread(read_recurring_transaction_file, user, with_version)
+
+
+async def save_recurring_transactions_to_file_async(user, transaction_list, expected_version=None):
+    """Async save_recurring_transactions_to_file(), one write per user at a time."""
+    async with user_lock(user):
+        return await _in_storage_thread(save_recurring_transactions_to_file, user, transaction_list, expected_version)
+
+
+# =============================================================Users=================================================================
+
+async def open_user_manager(registry_db=None):
+    """
+    Create a User_Manager whose registry connection lives on the registry thread.
+
+    Args:
+        registry_db: Path of the user registry database (default: data/users.db)
+
+    Returns:
+        User_Manager: Pass it to save_users_async(); look users up with load_user_async()
+    """
+    from .user_manager import User_Manager
+    from .user_registry import User_Registry
+
+    def open_manager():
+        registry = User_Registry(registry_db) if registry_db else User_Registry()
+        if ledger._registry is None:
+            ledger._registry = registry  # Ledger updates also run on this thread
+        return User_Manager(registry)
+
+    return await _in_registry_thread(open_manager)
+
+
+async def load_user_async(user_manager, username):
+    """Return a user's record (loaded on the registry thread), or None if unknown."""
+    def load():
+        return user_manager.users[username] if username in user_manager.users else None
+
+    return await _in_registry_thread(load)
+
+
+async def save_users_async(user_manager):
+    """Async User_Manager.save_users(): write the changed user records on the registry thread."""
+    await _in_registry_thread(user_manager.save_users)
@@ -0,0 +1,256 @@
+import argparse # For command line options
+import contextlib # For capturing printed output
+import io
+import json # For JSON data storage
+import os # For file operations
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from . import ledger
+from .user_registry import User_Registry
+from .transaction_manager import (read_transaction_file, create_backup_transaction_file, export_transactions_to_csv,
+                                  dashboard_summary, category_breakdown, spending_trends)
+from .recurring_transactions_manager import apply_recurring_transactions
+from .incremental_export import export_transactions_incremental
+from .archive import archive_transactions, archived_months, archived_totals, has_archive, read_archive_index
+from .report_cache import show_cached
+from .write_ahead_log import recover
+
+
+REPORTS_DIR = os.path.join('data', 'reports')
+
+
+# =============================================================Per-User Tasks=================================================================
+
+def task_apply_recurring(user):
+    """Apply every due recurring transaction for the user."""
+    apply_recurring_transactions(user)
+
+
+def task_backup(user):
+    """Copy the user's transaction file to its backup file."""
+    create_backup_transaction_file(user)
+
+
+def task_report(user):
+    """Write the dashboard, category breakdown and spending trends to a text file."""
+    transactions, version = read_transaction_file(user, with_version=True)
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        dashboard_summary(transactions, archived_totals(user))
+        if has_archive(user):
+            archive_version = read_archive_index(user)[1]
+            show_cached(user, "category_breakdown", "archived", [version, archive_version],
+                        lambda: category_breakdown(transactions, archived_months(user)))
+            show_cached(user, "spending_trends", "archived", [version, archive_version],
+                        lambda: spending_trends(transactions, archived_months(user)))
+        else:
+            show_cached(user, "category_breakdown", None, version, lambda: category_breakdown(transactions))
+            show_cached(user, "spending_trends", None, version, lambda: spending_trends(transactions))
+
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    report_file = os.path.join(REPORTS_DIR, f'report_{user["name"]}_{user["id"]}.txt')
+    with open(report_file, 'w', encoding="utf-8") as f:
+        f.write(buffer.getvalue())
+    print(f"✅ Report written to '{report_file}'.")
+
+
+def task_export_csv(user):
+    """Export the user's transactions to CSV."""
+    export_transactions_to_csv(user)
+
+
+def task_export_csv_incremental(user):
+    """Append new transactions to the user's CSV export (a full export after edits)."""
+    export_transactions_incremental(user)
+
+
+def task_archive(user):
+    """Move the closed months older than ARCHIVE_AFTER_MONTHS into the compressed archive."""
+    result = archive_transactions(user)
+    print(f"📦 {result['archived']} transaction(s) from before {result['before']} archived, {result['kept']} kept.")
+
+
+# Task name -> function(user). Tasks run in the order they are requested.
+BATCH_TASKS = {
+    "apply_recurring": task_apply_recurring,
+    "backup": task_backup,
+    "report": task_report,
+    "export_csv": task_export_csv,
+    "export_csv_incremental": task_export_csv_incremental,
+    "archive": task_archive,
+}
+
+
+# =============================================================Batch Runner=================================================================
+
+def discover_users(registry=None):
+    """
+    Load every registered user record from the user registry.
+
+    Records without a name fall back to their username so they can be
+    mapped to their data files.
+
+    Args:
+        registry: User_Registry to read from (defaults to data/users.db)
+
+    Returns:
+        tuple: (list of user dicts, list of (username, error message))
+    """
+    registry = registry or User_Registry()
+    runnable = []
+    skipped = []
+    for username, record in registry.iter_users():
+        if "id" not in record:
+            skipped.append((username, "user record has no id"))
+            continue
+        user = dict(record)
+        user.setdefault("name", username)
+        user.setdefault("number_of_transactions", 0)
+        runnable.append(user)
+    return runnable, skipped
+
+
+def run_user_tasks(user, task_names, db_file=None):
+    """
+    Run the requested tasks for a single user (executed inside a worker process).
+
+    Output printed by the tasks is captured and returned instead of being
+    interleaved with other workers on the console. A failing task is
+    recorded and does not stop the remaining tasks. The ledger persists to
+    the registry the user was read from, and the changed record (e.g. the
+    transaction count) is written back to it at the end.
+
+    Args:
+        user: User dict
+        task_names: List of keys in BATCH_TASKS
+        db_file: Path to the user registry database the user came from (defaults to data/users.db)
+
+    Returns:
+        dict: {"user", "ok", "results": [{"task", "ok", "seconds", "output", "error"}]}
+    """
+    registry = User_Registry(db_file) if db_file else User_Registry()
+    ledger._registry = registry
+    results = []
+    for task_name in task_names:
+        buffer = io.StringIO()
+        start = time.perf_counter()
+        error = None
+        try:
+            with contextlib.redirect_stdout(buffer):
+                BATCH_TASKS[task_name](user)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        results.append({
+            "task": task_name,
+            "ok": error is None,
+            "seconds": time.perf_counter() - start,
+            "output": buffer.getvalue(),
+            "error": error,
+        })
+    try:
+        registry.update_user(user["name"], user)
+    finally:
+        registry.close()
+        ledger._registry = None
+    return {
+        "user": user["name"],
+        "ok": all(r["ok"] for r in results),
+        "results": results,
+    }
+
+
+def run_batch(task_names, workers=None, db_file=None):
+    """
+    Fan the requested tasks out over all users with a process pool.
+
+    Args:
+        task_names: List of keys in BATCH_TASKS
+        workers: Number of worker processes (defaults to the CPU count)
+        db_file: Path to the user registry database (defaults to data/users.db)
+
+    Returns:
+        dict: {"users", "succeeded", "failed", "skipped", "seconds", "results"}
+    """
+    unknown = [name for name in task_names if name not in BATCH_TASKS]
+    if unknown:
+        raise ValueError(f"Unknown task(s): {', '.join(unknown)}")
+
+    start = time.perf_counter()
+    recover()  # Finish what a crashed session left half-written before the workers read it
+    users, skipped = discover_users(User_Registry(db_file) if db_file else None)
+    results = []
+
+    if users:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(run_user_tasks, user, task_names, db_file): user for user in users}
+            for future in as_completed(futures):
+                user = futures[future]
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    # The worker itself died (e.g. the process was killed)
+                    results.append({
+                        "user": user["name"],
+                        "ok": False,
+                        "results": [{"task": None, "ok": False, "seconds": 0.0, "output": "",
+                                     "error": f"{type(e).__name__}: {e}"}],
+                    })
+
+    results.sort(key=lambda r: r["user"])
+    return {
+        "users": len(users),
+        "succeeded": sum(1 for r in results if r["ok"]),
+        "failed": sum(1 for r in results if not r["ok"]),
+        "skipped": [{"user": name, "error": reason} for name, reason in skipped],
+        "seconds": time.perf_counter() - start,
+        "results": results,
+    }
+
+
+def print_batch_summary(summary, verbose=False):
+    """Display the aggregated outcome of run_batch()."""
+    print("\n" + "="*70)
+    print("⚙️ BATCH RUN SUMMARY")
+    print("="*70)
+    print(f"Users processed: {summary['users']}")
+    print(f"✅ Succeeded   : {summary['succeeded']}")
+    print(f"❌ Failed      : {summary['failed']}")
+    print(f"⏭️ Skipped     : {len(summary['skipped'])}")
+    print(f"⏱️ Time        : {summary['seconds']:.2f}s")
+    print("-"*70)
+
+    for entry in summary["results"]:
+        for result in entry["results"]:
+            status = "✅" if result["ok"] else "❌"
+            line = f"{status} {entry['user']:<20} {str(result['task']):<16} {result['seconds']:>7.3f}s"
+            if result["error"]:
+                line += f"  {result['error']}"
+            print(line)
+            if verbose and result["output"]:
+                for output_line in result["output"].rstrip().splitlines():
+                    print(f"      {output_line}")
+
+    for entry in summary["skipped"]:
+        print(f"⏭️ {entry['user']:<20} {entry['error']}")
+    print("="*70 + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run per-user maintenance tasks for every registered user.")
+    parser.add_argument("tasks", nargs="+", choices=sorted(BATCH_TASKS), help="tasks to run, in order")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--db", default=None, help="path to the user registry database")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    parser.add_argument("-v", "--verbose", action="store_true", help="show the output of every task")
+    args = parser.parse_args(argv)
+
+    summary = run_batch(args.tasks, workers=args.workers, db_file=args.db)
+    if args.json:
+        print(json.dumps(summary, indent=4))
+    else:
+        print_batch_summary(summary, verbose=args.verbose)
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,477 @@
+"""
+Non-interactive command line for scripts and cron jobs.
+
+Every command reuses the functions behind the interactive menus but takes
+its input from arguments (or stdin) instead of prompts. Progress messages
+go to stderr, so stdout only carries the result; add --json for JSON.
+
+Examples:
+    python -m pfm add --user alice --type expense --amount 12.50 --category food
+    cat rows.jsonl | python -m pfm add --user alice --batch
+    python -m pfm import statement.csv --user alice
+    python -m pfm report --user alice --month 2025-10 --json
+    python -m pfm apply-recurring --all-users --workers 4
+    python -m pfm aggregate --workers 4
+    python -m pfm archive --all-users --months 24
+    python -m pfm migrate-amounts
+    python -m pfm serve --port 8765
+"""
+import argparse
+import contextlib
+import csv # For CSV input/output
+import datetime # For date/time handling
+import itertools # For reading batches in chunks
+import json # For JSON output
+import sys
+import time
+
+from .user_registry import User_Registry
+from .write_ahead_log import recover
+
+
+class CLI_Error(Exception):
+    """A user-facing error: printed to stderr, exit status 1."""
+
+
+def quiet():
+    """Send the messages printed by the shared functions to stderr."""
+    return contextlib.redirect_stdout(sys.stderr)
+
+
+def emit(args, data, text=None):
+    """Print a result: JSON with --json, otherwise the text (or JSON when there is no text form)."""
+    if args.json or text is None:
+        print(json.dumps(data, indent=4, default=str))
+    else:
+        print(text)
+
+
+def open_registry(args):
+    """Open the user registry and make the ledger persist to the same database."""
+    from . import ledger
+
+    registry = User_Registry(args.db) if args.db else User_Registry()
+    ledger._registry = registry
+    return registry
+
+
+def load_user(registry, username):
+    user = registry.get_user(username)
+    if user is None:
+        raise CLI_Error(f"unknown user '{username}'")
+    user.setdefault("name", username)
+    user.setdefault("number_of_transactions", 0)
+    return user
+
+
+def parse_date(value):
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{value}' (expected YYYY-MM-DD)")
+
+
+def parse_month(value):
+    try:
+        return datetime.datetime.strptime(value, "%Y-%m").strftime("%Y-%m")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid month '{value}' (expected YYYY-MM)")
+
+
+# =============================================================Commands=================================================================
+
+def command_users(args):
+    registry = open_registry(args)
+    users = [
+        {"name": name, "id": record.get("id"), "balance": record.get("balance", 0.0),
+         "transactions": record.get("number_of_transactions", 0)}
+        for name, record in registry.iter_users()
+    ]
+    emit(args, users, "\n".join(f"{u['name']}\t{u['id']}\t{u['balance']:.2f}\t{u['transactions']}" for u in users))
+    return 0
+
+
+def command_add(args):
+    from .money import public_record
+    from .transaction_manager import Transaction, add_transaction
+    from .transaction_index import next_transaction_id
+
+    registry = open_registry(args)
+    user = load_user(registry, args.user)
+
+    if args.batch:
+        stats = import_rows(user, read_stdin_rows(sys.stdin, args.format), args.chunk_size, "<stdin>")
+        registry.update_user(user["name"], user)
+        emit(args, stats, f"{stats['imported']} added, {stats['duplicates']} duplicate(s), {stats['invalid']} invalid")
+        return 0 if stats["invalid"] == 0 else 1
+
+    if args.type is None or args.amount is None or args.category is None:
+        raise CLI_Error("--type, --amount and --category are required (or use --batch)")
+    if args.amount <= 0:
+        raise CLI_Error("--amount must be positive")
+
+    with quiet():
+        transaction = Transaction(next_transaction_id(user), args.type, user["id"], args.amount,
+                                  args.date or datetime.date.today(), args.category.lower(),
+                                  args.description, args.payment_method)
+        add_transaction(user, transaction)
+    registry.update_user(user["name"], user)
+    emit(args, public_record(transaction.to_dict()), transaction.transaction_id)
+    return 0
+
+
+def read_stdin_rows(stream, data_format="auto"):
+    """
+    Yield transaction rows (dicts of strings) from JSON lines or CSV with a header.
+
+    With data_format "auto" the first non-blank character decides: "{" means JSON lines.
+    """
+    first = ""
+    for first in stream:
+        if first.strip():
+            break
+    if not first.strip():
+        return
+    if data_format == "auto":
+        data_format = "jsonl" if first.lstrip().startswith("{") else "csv"
+
+    lines = itertools.chain([first], stream)
+    if data_format == "csv":
+        yield from csv.DictReader(lines)
+        return
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise CLI_Error(f"line {number}: invalid JSON ({e})")
+        yield {key: "" if value is None else str(value) for key, value in record.items()}
+
+
+def import_rows(user, rows, chunk_size, source):
+    """Validate and append rows in chunks, like the streaming CSV import."""
+    from .transaction_manager import _convert_csv_chunk, _start_import, _merge_import_batch, _finish_import
+
+    with quiet():
+        state = _start_import(user)
+        stats = {"rows": 0, "imported": 0, "duplicates": 0, "invalid": 0, "seconds": 0.0}
+        errors = []
+        date_cache = {}
+        start = time.perf_counter()
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not chunk:
+                break
+            first_line = stats["rows"] + 1
+            stats["rows"] += len(chunk)
+            transactions, chunk_errors = _convert_csv_chunk(user["id"], chunk, first_line, date_cache)
+            stats["invalid"] += len(chunk_errors)
+            errors.extend(chunk_errors[:max(0, 10 - len(errors))])
+            _merge_import_batch(user, transactions, state, stats)
+        return _finish_import(user, source, stats, errors, start)
+
+
+def command_import(args):
+    from .transaction_manager import import_transactions_from_csv_streaming
+    from .parallel_import import import_transactions_from_csv_parallel
+
+    registry = open_registry(args)
+    user = load_user(registry, args.user)
+
+    if args.file == "-":
+        stats = import_rows(user, read_stdin_rows(sys.stdin, "csv"), args.chunk_size, "<stdin>")
+    elif args.profile:
+        from .statement_importer import import_statements
+        with quiet():
+            stats = import_statements(user, args.file, profile_name=args.profile)
+    elif args.workers and args.workers > 1:
+        with quiet():
+            stats = import_transactions_from_csv_parallel(user, args.file, workers=args.workers)
+    else:
+        with quiet():
+            stats = import_transactions_from_csv_streaming(user, args.file, chunk_size=args.chunk_size)
+
+    if stats is None:
+        raise CLI_Error(f"nothing imported from '{args.file}'")
+    registry.update_user(user["name"], user)
+    emit(args, stats, f"{stats['imported']} imported, {stats['duplicates']} duplicate(s), {stats['invalid']} invalid")
+    return 0
+
+
+def command_export(args):
+    from .transaction_manager import export_transactions_to_csv_streaming
+    from .incremental_export import export_transactions_incremental
+
+    registry = open_registry(args)
+    user = load_user(registry, args.user)
+
+    with quiet():
+        if args.incremental or args.full:
+            if args.start or args.end or args.category:
+                raise CLI_Error("--from/--to/--category cannot be combined with --incremental")
+            result = export_transactions_incremental(user, args.output, full=args.full)
+        else:
+            filename = args.output or f"{user['name']}_transactions.csv" + (".gz" if args.gzip else "")
+            count = export_transactions_to_csv_streaming(user, filename, args.start, args.end,
+                                                         args.category, compress=args.gzip)
+            result = {"mode": "filtered" if args.start or args.end or args.category else "full",
+                      "file": filename, "total": count}
+    emit(args, result, f"{result['total']} transaction(s) exported")
+    return 0
+
+
+def command_list(args):
+    from .archive import iter_archived_records
+    from .file_lock import iter_json_array
+    from .money import public_record
+    from .paths import transaction_file_path
+
+    registry = open_registry(args)
+    user = load_user(registry, args.user)
+    start = args.start.isoformat() if args.start else None
+    end = args.end.isoformat() if args.end else None
+    categories = {c.lower() for c in args.category} if args.category else None
+
+    fieldnames = ["transaction_id", "type", "user_id", "amount", "date", "category", "description", "payment_method"]
+    writer = None if args.json else csv.DictWriter(sys.stdout, fieldnames=fieldnames, extrasaction="ignore")
+    if writer:
+        writer.writeheader()
+
+    shown = 0
+    records = itertools.chain(iter_archived_records(user, start, end), iter_json_array(transaction_file_path(user)))
+    for record in records:
+        if (start and record["date"] < start) or (end and record["date"] > end):
+            continue
+        if categories and str(record.get("category", "")).lower() not in categories:
+            continue
+        if args.type and record.get("type") != args.type:
+            continue
+        record = public_record(record)
+        if writer:
+            writer.writerow(record)
+        else:
+            print(json.dumps(record))  # One JSON object per line
+        shown += 1
+        if args.limit and shown >= args.limit:
+            break
+    return 0
+
+
+def command_report(args):
+    from .archive import month_bounds, with_archive
+    from .transaction_manager import read_transaction_file, summarize_transactions
+
+    registry = open_registry(args)
+    user = load_user(registry, args.user)
+    with quiet():
+        transactions = read_transaction_file(user)
+    # Archived months are read too (for one month, only its year)
+    bounds = month_bounds(*map(int, args.month.split("-"))) if args.month else (None, None)
+    transactions = with_archive(user, transactions, *bounds)
+    summary = summarize_transactions(transactions, args.month)
+    summary["user"] = user["name"]
+    summary["budget_limit"] = user.get("monthly_budget_limit")
+
+    lines = [
+        f"User        : {user['name']}",
+        f"Period      : {args.month or 'all time'}",
+        f"Transactions: {summary['transactions']}",
+        f"Income      : {summary['income']:.2f}",
+        f"Expenses    : {summary['expenses']:.2f}",
+        f"Net         : {summary['net']:.2f}",
+    ]
+    lines += [f"  {category:<12}{amount:>12.2f}" for category, amount in summary["expenses_by_category"].items()]
+    emit(args, summary, "\n".join(lines))
+    return 0
+
+
+def command_balance(args):
+    registry = open_registry(args)
+    user = load_user(registry, args.user)
+    result = {key: user.get(key, 0.0) for key in ("balance", "total_income", "total_expense")}
+    result["user"] = user["name"]
+    emit(args, result, f"{result['balance']:.2f}")
+    return 0
+
+
+def command_apply_recurring(args):
+    from .batch_runner import run_batch
+    from .recurring_transactions_manager import apply_recurring_transactions
+
+    if args.all_users:
+        summary = run_batch(["apply_recurring"], workers=args.workers, db_file=args.db)
+        emit(args, summary, f"{summary['succeeded']}/{summary['users']} user(s) processed in {summary['seconds']:.2f}s")
+        return 0 if summary["failed"] == 0 else 1
+
+    if not args.user:
+        raise CLI_Error("give --user NAME or --all-users")
+    registry = open_registry(args)
+    user = load_user(registry, args.user)
+    with quiet():
+        apply_recurring_transactions(user)
+    registry.update_user(user["name"], user)
+    emit(args, {"user": user["name"], "ok": True}, f"recurring transactions applied for {user['name']}")
+    return 0
+
+
+def command_aggregate(args):
+    from .aggregate_report import aggregate_report, render_aggregate_report
+
+    result = aggregate_report(workers=args.workers, use_cache=not args.no_cache)
+    if args.json:
+        emit(args, result)
+    else:
+        render_aggregate_report(result, months=args.months)
+    return 0 if not result["errors"] else 1
+
+
+def command_archive(args):
+    from .archive import ARCHIVE_AFTER_MONTHS, archive_transactions
+
+    months = ARCHIVE_AFTER_MONTHS if args.months is None else args.months
+    if months < 0:
+        raise CLI_Error("--months cannot be negative")
+    registry = open_registry(args)
+    usernames = registry.usernames() if args.all_users else [args.user]
+
+    results = []
+    with quiet():
+        for username in usernames:
+            user = load_user(registry, username)
+            result = archive_transactions(user, months)
+            registry.update_user(user["name"], user)
+            results.append(dict(result, user=user["name"]))
+
+    lines = [f"{r['user']}: {r['archived']} transaction(s) from before {r['before']} archived, {r['kept']} kept"
+             for r in results]
+    emit(args, results if args.all_users else results[0], "\n".join(lines))
+    return 0
+
+
+def command_migrate_amounts(args):
+    from .money import migrate_amounts
+
+    with quiet():
+        result = migrate_amounts(args.data_dir)
+    emit(args, result, f"{result['records']} amount(s) in {result['files']} file(s) and "
+                       f"{result['archives']} archive(s) converted to cents")
+    return 0
+
+
+def command_serve(args):
+    from .api_server import serve
+    return serve(args.host, args.port, args.db, args.verbose)
+
+
+# =============================================================Parser=================================================================
+
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--json", action="store_true", help="print the result as JSON")
+    common.add_argument("--db", default=None, help="path to the user registry database")
+
+    with_user = argparse.ArgumentParser(add_help=False, parents=[common])
+    with_user.add_argument("-u", "--user", required=True, help="username")
+
+    parser = argparse.ArgumentParser(prog="pfm", description="Personal Finance Manager, non-interactive commands.")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="command")
+
+    p = commands.add_parser("users", parents=[common], help="list registered users")
+    p.set_defaults(handler=command_users)
+
+    p = commands.add_parser("add", parents=[with_user], help="add one transaction, or a batch from stdin")
+    p.add_argument("--type", choices=["income", "expense"])
+    p.add_argument("--amount", type=float)
+    p.add_argument("--date", type=parse_date, help="YYYY-MM-DD (default: today)")
+    p.add_argument("--category")
+    p.add_argument("--description")
+    p.add_argument("--payment-method", choices=["cash", "credit", "debit", "other"])
+    p.add_argument("--batch", action="store_true", help="read transactions from stdin (JSON lines or CSV)")
+    p.add_argument("--format", choices=["auto", "jsonl", "csv"], default="auto", help="stdin format for --batch")
+    p.add_argument("--chunk-size", type=int, default=5000)
+    p.set_defaults(handler=command_add)
+
+    p = commands.add_parser("import", parents=[with_user], help="merge a CSV file (or - for stdin)")
+    p.add_argument("file", help="CSV file, statement file/directory with --profile, or -")
+    p.add_argument("--profile", help="bank statement column profile")
+    p.add_argument("-w", "--workers", type=int, default=None, help="parse with a process pool")
+    p.add_argument("--chunk-size", type=int, default=5000)
+    p.set_defaults(handler=command_import)
+
+    p = commands.add_parser("export", parents=[with_user], help="export transactions to CSV")
+    p.add_argument("-o", "--output", help="output file (.gz for gzip)")
+    p.add_argument("--from", dest="start", type=parse_date)
+    p.add_argument("--to", dest="end", type=parse_date)
+    p.add_argument("--category", action="append", help="repeat for several categories")
+    p.add_argument("--gzip", action="store_true")
+    p.add_argument("--incremental", action="store_true", help="append only new transactions (edits trigger a full export)")
+    p.add_argument("--full", action="store_true", help="force a full re-export (resets the watermark)")
+    p.set_defaults(handler=command_export)
+
+    p = commands.add_parser("list", parents=[with_user], help="print transactions as CSV (or JSON lines)")
+    p.add_argument("--from", dest="start", type=parse_date)
+    p.add_argument("--to", dest="end", type=parse_date)
+    p.add_argument("--category", action="append")
+    p.add_argument("--type", choices=["income", "expense"])
+    p.add_argument("--limit", type=int, default=None)
+    p.set_defaults(handler=command_list)
+
+    p = commands.add_parser("report", parents=[with_user], help="income/expense summary")
+    p.add_argument("--month", type=parse_month, help="YYYY-MM (default: all time)")
+    p.set_defaults(handler=command_report)
+
+    p = commands.add_parser("balance", parents=[with_user], help="current running totals")
+    p.set_defaults(handler=command_balance)
+
+    p = commands.add_parser("apply-recurring", parents=[common], help="apply due recurring transactions")
+    target = p.add_mutually_exclusive_group(required=True)
+    target.add_argument("-u", "--user")
+    target.add_argument("--all-users", action="store_true")
+    p.add_argument("-w", "--workers", type=int, default=None, help="worker processes for --all-users")
+    p.set_defaults(handler=command_apply_recurring)
+
+    p = commands.add_parser("aggregate", parents=[common], help="totals across all users")
+    p.add_argument("-w", "--workers", type=int, default=None, help="worker processes (1: no pool)")
+    p.add_argument("--no-cache", action="store_true", help="re-read every file instead of only changed ones")
+    p.add_argument("--months", type=int, default=12, help="months shown in the chart")
+    p.set_defaults(handler=command_aggregate)
+
+    p = commands.add_parser("archive", parents=[common], help="move old months into the compressed archive")
+    target = p.add_mutually_exclusive_group(required=True)
+    target.add_argument("-u", "--user")
+    target.add_argument("--all-users", action="store_true")
+    p.add_argument("--months", type=int, default=None,
+                   help="closed months kept in the transaction file besides the current one (default: 24)")
+    p.set_defaults(handler=command_archive)
+
+    p = commands.add_parser("migrate-amounts", parents=[common],
+                            help="convert data files written with float amounts to integer cents")
+    p.add_argument("--data-dir", default="data", help="data folder (default: data)")
+    p.set_defaults(handler=command_migrate_amounts)
+
+    p = commands.add_parser("serve", help="serve the data as a local JSON API")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765, help="0 picks a free port")
+    p.add_argument("--db", default=None, help="path to the user registry database")
+    p.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    p.set_defaults(handler=command_serve)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        with quiet():
+            recover()  # Finish what a crashed session left half-written
+        return args.handler(args)
+    except CLI_Error as e:
+        print(f"pfm: error: {e}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        return 0  # Output piped into e.g. head
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,84 @@
+"""
+Transaction dates as integer day ordinals and month keys.
+
+A date is kept as its proleptic Gregorian ordinal (datetime.date.toordinal(),
+day 1 = 0001-01-01) plus a month key, year * 12 + month - 1, so filters
+compare plain ints and reports bucket by month without building date
+objects or formatting strings. Consecutive months have consecutive keys.
+
+Stored files keep ISO date strings; decode_iso_date() turns them into
+(ordinal, month key) and remembers each distinct string, since a
+transaction file repeats the same few thousand dates many times.
+"""
+import calendar # For month lengths
+import datetime # For date/time handling
+from functools import lru_cache
+
+# Distinct date strings remembered by the decoders (about 27 years of days)
+DATE_CACHE_SIZE = 10000
+
+
+def year_month_key(year, month):
+    """Return the month key of a year and month (1-12)."""
+    return year * 12 + month - 1
+
+
+def month_of_key(key):
+    """Return (year, month) of a month key."""
+    year, month = divmod(key, 12)
+    return year, month + 1
+
+
+def month_key_of(date):
+    """Return the month key of a datetime.date."""
+    return date.year * 12 + date.month - 1
+
+
+def add_months(date, months):
+    """
+    Return the same day `months` calendar months later.
+
+    Days 29-31 are clamped to the last day of shorter months, so
+    2025-01-31 + 1 month is 2025-02-28 and + 2 months is 2025-03-31.
+    Monthly recurring items are scheduled with this, both when they are
+    applied and when they are forecast.
+    """
+    year, month = month_of_key(month_key_of(date) + months)
+    return datetime.date(year, month, min(date.day, calendar.monthrange(year, month)[1]))
+
+
+def parse_month_key(text):
+    """
+    Return the month key of a "YYYY-MM" string.
+
+    Raises:
+        ValueError: If the text is not a valid month
+    """
+    year, month = datetime.datetime.strptime(text, "%Y-%m").timetuple()[:2]
+    return year_month_key(year, month)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def decode_iso_date(text):
+    """
+    Decode an ISO date string into (ordinal, month key).
+
+    "YYYY-MM-DD" is split by position; anything else (e.g. a datetime with
+    a time part) goes through datetime.fromisoformat().
+
+    Raises:
+        ValueError: If the text is not a valid ISO date
+    """
+    if len(text) == 10 and text[4] == "-" and text[7] == "-":
+        year, month, day = text[:4], text[5:7], text[8:]
+        if year.isdigit() and month.isdigit() and day.isdigit():
+            date = datetime.date(int(year), int(month), int(day))  # Validates the day of month
+            return date.toordinal(), year_month_key(date.year, date.month)
+    date = datetime.datetime.fromisoformat(text).date()
+    return date.toordinal(), year_month_key(date.year, date.month)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_iso_date(text):
+    """Return the datetime.date of an ISO date string (shared, dates are immutable)."""
+    return datetime.date.fromordinal(decode_iso_date(text)[0])
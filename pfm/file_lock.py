@@ -0,0 +1,344 @@
+import codecs # For decoding files in chunks
+import contextlib # For lock context managers
+import json # For JSON data storage
+import os # For file operations
+import tempfile
+
+try:
+    import fcntl # Advisory locks (POSIX only)
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+class Version_Conflict(Exception):
+    """Raised when a file changed between reading it and writing it back."""
+
+    def __init__(self, path, expected_version, current_version):
+        super().__init__(
+            f"{path} changed since it was read (expected version {expected_version}, found {current_version})"
+        )
+        self.path = path
+        self.expected_version = expected_version
+        self.current_version = current_version
+
+
+def lock_path(path, suffix=".lock"):
+    """Return the sidecar lock file used for a data file."""
+    return path + suffix
+
+
+@contextlib.contextmanager
+def locked(path, shared=False, suffix=".lock"):
+    """
+    Hold an advisory lock on a data file for the duration of the block.
+
+    The lock is taken on a sidecar "<file>.lock" file rather than the data
+    file itself, because writers replace the data file atomically. The
+    sidecar also stores the file's version number.
+
+    Args:
+        path: Data file to lock
+        shared: True for a shared (read) lock, False for an exclusive (write) lock
+        suffix: Sidecar suffix, to keep independent locks on the same file
+
+    Yields:
+        file: The open lock file (used to read/bump the version)
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(lock_path(path, suffix), "a+") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield lock_file
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _read_version(lock_file):
+    lock_file.seek(0)
+    content = lock_file.read().strip()
+    return int(content) if content.isdigit() else 0
+
+
+def _write_version(lock_file, version):
+    lock_file.seek(0)
+    lock_file.truncate()
+    lock_file.write(str(version))
+    lock_file.flush()
+
+
+def get_version(path):
+    """Return the current version number of a data file (0 if never written)."""
+    with locked(path, shared=True) as lock_file:
+        return _read_version(lock_file)
+
+
+def read_json(path, default=None):
+    """
+    Read a JSON data file under a shared lock.
+
+    Readers only hold the lock while the file is read and parsed, so long
+    reports built from the result never block writers.
+
+    Args:
+        path: JSON file to read
+        default: Value returned when the file does not exist
+
+    Returns:
+        tuple: (parsed data, version number)
+
+    Raises:
+        json.JSONDecodeError: If the file is corrupted
+    """
+    with locked(path, shared=True) as lock_file:
+        version = _read_version(lock_file)
+        if not os.path.exists(path):
+            return default, version
+        with open(path, "r") as file:
+            return json.load(file), version
+
+
+def write_json(path, data, expected_version=None, indent=4):
+    """
+    Atomically replace a JSON data file under an exclusive lock.
+
+    The new content is written to a temporary file in the same directory
+    and moved over the old one, so readers see either the old or the new
+    file, never a partial write.
+
+    Args:
+        path: JSON file to write
+        data: JSON-serializable data
+        expected_version: Version the caller read; if the file has moved on
+                          since then a Version_Conflict is raised instead of
+                          overwriting someone else's changes
+        indent: JSON indentation
+
+    Returns:
+        int: The new version number
+
+    Raises:
+        Version_Conflict: If expected_version does not match
+    """
+    with locked(path) as lock_file:
+        current_version = _read_version(lock_file)
+        if expected_version is not None and expected_version != current_version:
+            raise Version_Conflict(path, expected_version, current_version)
+
+        _replace_file(path, data, indent)
+        _write_version(lock_file, current_version + 1)
+        return current_version + 1
+
+
+def create_json(path, data, indent=4):
+    """
+    Create a JSON data file that does not exist yet, under an exclusive lock.
+
+    The version carries on from the sidecar rather than starting at 1: if
+    the data file was deleted but its .lock sidecar stayed behind, the new
+    file still gets a version no earlier copy had, and the version readers
+    get back matches the file writers will check against.
+
+    Args:
+        path: JSON file to create
+        data: JSON-serializable initial content
+
+    Returns:
+        int: The new version number, or None if the file already exists
+    """
+    with locked(path) as lock_file:
+        if os.path.exists(path):
+            return None
+        current_version = _read_version(lock_file)
+        _replace_file(path, data, indent)
+        _write_version(lock_file, current_version + 1)
+        return current_version + 1
+
+
+def _replace_file(path, data, indent):
+    """Write data to a temporary file next to path and move it into place (the caller holds the lock)."""
+    directory = os.path.dirname(path) or "."
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as temp_file:
+            json.dump(data, temp_file, indent=indent)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def append_json_array(path, items, indent=4, journal=None):
+    """
+    Append items to a JSON array file in place, under an exclusive lock.
+
+    Only the closing bracket is rewritten, so the cost depends on the size
+    of the batch and not on the size of the file. The output matches what
+    json.dump(..., indent=4) produces for the whole list. If the write
+    fails the file is truncated back to its previous content.
+
+    Args:
+        path: JSON file holding a list (created if missing)
+        items: JSON-serializable items to append
+        indent: JSON indentation used by the file
+        journal: Called as journal(size, tail) under the lock before the file
+                 is changed: the file had size bytes and the append replaces
+                 the last len(tail) of them (see restore_json_array())
+
+    Returns:
+        int: The new version number
+
+    Raises:
+        ValueError: If the file does not contain a JSON array
+    """
+    with locked(path) as lock_file:
+        current_version = _read_version(lock_file)
+        if not items:
+            return current_version
+
+        pad = " " * indent
+        encoded = ",\n".join(
+            pad + json.dumps(item, indent=indent).replace("\n", "\n" + pad) for item in items
+        )
+
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            if journal is not None:
+                journal(0, b"")
+            with open(path, "w") as file:
+                file.write("[\n" + encoded + "\n]")
+                file.flush()
+                os.fsync(file.fileno())
+        else:
+            with open(path, "r+b") as file:
+                original_size = file.seek(0, os.SEEK_END)
+                # Find the closing bracket and the last item before it
+                tail_size = min(original_size, 4096)
+                file.seek(original_size - tail_size)
+                tail = file.read(tail_size)
+                close = tail.rstrip().rfind(b"]")
+                before = tail[:max(close, 0)].rstrip()
+                if close < 0 or (not before and tail_size == original_size):
+                    raise ValueError(f"{path} does not contain a JSON array")
+                insert_at = original_size - tail_size + len(before)
+                separator = "\n" if before.endswith(b"[") else ",\n"
+
+                if journal is not None:
+                    journal(original_size, tail[len(before):])
+                try:
+                    file.seek(insert_at)
+                    file.truncate()
+                    file.write((separator + encoded + "\n]").encode("utf-8"))
+                    file.flush()
+                    os.fsync(file.fileno())
+                except BaseException:
+                    # Put the original closing bracket back
+                    file.seek(insert_at)
+                    file.truncate()
+                    file.write(tail[len(before):])
+                    raise
+
+        _write_version(lock_file, current_version + 1)
+        return current_version + 1
+
+
+def restore_json_array(path, size, tail):
+    """
+    Undo an append_json_array() that may not have finished.
+
+    Cuts the file back to the content described by the journal callback:
+    size bytes, the last len(tail) of them being tail.
+
+    Args:
+        path: JSON array file
+        size: File size before the append
+        tail: Bytes the append replaced (the closing bracket)
+
+    Returns:
+        bool: True if the file was changed, False if the append never touched it
+    """
+    with locked(path) as lock_file:
+        if not os.path.exists(path):
+            return False
+        if size == 0:
+            os.remove(path)  # The append created the file
+            _write_version(lock_file, _read_version(lock_file) + 1)
+            return True
+        keep = size - len(tail)
+        with open(path, "r+b") as file:
+            current_size = file.seek(0, os.SEEK_END)
+            file.seek(keep)
+            if current_size == size and file.read() == tail:
+                return False
+            file.seek(keep)
+            file.truncate()
+            file.write(tail)
+            file.flush()
+            os.fsync(file.fileno())
+        _write_version(lock_file, _read_version(lock_file) + 1)
+        return True
+
+
+def iter_json_array(path, chunk_size=1024 * 1024):
+    """
+    Yield the items of a JSON array file one at a time.
+
+    The file is decoded incrementally, so memory use depends on the chunk
+    size rather than on the file size. The shared lock is only held while
+    the file is opened: writers either replace the file (the open handle
+    keeps reading the old one) or append after the last item, and only the
+    items that existed when the file was opened are yielded.
+
+    Args:
+        path: JSON file holding a list
+        chunk_size: Number of bytes read at a time
+
+    Yields:
+        The decoded items, in file order
+    """
+    if not os.path.exists(path):
+        return
+
+    with locked(path, shared=True):
+        file = open(path, "rb")
+        size = os.fstat(file.fileno()).st_size
+
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    with file:
+        remaining = size
+        buffer = ""
+        position = 0
+        started = False
+        eof = False
+
+        while True:
+            # Skip whitespace, separators and the opening bracket
+            while position < len(buffer) and buffer[position] in " \t\r\n,[":
+                if buffer[position] == "[":
+                    started = True
+                position += 1
+
+            if position < len(buffer) and started:
+                if buffer[position] == "]":
+                    return
+                try:
+                    item, position = decoder.raw_decode(buffer, position)
+                    yield item
+                    continue
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+
+            if eof:
+                return
+
+            # Need more data: drop what was consumed and read the next chunk
+            data = file.read(min(chunk_size, remaining))
+            remaining -= len(data)
+            eof = remaining <= 0 or not data
+            buffer = buffer[position:] + text_decoder.decode(data, final=eof)
+            position = 0
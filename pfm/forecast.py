@@ -0,0 +1,287 @@
+import datetime # For date/time handling
+from .dates import add_months
+from .money import from_cents
+from .archive import archived_totals
+from .recurring_transactions_manager import read_recurring_transaction_file
+from .metrics import instrumented
+
+
+# =============================================================Schedule Expansion=================================================================
+
+def _month_index(date):
+    """Return a running month number (year * 12 + month - 1) for a date."""
+    return date.year * 12 + date.month - 1
+
+
+def _month_start_ordinal(month_index):
+    """Return the ordinal of the first day of a running month number."""
+    year, month = divmod(month_index, 12)
+    return datetime.date(year, month + 1, 1).toordinal()
+
+
+def expand_schedule(recurring_transaction, start_date, end_date):
+    """
+    Expand a recurring transaction into all of its occurrence dates in bulk.
+
+    Occurrences follow the same rules as apply_recurring_transactions():
+    an overdue item is applied once on start_date and then rolls forward
+    to its next future slot. Monthly items keep their day of month and are
+    clamped to the last day of shorter months (dates.add_months(), which
+    apply_recurring_transactions() uses too).
+
+    Args:
+        recurring_transaction: RecurringTransaction object
+        start_date: First day of the forecast window (datetime.date)
+        end_date: Last day of the forecast window (datetime.date)
+
+    Returns:
+        list: Date ordinals (int) of every occurrence in the window
+    """
+    first = recurring_transaction.next_date.toordinal()
+    start = start_date.toordinal()
+    end = end_date.toordinal()
+    if first > end:
+        return []
+
+    catch_up = []
+    if first <= start:
+        # Overdue (or due today): applied once today, then rolled past today
+        catch_up = [start]
+
+    if recurring_transaction.frequency == 'weekly':
+        if first <= start:
+            first += ((start - first) // 7 + 1) * 7
+        return catch_up + list(range(first, end + 1, 7))
+
+    if recurring_transaction.frequency == 'monthly':
+        months = _month_index(end_date) - _month_index(recurring_transaction.next_date)
+        ordinals = [add_months(recurring_transaction.next_date, step).toordinal() for step in range(months + 1)]
+        return catch_up + [o for o in ordinals if start < o <= end]
+
+    return []
+
+
+# =============================================================Forecast Engine=================================================================
+
+def _recurring_signature(transaction):
+    """Key used to recognise past applications of a recurring transaction."""
+    return (transaction.type, transaction.category, transaction.amount_cents, transaction.description)
+
+
+def historical_monthly_averages(transaction_list, recurring_list):
+    """
+    Average monthly income and expense from the transaction history.
+
+    Transactions that match a recurring item (same type, category, amount
+    and description) are left out so they are not counted twice once the
+    recurring schedule is added on top. Months without any activity between
+    the first and last recorded month count as zero.
+
+    Args:
+        transaction_list: List of Transaction objects
+        recurring_list: List of RecurringTransaction objects
+
+    Returns:
+        tuple: (average_income, average_expense) per month as floats
+    """
+    recurring_signatures = {_recurring_signature(rt.transaction) for rt in recurring_list}
+    income = 0
+    expense = 0
+    months = set()
+
+    for trans in transaction_list:
+        if _recurring_signature(trans) in recurring_signatures:
+            continue
+        months.add(trans.month_key)  # Same numbering as _month_index()
+        if trans.type == "income":
+            income += trans.amount_cents
+        elif trans.type == "expense":
+            expense += trans.amount_cents
+
+    if not months:
+        return 0.0, 0.0
+
+    span = max(months) - min(months) + 1
+    return from_cents(income) / span, from_cents(expense) / span
+
+
+@instrumented("report.cash_flow_forecast")
+def forecast_cash_flow(transaction_list, recurring_list, months=12, start_date=None, archived=None):
+    """
+    Project the balance month by month from recurring items and history.
+
+    Every recurring item is expanded into its occurrence dates and summed
+    into per-day income/expense arrays. Month totals are then taken as
+    slices of those arrays, so the cost grows with the number of
+    occurrences rather than with items x days.
+
+    The starting balance includes the archived months; the historical
+    averages only use the transactions file, because the archive keeps
+    per-category totals and not the transactions a recurring item matches.
+
+    Args:
+        transaction_list: List of Transaction objects (history)
+        recurring_list: List of RecurringTransaction objects
+        months: Number of months to project, starting with the current one
+        start_date: First forecast day (defaults to today)
+        archived: Totals of the archived months (archive.archived_totals()), added to the starting balance
+
+    Returns:
+        dict: {
+            "start_date", "end_date", "starting_balance",
+            "average_income", "average_expense",
+            "daily_income", "daily_expense",   # cents, lists indexed by day offset
+            "months": [{"month": (year, month), "recurring_income",
+                        "recurring_expense", "projected_income",
+                        "projected_expense", "net", "balance"}, ...]
+        }
+    """
+    if start_date is None:
+        start_date = datetime.date.today()
+    months = max(int(months), 1)
+
+    first_month = _month_index(start_date)
+    last_month = first_month + months - 1
+    end_date = datetime.date.fromordinal(_month_start_ordinal(last_month + 1) - 1)
+
+    origin = start_date.toordinal()
+    days = end_date.toordinal() - origin + 1
+    daily_income = [0] * days
+    daily_expense = [0] * days
+
+    # Step 1: Expand every schedule and accumulate it into the day arrays
+    for rt in recurring_list:
+        occurrences = expand_schedule(rt, start_date, end_date)
+        if not occurrences:
+            continue
+        target = daily_income if rt.transaction.type == "income" else daily_expense
+        cents = rt.transaction.amount_cents
+        for ordinal in occurrences:
+            target[ordinal - origin] += cents
+
+    # Step 2: Historical baseline for non-recurring activity
+    average_income, average_expense = historical_monthly_averages(transaction_list, recurring_list)
+    balance_cents = sum(
+        t.amount_cents if t.type == "income" else -t.amount_cents
+        for t in transaction_list if t.type in ("income", "expense")
+    )
+    if archived:
+        balance_cents += archived["income_cents"] - archived["expense_cents"]
+    starting_balance = from_cents(balance_cents)
+
+    # Step 3: Slice the day arrays into calendar months
+    projection = []
+    balance = starting_balance
+    for month_index in range(first_month, last_month + 1):
+        lo = max(_month_start_ordinal(month_index) - origin, 0)
+        hi = _month_start_ordinal(month_index + 1) - origin
+        # The current month is usually partial, so scale the baseline to the days left
+        month_days = _month_start_ordinal(month_index + 1) - _month_start_ordinal(month_index)
+        share = (hi - lo) / month_days
+
+        recurring_income = from_cents(sum(daily_income[lo:hi]))
+        recurring_expense = from_cents(sum(daily_expense[lo:hi]))
+        projected_income = recurring_income + average_income * share
+        projected_expense = recurring_expense + average_expense * share
+        net = projected_income - projected_expense
+        balance += net
+
+        year, month = divmod(month_index, 12)
+        projection.append({
+            "month": (year, month + 1),
+            "recurring_income": recurring_income,
+            "recurring_expense": recurring_expense,
+            "projected_income": projected_income,
+            "projected_expense": projected_expense,
+            "net": net,
+            "balance": balance,
+        })
+
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "starting_balance": starting_balance,
+        "average_income": average_income,
+        "average_expense": average_expense,
+        "daily_income": daily_income,
+        "daily_expense": daily_expense,
+        "months": projection,
+    }
+
+
+# =============================================================Display=================================================================
+
+@instrumented("report.cash_flow_forecast.render")
+def render_cash_flow_forecast(forecast):
+    """
+    Display a projected balance chart in the same layout as spending_trends().
+
+    Args:
+        forecast: Dictionary returned by forecast_cash_flow()
+    """
+    projection = forecast["months"]
+    if not projection:
+        print("❌ Nothing to forecast.")
+        return
+
+    max_balance = max(abs(m["balance"]) for m in projection)
+
+    print("\n" + "="*80)
+    print("🔮 CASH-FLOW FORECAST")
+    print("="*80)
+    print(f"Period: {forecast['start_date']} → {forecast['end_date']}")
+    print(f"Starting balance: ${forecast['starting_balance']:,.2f}")
+    print(f"Average monthly income (non-recurring, non-archived months):  ${forecast['average_income']:,.2f}")
+    print(f"Average monthly expense (non-recurring, non-archived months): ${forecast['average_expense']:,.2f}")
+    print("="*80)
+
+    print("\n📊 PROJECTED BALANCE CHART")
+    print("-"*80)
+
+    for entry in projection:
+        year, month = entry["month"]
+        month_name = datetime.datetime(year, month, 1).strftime("%b %Y")
+        balance = entry["balance"]
+        bar_length = int((abs(balance) / max_balance) * 40) if max_balance > 0 else 0
+        bar = "█" * bar_length
+        indicator = "⚠️" if balance < 0 else "  "
+        print(f"{month_name:<12} {indicator} {entry['net']:>+11,.2f} ${balance:>12,.2f} {bar}")
+
+    print("-"*80)
+    print("⚠️ = Projected negative balance")
+    print("="*80)
+
+    lowest = min(projection, key=lambda m: m["balance"])
+    lowest_name = datetime.datetime(lowest["month"][0], lowest["month"][1], 1).strftime("%B %Y")
+    print(f"\n📉 LOWEST PROJECTED BALANCE")
+    print(f"   {lowest_name}: ${lowest['balance']:,.2f}")
+    print(f"\n🏁 END OF PERIOD BALANCE")
+    print(f"   ${projection[-1]['balance']:,.2f}")
+    print("="*80 + "\n")
+
+
+def cash_flow_forecast_menu(current_user, transaction_list):
+    """
+    Ask for a forecast horizon and display the projected cash flow.
+
+    Args:
+        current_user: User object
+        transaction_list: List of Transaction objects
+    """
+    while True:
+        months_input = input("How many months ahead? (default 12): ").strip()
+        if not months_input:
+            months = 12
+            break
+        try:
+            months = int(months_input)
+            if months <= 0:
+                print("❌ Please enter a positive number of months.")
+                continue
+            break
+        except ValueError:
+            print("❌ Please enter a valid number.")
+
+    recurring_list = read_recurring_transaction_file(current_user)
+    forecast = forecast_cash_flow(transaction_list, recurring_list, months, archived=archived_totals(current_user))
+    render_cash_flow_forecast(forecast)
@@ -0,0 +1,196 @@
+import array # For compact per-transaction checksums
+import csv # For writing CSV rows
+import datetime # For date/time handling
+import gzip # For compressed exports
+import json # For JSON data storage
+import os # For file operations
+import tempfile
+import zlib # For checksums
+from .paths import transaction_file_path
+from .file_lock import get_version, read_json, write_json, iter_json_array
+from .archive import archived_totals, iter_archived_records
+from .money import public_record
+
+
+EXPORT_FIELDNAMES = ["transaction_id", "type", "user_id", "amount", "date", "category", "description", "payment_method"]
+
+
+class _History_Rewritten(Exception):
+    """Raised when transactions were deleted, reordered or edited since the last export."""
+
+
+def watermark_file_path(user):
+    """Return the path of the user's export watermark."""
+    return os.path.join('data', 'exports', f'{user["name"]}_{user["id"]}.watermark.json')
+
+
+def checksum_file_path(user):
+    """Return the path of the per-transaction checksums of the last export."""
+    return os.path.join('data', 'exports', f'{user["name"]}_{user["id"]}.crc')
+
+
+def load_watermark(user):
+    """
+    Load the user's export watermark.
+
+    Returns:
+        tuple: (watermark dict or None, array of checksums)
+    """
+    watermark, _ = read_json(watermark_file_path(user), default=None)
+    checksums = array.array("I")
+    path = checksum_file_path(user)
+    if watermark and os.path.exists(path):
+        with open(path, "rb") as file:
+            checksums.frombytes(file.read())
+    return watermark, checksums
+
+
+def save_watermark(user, watermark, checksums):
+    """Store the watermark and the checksums (checksums first, so a crash leaves an older watermark)."""
+    path = checksum_file_path(user)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp_", suffix=".crc")
+    with os.fdopen(fd, "wb") as file:
+        checksums.tofile(file)
+    os.replace(temp_path, path)
+    write_json(watermark_file_path(user), watermark)
+
+
+def _record_checksums(record):
+    """Return (checksum of the id, checksum of the whole record)."""
+    return (zlib.crc32(str(record.get("transaction_id")).encode("utf-8")),
+            zlib.crc32(json.dumps(record, sort_keys=True).encode("utf-8")))
+
+
+def _open_csv(filename, mode):
+    if filename.endswith(".gz"):
+        return gzip.open(filename, mode + "t", newline="", encoding="utf-8")
+    return open(filename, mode, newline="", encoding="utf-8")
+
+
+def export_transactions_incremental(user, filename=None, full=False):
+    """
+    Export only the transactions that are new since the last export.
+
+    The watermark remembers how many transactions were exported, the last
+    id and date, the size of the CSV and a checksum per exported
+    transaction. New transactions are appended to the CSV. If transactions
+    were edited, deleted or reordered since the last run, or the CSV was
+    changed or removed, a full export is done instead, so the CSV always
+    has exactly one row per transaction (the importers keep the first row
+    of an id and skip later ones, so an appended edit would be lost).
+    A full export starts with the archived months; archiving removes
+    transactions from the transaction file, so the next run after it is a
+    full export.
+
+    Args:
+        user: User object
+        filename: CSV file (defaults to "<name>_transactions.csv"; ".gz" for gzip)
+        full: Force a full re-export
+
+    Returns:
+        dict: {"mode": "full" | "incremental", "new", "total"}
+    """
+    filename = filename or f"{user['name']}_transactions.csv"
+    data_file = transaction_file_path(user)
+    # Read the version first: anything written after this is picked up next time
+    version = get_version(data_file)
+
+    watermark, checksums = load_watermark(user)
+    # The export must still be exactly the file this watermark describes
+    if (full or not watermark or watermark.get("filename") != filename or not os.path.exists(filename)
+            or os.path.getsize(filename) != watermark.get("csv_size")
+            or len(checksums) != 2 * watermark.get("exported", 0)):
+        return _full_export(user, filename, data_file, version)
+
+    archived = archived_totals(user)["transactions"]
+    if watermark.get("version") == version:
+        print(f"✅ '{filename}' is already up to date.")
+        return {"mode": "incremental", "new": 0, "total": archived + watermark["exported"]}
+
+    # Step 1: collect the new rows in a scratch file, so nothing is appended
+    # to the export if the history turns out to have been rewritten
+    exported = watermark["exported"]
+    stats = {"mode": "incremental", "new": 0, "total": 0}
+    new_checksums = array.array("I")
+    last = {}
+
+    def new_records():
+        position = -1
+        for position, record in enumerate(iter_json_array(data_file)):
+            id_sum, record_sum = _record_checksums(record)
+            new_checksums.extend((id_sum, record_sum))
+            last.update(record)
+            if position >= exported:
+                stats["new"] += 1
+                yield public_record(record)
+            elif checksums[2 * position] != id_sum or checksums[2 * position + 1] != record_sum:
+                raise _History_Rewritten()
+        if position + 1 < exported:
+            raise _History_Rewritten()
+        stats["total"] = position + 1
+
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=".csv")
+    try:
+        with os.fdopen(fd, "w", newline="", encoding="utf-8") as temp_file:
+            writer = csv.DictWriter(temp_file, fieldnames=EXPORT_FIELDNAMES, extrasaction="ignore")
+            writer.writerows(new_records())
+
+        # Step 2: append the rows to the export
+        with open(temp_path, "r", newline="", encoding="utf-8") as temp_file, _open_csv(filename, "a") as csvfile:
+            while True:
+                chunk = temp_file.read(1024 * 1024)
+                if not chunk:
+                    break
+                csvfile.write(chunk)
+    except _History_Rewritten:
+        print("⚠️ Transactions were edited, deleted or reordered since the last export; re-exporting everything.")
+        return _full_export(user, filename, data_file, version)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    # Step 3: move the watermark forward
+    save_watermark(user, _make_watermark(filename, version, stats["total"], last), new_checksums)
+    stats["total"] += archived
+    print(f"✅ Appended {stats['new']} new transaction(s) to '{filename}'.")
+    return stats
+
+
+def _full_export(user, filename, data_file, version):
+    """Rewrite the whole export (archived months first) and reset the watermark."""
+    checksums = array.array("I")
+    last = {}
+    total = 0
+    archived = 0
+
+    with _open_csv(filename, "w") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=EXPORT_FIELDNAMES, extrasaction="ignore")
+        writer.writeheader()
+        for record in iter_archived_records(user):
+            writer.writerow(public_record(record))
+            archived += 1
+        # The watermark only covers the transaction file
+        for record in iter_json_array(data_file):
+            checksums.extend(_record_checksums(record))
+            writer.writerow(public_record(record))
+            last = record
+            total += 1
+
+    save_watermark(user, _make_watermark(filename, version, total, last), checksums)
+    total += archived
+    print(f"✅ {total} transaction(s) exported successfully to '{filename}'.")
+    return {"mode": "full", "new": total, "total": total}
+
+
+def _make_watermark(filename, version, exported, last_record):
+    return {
+        "filename": filename,
+        "version": version,
+        "exported": exported,
+        "csv_size": os.path.getsize(filename),
+        "last_id": last_record.get("transaction_id"),
+        "last_date": last_record.get("date"),
+        "exported_at": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
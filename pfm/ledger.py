@@ -0,0 +1,198 @@
+import datetime # For date/time handling
+from .archive import archived_totals
+from .file_lock import read_json
+from .models import Transaction
+from .money import to_cents, from_cents
+from .paths import transaction_file_path
+from .user_registry import LEDGER_FIELDS, User_Registry
+
+
+# How often (in days) the running totals are checked against a full scan
+LEDGER_VERIFY_INTERVAL_DAYS = 7
+
+_registry = None
+
+
+def _get_registry():
+    """Open the user registry the first time the ledger needs to persist."""
+    global _registry
+    if _registry is None:
+        _registry = User_Registry()
+    return _registry
+
+
+def transaction_effect(transaction):
+    """
+    Return how a single transaction moves the ledger.
+
+    Args:
+        transaction: Transaction object
+
+    Returns:
+        tuple: (balance_delta, income_delta, expense_delta) in cents
+    """
+    if transaction.type == "income":
+        return transaction.amount_cents, transaction.amount_cents, 0
+    if transaction.type == "expense":
+        return -transaction.amount_cents, 0, transaction.amount_cents
+    return 0, 0, 0
+
+
+def compute_ledger(transaction_list, archived=None):
+    """
+    Compute balance, income and expense totals with a full scan.
+
+    The sums are exact integer cents; the user record keeps currency units.
+
+    Args:
+        transaction_list: List of Transaction objects
+        archived: Totals of the user's archived months (archive.archived_totals()), added as they are
+
+    Returns:
+        dict: {"balance", "total_income", "total_expense"}
+    """
+    total_income = sum(t.amount_cents for t in transaction_list if t.type == "income")
+    total_expense = sum(t.amount_cents for t in transaction_list if t.type == "expense")
+    if archived:
+        total_income += archived["income_cents"]
+        total_expense += archived["expense_cents"]
+    return {
+        "balance": from_cents(total_income - total_expense),
+        "total_income": from_cents(total_income),
+        "total_expense": from_cents(total_expense),
+    }
+
+
+def _archived(user):
+    """Totals of the user's archived months (None for users that are not stored)."""
+    if "name" in user and "id" in user:
+        return archived_totals(user)
+    return None
+
+
+def _scan_transactions(user):
+    """Read the user's whole transaction file (for a rebuild outside the menu)."""
+    records, _ = read_json(transaction_file_path(user), default=[])
+    return [Transaction.from_dict(r) for r in records or []]
+
+
+def _ledger_fields(user):
+    """The running totals of a user record (LEDGER_FIELDS); the rest is saved by its own callers."""
+    return {key: user[key] for key in LEDGER_FIELDS if key in user}
+
+
+def save_ledger(user):
+    """Persist the user's running totals so they survive the session."""
+    if "name" in user and "id" in user:
+        _get_registry().change_user(user["name"], lambda record: record.update(_ledger_fields(user)))
+
+
+def update_ledger(user, added=(), removed=()):
+    """
+    Adjust the user's running totals for added and removed transactions.
+
+    An edit is a removal of the old version plus an addition of the new one.
+    The deltas are added to the totals as stored, inside one registry write
+    transaction, so sessions changing the same user at the same time never
+    lose each other's deltas. Totals that are missing (legacy users) or due
+    for verification are rebuilt from a full scan instead, since a delta on
+    top would carry their error forward; every caller has already written
+    the change, so the scan includes it. Only the totals are written to
+    the registry; the rest of the record (e.g. number_of_transactions) is
+    saved by the session that changed it.
+
+    Args:
+        user: User object
+        added: Transaction objects that were written
+        removed: Transaction objects that were deleted (or their old versions)
+    """
+    if "name" in user and "id" in user and ledger_verification_due(user):
+        rebuild_ledger(user, _scan_transactions(user))
+        return
+
+    deltas = {"balance": 0, "total_income": 0, "total_expense": 0}  # Cents
+    for transaction in added:
+        b, i, e = transaction_effect(transaction)
+        deltas["balance"] += b
+        deltas["total_income"] += i
+        deltas["total_expense"] += e
+    for transaction in removed:
+        b, i, e = transaction_effect(transaction)
+        deltas["balance"] -= b
+        deltas["total_income"] -= i
+        deltas["total_expense"] -= e
+
+    def apply(record):
+        # Only the totals change: as stored plus the deltas (the rest of the record is not this function's)
+        totals = {key: from_cents(to_cents(record.get(key) or 0.0) + delta) for key, delta in deltas.items()}
+        record.update(totals)
+
+    if "name" in user and "id" in user:
+        stored = _get_registry().change_user(user["name"], apply)
+        if stored is not None:
+            user.update({key: stored[key] for key in deltas})
+            return
+    # A user that is not in the registry: only the in-memory totals change
+    for key, delta in deltas.items():
+        user[key] = from_cents(to_cents(user.get(key) or 0.0) + delta)
+
+
+def rebuild_ledger(user, transaction_list):
+    """
+    Replace the user's running totals with a full recomputation.
+
+    Args:
+        user: User object
+        transaction_list: The user's Transaction objects (archived months are added from the archive index)
+
+    Returns:
+        dict: The totals before the rebuild (for reporting drift)
+    """
+    previous = {
+        "balance": user.get("balance"),
+        "total_income": user.get("total_income"),
+        "total_expense": user.get("total_expense"),
+    }
+    user.update(compute_ledger(transaction_list, _archived(user)))
+    user["ledger_verified_at"] = datetime.date.today().isoformat()
+    save_ledger(user)
+    return previous
+
+
+def ledger_verification_due(user, today=None):
+    """Return True if the totals are missing or were last verified too long ago."""
+    if "total_income" not in user or "total_expense" not in user:
+        return True
+    verified_at = user.get("ledger_verified_at")
+    if not verified_at:
+        return True
+    today = today or datetime.date.today()
+    last = datetime.date.fromisoformat(verified_at)
+    return (today - last).days >= LEDGER_VERIFY_INTERVAL_DAYS
+
+
+def verify_ledger(user, transaction_list, force=False):
+    """
+    Reconcile the running totals against a full scan when a check is due.
+
+    Args:
+        user: User object
+        transaction_list: The user's Transaction objects (without the archived months)
+        force: Verify even if the last check is recent
+
+    Returns:
+        bool: True if the totals were already correct (or no check was due)
+    """
+    if not force and not ledger_verification_due(user):
+        return True
+
+    expected = compute_ledger(transaction_list, _archived(user))
+    consistent = all(user.get(key) == value for key, value in expected.items())
+    previous = rebuild_ledger(user, transaction_list)
+
+    if not consistent and previous["total_income"] is not None:
+        print("⚠️ Ledger drift detected and corrected:")
+        for key, value in expected.items():
+            if previous[key] != value:
+                print(f"   {key}: {previous[key]} → {value}")
+    return consistent
@@ -0,0 +1,203 @@
+"""
+Opt-in timing and I/O metrics for the hot paths.
+
+Set PFM_METRICS=1 to record call counts, latency histograms and bytes read
+or written for the instrumented functions. When it is not set the
+decorator returns the function unchanged and measure() returns a shared
+no-op context, so the instrumentation costs (almost) nothing.
+
+Set PFM_METRICS_FILE=<path> as well to write the metrics as JSON when the
+program exits; `python -m pfm.metrics <path>` prints such a file.
+"""
+import atexit # For dumping metrics on exit
+import contextlib
+import functools
+import json # For JSON data storage
+import math
+import os # For file operations
+import sys
+import threading
+import time
+
+ENABLED = os.environ.get("PFM_METRICS", "").strip().lower() in ("1", "true", "yes", "on")
+
+# Upper bounds (milliseconds) of the latency histogram buckets
+BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000, math.inf)
+
+_metrics = {}
+_lock = threading.Lock()
+_NOT_MEASURED = contextlib.nullcontext()
+
+
+def _new_metric():
+    return {"calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0,
+            "buckets": [0] * len(BUCKETS_MS), "bytes_read": 0, "bytes_written": 0}
+
+
+def record(name, seconds, bytes_read=0, bytes_written=0, error=False):
+    """Add one call of the named operation to the metrics."""
+    elapsed_ms = seconds * 1000
+    bucket = next(i for i, bound in enumerate(BUCKETS_MS) if elapsed_ms <= bound)
+    with _lock:
+        metric = _metrics.get(name)
+        if metric is None:
+            metric = _metrics[name] = _new_metric()
+        metric["calls"] += 1
+        metric["errors"] += error
+        metric["total_ms"] += elapsed_ms
+        metric["max_ms"] = max(metric["max_ms"], elapsed_ms)
+        metric["buckets"][bucket] += 1
+        metric["bytes_read"] += bytes_read
+        metric["bytes_written"] += bytes_written
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except (OSError, TypeError):
+        return 0
+
+
+def instrumented(name, path=None, io=None):
+    """
+    Decorator that records every call of a function under the given name.
+
+    Args:
+        name: Metric name
+        path: Optional function(*args, **kwargs) returning the file the call reads or writes
+        io: "read" or "write", how the size of that file is counted
+
+    Returns:
+        The decorator (which returns the function unchanged when metrics are off)
+    """
+    def decorator(function):
+        if not ENABLED:
+            return function
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            error = False
+            try:
+                return function(*args, **kwargs)
+            except BaseException:
+                error = True
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                size = _file_size(path(*args, **kwargs)) if path else 0
+                record(name, elapsed,
+                       bytes_read=size if io == "read" else 0,
+                       bytes_written=size if io == "write" else 0,
+                       error=error)
+        return wrapper
+    return decorator
+
+
+class _Measure:
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        record(self.name, time.perf_counter() - self.start, error=exc_type is not None)
+        return False
+
+
+def measure(name):
+    """
+    Time a block of code under the given name.
+
+    Example:
+        with measure("read_transaction_file.parse"):
+            data = json.load(file)
+    """
+    return _Measure(name) if ENABLED else _NOT_MEASURED
+
+
+def snapshot():
+    """Return a copy of the current metrics, {name: metric dict}."""
+    with _lock:
+        return {name: dict(metric, buckets=list(metric["buckets"])) for name, metric in _metrics.items()}
+
+
+def reset():
+    """Forget everything recorded so far."""
+    with _lock:
+        _metrics.clear()
+
+
+def percentile(metric, fraction):
+    """Estimate a latency percentile (ms) from the histogram; returns the bucket's upper bound."""
+    target = metric["calls"] * fraction
+    seen = 0
+    for bound, count in zip(BUCKETS_MS, metric["buckets"]):
+        seen += count
+        if seen >= target and count:
+            return min(bound, metric["max_ms"])
+    return metric["max_ms"]
+
+
+def _format_bytes(size):
+    for unit in ("B", "kB", "MB"):
+        if size < 1000:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1000
+    return f"{size:.1f}GB"
+
+
+def format_metrics(metrics=None):
+    """Return the metrics as a printable table."""
+    metrics = snapshot() if metrics is None else metrics
+    lines = ["=" * 104, "📈 PERFORMANCE METRICS", "=" * 104]
+    if not metrics:
+        lines.append("No calls recorded." if ENABLED else "Metrics are off. Start the program with PFM_METRICS=1.")
+        return "\n".join(lines)
+
+    lines.append(f"{'operation':<36} {'calls':>7} {'errors':>6} {'avg ms':>9} {'p50':>8} {'p95':>8} "
+                 f"{'max ms':>9} {'read':>8} {'written':>8}")
+    lines.append("-" * 104)
+    for name in sorted(metrics):
+        m = metrics[name]
+        average = m["total_ms"] / m["calls"] if m["calls"] else 0
+        lines.append(
+            f"{name:<36} {m['calls']:>7} {m['errors']:>6} {average:>9.2f} {percentile(m, 0.5):>8.2f} "
+            f"{percentile(m, 0.95):>8.2f} {m['max_ms']:>9.2f} {_format_bytes(m['bytes_read']):>8} "
+            f"{_format_bytes(m['bytes_written']):>8}"
+        )
+    return "\n".join(lines)
+
+
+def dump_metrics(path=None):
+    """
+    Print the metrics, or write them as JSON when a path is given.
+
+    Args:
+        path: JSON file to write (optional)
+    """
+    if path is None:
+        print(format_metrics())
+        return
+    with open(path, "w") as file:
+        json.dump({"buckets_ms": [str(b) for b in BUCKETS_MS], "metrics": snapshot()}, file, indent=4)
+
+
+if ENABLED and os.environ.get("PFM_METRICS_FILE"):
+    atexit.register(dump_metrics, os.environ["PFM_METRICS_FILE"])
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Usage: python -m pfm.metrics <metrics.json>")
+        return 1
+    with open(argv[0], "r") as file:
+        print(format_metrics(json.load(file)["metrics"]))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,171 @@
+import datetime # For date/time handling
+from .dates import decode_iso_date, month_key_of, parse_iso_date
+from .money import to_cents, record_cents
+
+
+# =============================================================Transaction Class=================================================================
+
+class Transaction:
+    def __init__(self, transaction_id, type, user_id, amount, date, category, description=None, payment_method=None,
+                 amount_cents=None):
+
+        self.transaction_id = transaction_id
+        self.type = type
+        self.user_id = user_id
+        # The amount is kept as integer cents (see money.py); amount may be None when amount_cents is given
+        self.amount_cents = amount_cents if amount_cents is not None else to_cents(amount)
+        self.category = category
+        # The date is kept as a day ordinal and month key (see dates.py); date may also be an ISO string
+        self.date = date
+        self.payment_method = payment_method
+        self.description = description
+
+    def __str__(self):
+        sep = "=" * 100
+        # safely format optional fields
+        desc = self.description if self.description else "No description"
+        pm = self.payment_method if self.payment_method else "N/A"
+        # ensure date prints nicely
+        date_str = (
+            self.date.isoformat() if hasattr(self.date, "isoformat") else str(self.date)
+        )
+        return (
+            f"{sep}\n"
+            f"{'TRANSACTION DETAILS':^72}\n"
+            f"{sep}\n"
+            f"Transaction ID  : {self.transaction_id}\n"
+            f"Type            : {str(self.type).capitalize()}\n"
+            f"User ID         : {self.user_id}\n"
+            f"Amount          : {self.amount:.2f}\n"
+            f"Date            : {date_str}\n"
+            f"Category        : {self.category}\n"
+            f"Payment Method  : {pm}\n"
+            f"Description     : {desc}\n"
+            f"{sep}"
+        )
+    
+    @property
+    def amount(self):
+        """Amount in currency units (float), for display and input."""
+        return self.amount_cents / 100
+
+    @amount.setter
+    def amount(self, value):
+        self.amount_cents = to_cents(value)
+
+    @property
+    def date(self):
+        """The date as a datetime.date (built on first use from date_ordinal)."""
+        if self._date is None:
+            self._date = datetime.date.fromordinal(self.date_ordinal)
+        return self._date
+
+    @date.setter
+    def date(self, value):
+        if isinstance(value, str):
+            self.date_ordinal, self.month_key = decode_iso_date(value)
+            self._date = None
+            return
+        if isinstance(value, datetime.datetime):
+            value = value.date()
+        self.date_ordinal = value.toordinal()
+        self.month_key = month_key_of(value)
+        self._date = value
+
+    def to_dict(self):
+        """
+        Convert the transaction object to a dictionary for JSON serialization.
+        
+        Returns:
+            dict: A dictionary containing all transaction fields with the date
+                  converted to ISO format string and the amount in cents.
+        """
+        return {
+            "transaction_id": self.transaction_id,
+            "type": self.type,
+            "user_id": self.user_id,
+            "amount_cents": self.amount_cents,
+            "date": self.date.isoformat(),
+            "category": self.category,
+            "description": self.description,
+            "payment_method": self.payment_method
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Create a Transaction object from a dictionary (loaded from JSON).
+        
+        Arguments:
+            data (dict): Dictionary containing transaction data
+            
+        Returns:
+            Transaction: A new Transaction instance
+        """
+        return cls(
+            transaction_id=data['transaction_id'],
+            type=data['type'],
+            user_id=data['user_id'],
+            amount=None,
+            amount_cents=record_cents(data),  # Older files store "amount" in currency units
+            date=data['date'],  # Decoded to an ordinal; the date object is built only if used
+            category=data['category'],
+            description=data.get('description'),  # use .get() for optional fields
+            payment_method=data.get('payment_method')
+        )
+
+
+# =============================================================Recurring Transaction Class=================================================================
+
+class RecurringTransaction:
+    def __init__(self, transaction, frequency, next_date):
+        self.transaction = transaction  # Instance of Transaction
+        self.frequency = frequency      # e.g., 'monthly', 'weekly'
+        self.next_date = next_date      # datetime.date object
+
+    def __str__(self):
+        sep = "=" * 100
+        return (
+            f"{sep}\n"
+            f"{'RECURRING TRANSACTION DETAILS':^72}\n"
+            f"{sep}\n"
+            f"{self.transaction}\n"
+            f"Frequency       : {self.frequency}\n"
+            f"Next Occurrence: {self.next_date}\n"
+            f"{sep}"
+        )
+    
+    def to_dict(self):
+        """
+        Convert the recurring transaction object to a dictionary for JSON serialization.
+        
+        Returns:
+            dict: A dictionary containing all transaction fields with the date
+                  converted to ISO format string.
+        """
+        return {
+            "transaction": self.transaction.to_dict(),
+            "frequency": self.frequency,
+            "next_date": self.next_date.isoformat() if hasattr(self.next_date, "isoformat") else str(self.next_date)
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Create a RecurringTransaction object from a dictionary (loaded from JSON).
+
+        Arguments:
+            data (dict): Dictionary containing recurring transaction data
+
+        Returns:
+            RecurringTransaction: A new RecurringTransaction instance
+        """
+        transaction = Transaction.from_dict(data['transaction'])
+        frequency = data['frequency']
+        next_date = parse_iso_date(data['next_date'])
+
+        return cls(
+            transaction=transaction,
+            frequency=frequency,
+            next_date=next_date
+        )
@@ -0,0 +1,159 @@
+"""
+Money amounts as integer cents.
+
+Amounts are stored, indexed and added up as whole numbers of cents, so
+totals are exact (no float rounding drift), sums run on plain ints and
+whole-number JSON is quicker to read and write than decimals. They are
+converted from and to currency units only where people or other programs
+see them: input prompts, printed reports, CSV/Parquet files and the JSON
+API.
+
+Records written before stored "amount" (a float in currency units)
+instead of "amount_cents"; they are still read, and migrate_amounts()
+rewrites the old files once.
+"""
+import glob
+import os # For file operations
+import re
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+from .file_lock import Version_Conflict, read_json, write_json
+
+
+_PLAIN_AMOUNT = re.compile(r"([+-]?)(\d*)(?:\.(\d{0,2}))?")
+
+
+def to_cents(value):
+    """
+    Convert an amount in currency units to integer cents.
+
+    Strings and Decimals are converted exactly ("0.29" -> 29); half a cent
+    rounds away from zero. Floats are rounded to the nearest cent.
+
+    Args:
+        value: float, int, str or Decimal amount, e.g. 12.5 or "12.50"
+
+    Returns:
+        int: Amount in cents
+
+    Raises:
+        ValueError: If the value is not a finite number
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value * 100
+    if isinstance(value, float):
+        if value != value or value in (float("inf"), float("-inf")):
+            raise ValueError(f"invalid amount '{value}'")
+        return int(round(value * 100))
+    if isinstance(value, str):
+        text = value.strip()
+        match = _PLAIN_AMOUNT.fullmatch(text)
+        if match and (match.group(2) or match.group(3)):
+            sign, whole, fraction = match.groups()
+            cents = int(whole or 0) * 100 + int((fraction or "").ljust(2, "0"))
+            return -cents if sign == "-" else cents
+        value = text
+    try:
+        cents = (Decimal(value) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP)
+        return int(cents)
+    except (InvalidOperation, ValueError, TypeError):
+        raise ValueError(f"invalid amount '{value}'")
+
+
+def from_cents(cents):
+    """Return cents as an amount in currency units (float, for display and the API)."""
+    return cents / 100
+
+
+def format_cents(cents):
+    """Return cents as an exact decimal string, e.g. -1250 -> "-12.50"."""
+    sign = "-" if cents < 0 else ""
+    cents = abs(cents)
+    return f"{sign}{cents // 100}.{cents % 100:02d}"
+
+
+def record_cents(record):
+    """Return the amount in cents of a stored transaction record (either format)."""
+    cents = record.get("amount_cents")
+    if cents is None:
+        return to_cents(record["amount"])
+    return cents
+
+
+def public_record(record):
+    """
+    Return a copy of a stored transaction record with "amount" in currency units.
+
+    Used where records leave the program (CSV files, the JSON API), which
+    keep the amount in currency units.
+    """
+    public = dict(record)
+    public["amount"] = from_cents(record_cents(public))
+    public.pop("amount_cents", None)
+    return public
+
+
+# =============================================================Migration=================================================================
+
+def _migrate_record(record):
+    """Convert one transaction (or recurring item) record in place; return True if it changed."""
+    if "transaction" in record:
+        return _migrate_record(record["transaction"])
+    if "amount" not in record:
+        return False
+    record["amount_cents"] = to_cents(record.pop("amount"))
+    return True
+
+
+def migrate_file(path):
+    """
+    Rewrite one JSON transaction/recurring file with amounts in cents.
+
+    Returns:
+        int: Number of records converted (0 if the file was already migrated)
+    """
+    while True:
+        records, version = read_json(path, default=[])
+        changed = sum([_migrate_record(record) for record in records or []])
+        if not changed:
+            return 0
+        try:
+            write_json(path, records, expected_version=version)
+            return changed
+        except Version_Conflict:
+            continue  # Saved in between: convert the new version
+
+
+def migrate_amounts(data_dir='data'):
+    """
+    Convert every transaction file, recurring file and archive to integer cents.
+
+    Export watermarks of migrated users are removed, so the next incremental
+    export is a full one instead of re-sending every row as changed.
+
+    Args:
+        data_dir: Data folder
+
+    Returns:
+        dict: {"files", "records", "archives"}
+    """
+    from .archive import migrate_archive
+
+    result = {"files": 0, "records": 0, "archives": 0}
+    patterns = [os.path.join(data_dir, 'transactions', 'transactions_*.json'),
+                os.path.join(data_dir, 'RecurringTransactions', 'RecurringTransactions_*.json')]
+    for path in sorted(p for pattern in patterns for p in glob.glob(pattern)):
+        changed = migrate_file(path)
+        if changed:
+            result["files"] += 1
+            result["records"] += changed
+            owner = os.path.basename(path)[len('transactions_'):-len('.json')]
+            if path.startswith(os.path.join(data_dir, 'transactions')) and not path.endswith('_backup.json'):
+                watermark = os.path.join(data_dir, 'exports', f'{owner}.watermark.json')
+                if os.path.exists(watermark):
+                    os.remove(watermark)
+
+    for folder in sorted(glob.glob(os.path.join(data_dir, 'archive', '*'))):
+        if migrate_archive(folder):
+            result["archives"] += 1
+    return result
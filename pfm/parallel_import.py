@@ -0,0 +1,141 @@
+import csv # For parsing CSV rows
+import io
+import os # For file operations
+import time
+from concurrent.futures import ProcessPoolExecutor
+from .transaction_manager import (CSV_IMPORT_ENCODING, _convert_csv_chunk, _record_line, _start_import,
+                                  _merge_import_batch, _finish_import)
+
+
+# Target size of the byte range handed to one worker
+DEFAULT_RANGE_BYTES = 4 * 1024 * 1024
+
+
+def split_csv_ranges(filename, range_bytes=DEFAULT_RANGE_BYTES):
+    """
+    Split a CSV file into byte ranges that start and end on line boundaries.
+
+    Args:
+        filename: CSV file with a header line
+        range_bytes: Approximate size of each range
+
+    Returns:
+        tuple: (header fieldnames, list of (start, end) byte offsets)
+    """
+    with open(filename, "rb") as file:
+        header = file.readline()
+        fieldnames = next(csv.reader([header.decode(CSV_IMPORT_ENCODING)]))
+        data_start = file.tell()
+        size = file.seek(0, os.SEEK_END)
+
+        ranges = []
+        start = data_start
+        while start < size:
+            end = min(start + range_bytes, size)
+            if end < size:
+                # Move the cut to the start of the next line
+                file.seek(end)
+                file.readline()
+                end = file.tell()
+            ranges.append((start, end))
+            start = end
+    return fieldnames, ranges
+
+
+def parse_csv_range(filename, fieldnames, start, end, default_user_id):
+    """
+    Parse and validate one byte range of a CSV file (runs in a worker process).
+
+    Returns:
+        tuple: (list of Transaction objects, number of rows, number of lines,
+                list of (line number within the range, error message))
+        Line numbers within the range start at 0; the caller adds the
+        file line the range starts on.
+    """
+    with open(filename, "rb") as file:
+        file.seek(start)
+        # Same codec as the streaming import (a byte order mark can only precede the header)
+        text = file.read(end - start).decode(CSV_IMPORT_ENCODING)
+
+    rows = []
+    lines = []
+    errors = []
+    records = 0
+    reader = csv.reader(io.StringIO(text, newline=""))
+    for values in reader:
+        if not values:
+            continue  # Blank line (csv.DictReader skips these too)
+        records += 1
+        line = _record_line(reader.line_num, values) - 1
+        if len(values) != len(fieldnames):
+            errors.append((line, f"expected {len(fieldnames)} fields, found {len(values)}"))
+            continue
+        rows.append(dict(zip(fieldnames, values)))
+        lines.append(line)
+
+    transactions, convert_errors = _convert_csv_chunk(default_user_id, rows, 0, {}, lines)
+    errors.extend(convert_errors)
+    errors.sort()
+    # Ranges end on line boundaries, so the next range starts this many lines later
+    return transactions, records, text.count("\n"), errors
+
+
+def import_transactions_from_csv_parallel(user, filename=None, workers=None, range_bytes=DEFAULT_RANGE_BYTES):
+    """
+    Merge a large CSV file into the user's transactions using a process pool.
+
+    The file is cut into byte ranges at line boundaries; each range is
+    parsed and validated in a worker, and the results are merged back in
+    file order through the same batched append as the streaming importer.
+    Only a bounded number of ranges is in flight at once, so memory stays
+    proportional to workers x range size.
+
+    Quoted fields that contain line breaks cannot be split safely; such
+    files should be imported with import_transactions_from_csv_streaming().
+
+    Args:
+        user: User object
+        filename: CSV file to read (defaults to "<name>_transactions.csv")
+        workers: Number of worker processes (defaults to the CPU count)
+        range_bytes: Approximate size of the byte range per task
+
+    Returns:
+        dict: {"rows", "imported", "duplicates", "invalid", "seconds"} or None
+    """
+    filename = filename or f"{user['name']}_transactions.csv"
+    if not os.path.exists(filename):
+        print(f"⚠️ No CSV file found for user {user['name']}.")
+        return None
+
+    start = time.perf_counter()
+    fieldnames, ranges = split_csv_ranges(filename, range_bytes)
+    state = _start_import(user)
+    stats = {"rows": 0, "imported": 0, "duplicates": 0, "invalid": 0, "seconds": 0.0}
+    errors = []
+    first_line = 2  # Line 1 is the header
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = []
+        next_range = 0
+        while next_range < len(ranges) or pending:
+            # Keep a bounded window of ranges in flight, consume them in order
+            while next_range < len(ranges) and len(pending) < workers * 2:
+                range_start, range_end = ranges[next_range]
+                pending.append(executor.submit(parse_csv_range, filename, fieldnames,
+                                               range_start, range_end, user["id"]))
+                next_range += 1
+
+            transactions, row_count, line_count, range_errors = pending.pop(0).result()
+            stats["rows"] += row_count
+            stats["invalid"] += len(range_errors)
+            errors.extend((first_line + number, message) for number, message in range_errors[:max(0, 10 - len(errors))])
+            first_line += line_count
+            _merge_import_batch(user, transactions, state, stats)
+
+            elapsed = time.perf_counter() - start
+            rate = stats["rows"] / elapsed if elapsed > 0 else 0
+            print(f"\r📥 {stats['rows']:,} rows processed, {stats['imported']:,} imported ({rate:,.0f} rows/s)", end="")
+
+    print()
+    return _finish_import(user, filename, stats, errors, start)
@@ -0,0 +1,15 @@
+import os # For file operations
+
+
+# Folder that holds the package and the shared data/ folder (users.db, users.json)
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def transaction_file_path(user):
+    """Return the path of the user's transactions file."""
+    return os.path.join('data', 'transactions', f'transactions_{user["name"]}_{user["id"]}.json')
+
+
+def recurring_transaction_file_path(user):
+    """Return the path of the user's recurring transactions file."""
+    return os.path.join('data', 'RecurringTransactions', f'RecurringTransactions_{user["name"]}_{user["id"]}.json')
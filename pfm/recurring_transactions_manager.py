@@ -0,0 +1,292 @@
+import datetime # For date/time handling
+import json # For JSON data storage
+import os # For file operations
+from .dates import add_months
+from .models import Transaction, RecurringTransaction
+from .paths import recurring_transaction_file_path
+from .metrics import instrumented
+from .file_lock import Version_Conflict, locked, get_version, read_json, write_json, create_json
+from .transaction_manager import create_transaction, add_transaction
+from .transaction_index import next_transaction_id
+from .write_ahead_log import log_change
+
+
+def recurring_transactions_menu(current_user):
+    """Display the recurring transactions menu and handle user choices."""
+    while True:
+        print("\n" + "="*40)
+        print("🔁 RECURRING TRANSACTIONS MENU")
+        print("="*40)
+        print("[1] Add Recurring Transaction")
+        print("[2] View Recurring Transactions")
+        print("[3] Delete Recurring Transaction")
+        print("[0] Return to Transaction Manager")
+        print("="*40)
+        
+        choice = input("Enter your choice: ").strip()
+        
+        if choice == '1':
+            add_recurring_transaction(current_user)
+        elif choice == '2':
+            view_recurring_transactions(current_user)
+        elif choice == '3':
+            delete_recurring_transaction(current_user)
+        elif choice == '0':
+            print("Returning to Transaction Manager...")
+            break
+        else:
+            print("❌ Invalid choice. Please try again.")
+
+def _recurring_file_of(user, *args, **kwargs):
+    return recurring_transaction_file_path(user)
+
+@instrumented("read_recurring_transaction_file", path=_recurring_file_of, io="read")
+def read_recurring_transaction_file(user, with_version=False):
+    """
+    Load the user's recurring transactions, creating an empty file if needed.
+
+    Args:
+        user: User object
+        with_version: Also return the file version, to pass back to
+                      save_recurring_transactions_to_file() as expected_version
+
+    Returns:
+        list of RecurringTransaction objects, or (list, version) if with_version is True
+    """
+    # Define full path to your file
+    file_path = recurring_transaction_file_path(user)
+    version = 0
+
+    try:
+        # Ensure the directory exists (creates folders if missing)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        # If file doesn't exist, create it and write empty list
+        if not os.path.exists(file_path):
+            version = create_json(file_path, [])
+            if version is not None:
+                # print("✅ transactions.json created successfully.")
+                transactions_list = []
+                return (transactions_list, version) if with_version else transactions_list
+            # Another session created it first, read theirs
+        # print("✅ transactions.json already exists.")
+        try:
+            transactions_data, version = read_json(file_path, default=[])
+            transactions_list = [RecurringTransaction.from_dict(t) for t in transactions_data]
+
+        except json.JSONDecodeError:
+            print("⚠️ Warning: Transaction file was corrupted. Starting with empty transactions.") #maybe I would want to change this later
+            transactions_list = []
+            version = get_version(file_path)
+
+    except Exception as e:
+        print(f"⚠️ Error while checking/creating file: {e}")
+        transactions_list = []
+
+    return (transactions_list, version) if with_version else transactions_list
+
+@instrumented("save_recurring_transactions_to_file", path=_recurring_file_of, io="write")
+def save_recurring_transactions_to_file(user, transaction_list, expected_version=None):
+    """
+    Save a list of RecurringTransaction objects to the user's JSON file.
+
+    Args:
+        user: User object
+        transaction_list: List of RecurringTransaction objects
+        expected_version: Version returned by read_recurring_transaction_file();
+                          a Version_Conflict is raised if the file changed since
+    """
+    file_path = recurring_transaction_file_path(user)
+
+    try:
+        # Convert all RecurringTransaction objects to dictionaries
+        transactions_data = [t.to_dict() for t in transaction_list]
+        
+        # Write to file with nice formatting (atomically, under an exclusive lock)
+        write_json(file_path, transactions_data, expected_version=expected_version)
+        
+        print(f"✅ Successfully saved {len(transaction_list)} transactions.")
+        return True
+        
+    except Version_Conflict:
+        raise
+    except Exception as e:
+        print(f"❌ Error saving transactions: {e}")
+        return False
+    
+def add_recurring_transaction(current_user):
+    print("\n" + "="*40)
+    print("➕ ADD RECURRING TRANSACTION")
+    print("="*40)
+    
+    # Import here to avoid circular import
+    
+    transaction = create_transaction(current_user)
+    if transaction is None:
+        print("❌ Transaction creation failed. Returning to menu.")
+        return
+    while True:
+        frequency_input = input("Select frequency [1] Monthly or [2] Weekly: ").strip()
+        if frequency_input == '1':
+            frequency = 'monthly'
+            break
+        elif frequency_input == '2':
+            frequency = 'weekly'
+            break
+        else:
+            print("❌ Invalid frequency. Please enter '1' for monthly or '2' for weekly.")
+            continue
+    
+    while True:
+        next_date_str = input("Enter next occurrence date (YYYY-MM-DD): ").strip()
+        try:
+            next_date = datetime.datetime.strptime(next_date_str, "%Y-%m-%d").date()
+            break
+        except ValueError:
+            print("❌ Invalid date format. Please use YYYY-MM-DD.")
+            continue
+    recurring_transaction = RecurringTransaction(transaction, frequency, next_date)
+    with log_change("recurring.add", recurring_transaction_file_path(current_user),
+                    records=[recurring_transaction.to_dict()]) as change:
+        while True:
+            transactions, version = read_recurring_transaction_file(current_user, with_version=True)
+            transactions.append(recurring_transaction)
+            try:
+                saved = save_recurring_transactions_to_file(current_user, transactions, expected_version=version)
+                break
+            except Version_Conflict:
+                continue  # Another session saved in between, retry on its version
+        if not saved:
+            change.cancel()
+    if saved:
+        print("✅ Recurring transaction added successfully.")
+
+def view_recurring_transactions(current_user):
+    print("\n" + "="*40)
+    print("👀 VIEW RECURRING TRANSACTIONS")
+    print("="*40)
+    
+    transactions = read_recurring_transaction_file(current_user)
+    if not transactions:
+        print("No recurring transactions found.")
+        return
+    
+    for i, rt in enumerate(transactions, start=1):
+        print(f"\nRecurring Transaction #{i}")
+        print(rt)
+
+def delete_recurring_transaction(current_user):
+    print("\n" + "="*40)
+    print("🗑️ DELETE RECURRING TRANSACTION")
+    print("="*40)
+    
+    transactions, version = read_recurring_transaction_file(current_user, with_version=True)
+    if not transactions:
+        print("No recurring transactions to delete.")
+        return
+    
+    for i, rt in enumerate(transactions, start=1):
+        print(f"\nRecurring Transaction #{i}")
+        print(rt)
+    
+    try:
+        choice = int(input(f"Enter the number of the transaction to delete (1-{len(transactions)}): ").strip())
+        if 1 <= choice <= len(transactions):
+            deleted_transaction = transactions.pop(choice - 1)
+            with log_change("recurring.delete", recurring_transaction_file_path(current_user),
+                            ids=[deleted_transaction.transaction.transaction_id]) as change:
+                try:
+                    if save_recurring_transactions_to_file(current_user, transactions, expected_version=version):
+                        print("✅ Recurring transaction deleted successfully.")
+                    else:
+                        change.cancel()
+                except Version_Conflict:
+                    change.cancel()
+                    print("⚠️ Recurring transactions were changed by another session. Nothing deleted, please try again.")
+        else:
+            print("❌ Invalid choice. No transaction deleted.")
+    except ValueError:
+        print("❌ Invalid input. Please enter a number.")
+
+def check_recurring_transactions(current_user):
+    """
+    Check for due recurring transactions for the current user.
+    
+    Args:
+        current_user: User object
+    """
+    today = datetime.date.today()
+    transactions = read_recurring_transaction_file(current_user)
+    due_transactions = [rt for rt in transactions if rt.next_date <= today]
+
+    if due_transactions:
+        print("\n" + "="*40)
+        print("🔔 Bills Reminder!")
+        print("="*40)
+        for rt in due_transactions:
+            print(rt)
+        print("="*40 + "\n")
+        print("Do You Want To Apply Them Now? (Y/N)")
+        choice = input().strip().lower()
+        if choice == 'y':
+            apply_recurring_transactions(current_user)
+            print("✅ Bills applied successfully.")
+    else:
+        print("No bills due Today.")
+
+@instrumented("apply_recurring_transactions")
+def apply_recurring_transactions(current_user):
+    """
+    Check and apply due recurring transactions for the current user.
+    
+    Args:
+        current_user: User object
+    """
+    today = datetime.date.today()
+    file_path = recurring_transaction_file_path(current_user)
+
+    # Only one session applies bills at a time, so nothing is applied twice
+    with locked(file_path, suffix=".apply.lock"):
+        transactions, version = read_recurring_transaction_file(current_user, with_version=True)
+        updated = {}
+
+        for rt in transactions:
+            if rt.next_date <= today:
+                # Apply a copy of the transaction under its own id
+                applied = Transaction.from_dict(rt.transaction.to_dict())
+                applied.transaction_id = next_transaction_id(current_user)
+                add_transaction(current_user, applied)
+                print(f"✅ Applied a recurring transaction:\n{applied}")
+
+                # Update next occurrence date based on frequency
+                # Keep incrementing until next_date is in the future
+                if rt.frequency == 'monthly':
+                    # Count months from the scheduled date, so a day clamped in a short month comes back
+                    scheduled = rt.next_date
+                    step = 0
+                    while rt.next_date <= today:
+                        step += 1
+                        rt.next_date = add_months(scheduled, step)
+
+                elif rt.frequency == 'weekly':
+                    while rt.next_date <= today:
+                        rt.next_date += datetime.timedelta(weeks=1)
+
+                updated[rt.transaction.transaction_id] = rt.next_date
+                print(f"📅 Next occurrence updated to: {rt.next_date}")
+
+        if not updated:
+            return
+        records = [rt.to_dict() for rt in transactions if rt.transaction.transaction_id in updated]
+        with log_change("recurring.put", file_path, records=records) as change:
+            while True:
+                try:
+                    if not save_recurring_transactions_to_file(current_user, transactions, expected_version=version):
+                        change.cancel()
+                    break
+                except Version_Conflict:
+                    # Items were added/removed meanwhile: move our dates onto their version
+                    transactions, version = read_recurring_transaction_file(current_user, with_version=True)
+                    for rt in transactions:
+                        if rt.transaction.transaction_id in updated:
+                            rt.next_date = updated[rt.transaction.transaction_id]
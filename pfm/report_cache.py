@@ -0,0 +1,179 @@
+"""
+Cache for the printed output of the reports.
+
+A report's output only depends on the user's transactions, so it is cached
+under (user, report, parameters) together with the version number of the
+transaction file it was computed from. Every write through
+save_transactions_to_file() (or an append by the importers) bumps that
+version, so a cached report is used only while the data is unchanged.
+
+The version counter lives in the .lock sidecar, which can be deleted (it
+then starts again at 0) and does not see edits or restores made outside
+the program. So an entry also records the size and modification time of
+the transactions file and of the archive index, and REPORT_CACHE_FORMAT;
+it is used only if all of them still match. Replacing the whole history
+(import_transactions_from_csv()) drops the user's entries with
+forget_reports().
+
+Entries are kept in memory (least recently used first out) and on disk in
+data/reports/cache/, so cached reports survive a restart. Each
+(user, report, parameters) has a single disk file that is overwritten when
+the version changes, and the least recently used files are removed once
+there are more than REPORT_CACHE_DISK_ENTRIES.
+"""
+import contextlib # For capturing printed output
+import hashlib
+import io
+import json # For JSON data storage
+import os # For file operations
+import tempfile
+from collections import OrderedDict
+
+from .metrics import measure
+from .paths import transaction_file_path
+from .archive import archive_index_path
+
+
+REPORT_CACHE_DIR = os.path.join('data', 'reports', 'cache')
+# Bump when the layout of the reports or of the cache entries changes
+REPORT_CACHE_FORMAT = 2
+REPORT_CACHE_MEMORY_ENTRIES = 64
+REPORT_CACHE_DISK_ENTRIES = 512
+
+_memory = OrderedDict()  # (name, id, report, params) -> (version, output)
+_stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+
+def _data_identity(user):
+    """Return what identifies the user's data besides the version counter: format, (size, mtime) per file."""
+    identity = [REPORT_CACHE_FORMAT]
+    for path in (transaction_file_path(user), archive_index_path(user)):
+        try:
+            stat = os.stat(path)
+            identity.append([stat.st_size, stat.st_mtime_ns])
+        except OSError:
+            identity.append(None)
+    return identity
+
+
+def _entry_file(key):
+    name, user_id, report, params = key
+    digest = hashlib.sha1(params.encode()).hexdigest()[:16]
+    return os.path.join(REPORT_CACHE_DIR, f"{name}_{user_id}_{report}_{digest}.json")
+
+
+def _remember(key, version, output):
+    _memory[key] = (version, output)
+    _memory.move_to_end(key)
+    while len(_memory) > REPORT_CACHE_MEMORY_ENTRIES:
+        _memory.popitem(last=False)
+
+
+def _read_disk(key, version):
+    path = _entry_file(key)
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            entry = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if entry.get("version") != version or entry.get("params") != key[3]:
+        return None
+    os.utime(path)  # Mark as recently used for the disk eviction
+    return entry["output"]
+
+
+def _write_disk(key, version, output):
+    os.makedirs(REPORT_CACHE_DIR, exist_ok=True)
+    path = _entry_file(key)
+    # Write to a temporary file and move it into place, so a reader never sees half an entry
+    fd, temp_path = tempfile.mkstemp(dir=REPORT_CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump({"version": version, "params": key[3], "output": output}, file)
+        os.replace(temp_path, path)
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.remove(temp_path)
+        return
+    _evict_disk()
+
+
+def _evict_disk():
+    """Remove the least recently used disk entries beyond REPORT_CACHE_DISK_ENTRIES."""
+    try:
+        entries = [e for e in os.scandir(REPORT_CACHE_DIR) if e.name.endswith(".json")]
+    except OSError:
+        return
+    if len(entries) <= REPORT_CACHE_DISK_ENTRIES:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime_ns)
+    for entry in entries[:len(entries) - REPORT_CACHE_DISK_ENTRIES]:
+        with contextlib.suppress(OSError):
+            os.remove(entry.path)
+
+
+def show_cached(user, report, params, version, render):
+    """
+    Print a report from the cache, or run it and cache what it prints.
+
+    Args:
+        user: User object
+        report: Report name (e.g. "category_breakdown")
+        params: JSON-serializable parameters that change the output (e.g. the month)
+        version: Version of the transaction file the report is computed from
+                 (read_transaction_file(user, with_version=True))
+        render: Function without arguments that prints the report
+    """
+    key = (user["name"], user["id"], report, json.dumps(params))
+    version = [version, _data_identity(user)]  # JSON-shaped, so it compares equal after a round trip to disk
+
+    cached = _memory.get(key)
+    if cached is not None and cached[0] == version:
+        _memory.move_to_end(key)
+        _stats["memory_hits"] += 1
+        print(cached[1], end="")
+        return
+
+    with measure("report_cache.disk_read"):
+        output = _read_disk(key, version)
+    if output is not None:
+        _stats["disk_hits"] += 1
+        _remember(key, version, output)
+        print(output, end="")
+        return
+
+    _stats["misses"] += 1
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        render()
+    output = buffer.getvalue()
+    print(output, end="")
+    _remember(key, version, output)
+    with measure("report_cache.disk_write"):
+        _write_disk(key, version, output)
+
+
+def cache_stats():
+    """Return the hit/miss counters and the number of entries held in memory."""
+    return dict(_stats, memory_entries=len(_memory))
+
+
+def forget_reports(user):
+    """Drop every cached report of one user (memory and disk), e.g. after its history was replaced."""
+    for key in [key for key in _memory if key[:2] == (user["name"], user["id"])]:
+        del _memory[key]
+    prefix = f"{user['name']}_{user['id']}_"
+    if os.path.isdir(REPORT_CACHE_DIR):
+        for entry in os.scandir(REPORT_CACHE_DIR):
+            if entry.name.startswith(prefix):
+                with contextlib.suppress(OSError):
+                    os.remove(entry.path)
+
+
+def clear_report_cache(disk=True):
+    """Drop every cached report (from memory, and from disk unless disk=False)."""
+    _memory.clear()
+    if disk and os.path.isdir(REPORT_CACHE_DIR):
+        for entry in os.scandir(REPORT_CACHE_DIR):
+            with contextlib.suppress(OSError):
+                os.remove(entry.path)
@@ -0,0 +1,374 @@
+import csv # For parsing statement files
+import datetime # For date/time handling
+import hashlib # For stable ids of statement lines
+import itertools # For reading statements in chunks
+import os # For file operations
+import time
+from .models import Transaction
+from .money import format_cents, to_cents
+from .file_lock import Version_Conflict, read_json, write_json
+from .transaction_manager import _start_import, _merge_import_batch, _finish_import
+
+
+PROFILE_FILE = os.path.join('data', 'import_profiles.json')
+
+# Extensions picked up when a whole directory is imported
+STATEMENT_EXTENSIONS = (".csv", ".tsv", ".txt")
+
+# Settings of a profile; any key left out falls back to these values
+DEFAULT_PROFILE = {
+    "delimiter": None,            # None = detect (comma, semicolon, tab or pipe)
+    "encoding": "utf-8-sig",
+    "skip_rows": 0,               # Lines before the header row
+    "date_column": "date",
+    "date_format": "%Y-%m-%d",
+    "amount_column": "amount",    # Single signed amount column...
+    "debit_column": None,         # ...or separate debit/credit columns
+    "credit_column": None,
+    "sign_convention": "negative_is_expense",  # or "positive_is_expense"
+    "type_column": None,          # Column holding "income"/"expense" (amount is then unsigned)
+    "decimal_separator": ".",
+    "thousands_separator": ",",
+    "description_column": "description",
+    "category_column": None,
+    "default_category": "other",
+    "payment_method": None,
+}
+
+
+# =============================================================Profiles=================================================================
+
+def load_import_profiles():
+    """Return all saved column-mapping profiles, {name: settings}."""
+    profiles, _ = read_json(PROFILE_FILE, default={})
+    return profiles
+
+
+def save_import_profile(name, settings):
+    """
+    Save (or replace) a column-mapping profile.
+
+    Args:
+        name: Profile name, e.g. the bank it describes
+        settings: Dict with keys from DEFAULT_PROFILE
+
+    Raises:
+        ValueError: If a setting is unknown or the amount columns are missing
+    """
+    unknown = set(settings) - set(DEFAULT_PROFILE)
+    if unknown:
+        raise ValueError(f"unknown profile setting(s): {', '.join(sorted(unknown))}")
+    profile = resolve_profile(settings)
+    if not profile["amount_column"] and not (profile["debit_column"] and profile["credit_column"]):
+        raise ValueError("a profile needs an amount column or both debit and credit columns")
+
+    while True:
+        profiles, version = read_json(PROFILE_FILE, default={})
+        profiles[name] = settings
+        try:
+            write_json(PROFILE_FILE, profiles, expected_version=version)
+            return
+        except Version_Conflict:
+            continue  # Another session saved a profile; merge with it
+
+
+def resolve_profile(settings):
+    """Fill in the defaults for a partial profile."""
+    profile = dict(DEFAULT_PROFILE)
+    profile.update(settings or {})
+    return profile
+
+
+# =============================================================Column parsing=================================================================
+
+def parse_date_column(values, date_format, cache):
+    """
+    Parse a column of date strings.
+
+    Every distinct string is parsed once; statements repeat the same few
+    dates many times, so this is far cheaper than parsing row by row.
+
+    Returns:
+        list: datetime.date per value, or None where the value is invalid
+    """
+    for value in set(values) - cache.keys():
+        try:
+            if date_format == "iso":
+                cache[value] = datetime.date.fromisoformat(value.strip())
+            else:
+                cache[value] = datetime.datetime.strptime(value.strip(), date_format).date()
+        except ValueError:
+            cache[value] = None
+    return [cache[value] for value in values]
+
+
+def parse_amount_column(values, decimal_separator=".", thousands_separator=","):
+    """
+    Parse a column of amount strings such as "1.234,56", "(12.00)" or "-5".
+
+    Like the dates, every distinct string is parsed once and the column is
+    then filled in from those results (statements repeat the same fees,
+    subscriptions and transfers many times).
+
+    Returns:
+        list: Cents (int) per value, or None where the value is blank or invalid
+    """
+    table = {ord(thousands_separator): None, ord(" "): None, ord("\u00a0"): None} if thousands_separator else {}
+    if decimal_separator != ".":
+        table[ord(decimal_separator)] = "."
+    parsed = {}
+    for value in set(values):
+        text = value.translate(table).strip()
+        negative = text.startswith("(") and text.endswith(")")
+        if negative:
+            text = text[1:-1]
+        try:
+            amount = to_cents(text)
+        except ValueError:
+            parsed[value] = None
+            continue
+        parsed[value] = -amount if negative else amount
+    return [parsed[value] for value in values]
+
+
+def _signed_amounts(columns, profile):
+    """Return one signed amount in cents per row (negative = money going out)."""
+    parse = lambda name: parse_amount_column(columns[name], profile["decimal_separator"], profile["thousands_separator"])
+
+    if profile["debit_column"] and profile["credit_column"]:
+        debits, credits = parse(profile["debit_column"]), parse(profile["credit_column"])
+        return [
+            None if d is None and c is None else (c or 0) - abs(d or 0)
+            for d, c in zip(debits, credits)
+        ]
+
+    amounts = parse(profile["amount_column"])
+    if profile["type_column"]:
+        types = [value.strip().lower() for value in columns[profile["type_column"]]]
+        return [None if a is None else (-abs(a) if t == "expense" else abs(a)) for a, t in zip(amounts, types)]
+    if profile["sign_convention"] == "positive_is_expense":
+        return [None if a is None else -a for a in amounts]
+    return amounts
+
+
+def statement_line_id(user, source, fields, occurrence):
+    """
+    Build a stable transaction id for a statement line.
+
+    The same line of the same statement file imported twice (e.g. a
+    directory imported again) gets the same id, so the merge skips it as a
+    duplicate. Identical lines in different files (two equal card payments
+    exported on different days) are different transactions and get
+    different ids.
+
+    Args:
+        user: User object
+        source: Name of the statement file (without its directory)
+        fields: Date, amount and description of the line
+        occurrence: How many identical lines came before it in the file
+    """
+    digest = hashlib.sha1("\x1f".join([source] + fields + [str(occurrence)]).encode("utf-8")).hexdigest()[:16]
+    return f"{user['name']}-s{digest}"
+
+
+def convert_statement_chunk(user, header, rows, profile, date_cache, occurrences, first_line, source=""):
+    """
+    Convert one chunk of statement rows, column by column.
+
+    Args:
+        user: User object
+        header: Column names
+        rows: List of row value lists
+        profile: Resolved profile
+        date_cache: Dict reused across chunks, {date string: datetime.date}
+        occurrences: Dict reused across chunks, counts identical lines
+        first_line: Line number of the first row (for messages)
+        source: Name of the statement file, part of every line id
+
+    Returns:
+        tuple: (list of Transaction objects, list of (line, error message))
+    """
+    # Step 1: transpose the rows into the columns the profile uses
+    width = len(header)
+    rows = [row + [""] * (width - len(row)) if len(row) < width else row for row in rows]
+    columns = {name: [row[i] for row in rows] for i, name in enumerate(header)}
+    blank = [""] * len(rows)
+
+    # Step 2: parse whole columns at once
+    dates = parse_date_column(columns[profile["date_column"]], profile["date_format"], date_cache)
+    amounts = _signed_amounts(columns, profile)
+    descriptions = columns.get(profile["description_column"], blank)
+    categories = columns.get(profile["category_column"], blank) if profile["category_column"] else blank
+
+    # Step 3: build the transactions
+    transactions = []
+    errors = []
+    for line, t_date, amount, description, category, row in zip(
+            itertools.count(first_line), dates, amounts, descriptions, categories, rows):
+        if not any(value.strip() for value in row):
+            continue  # Blank line
+        if t_date is None:
+            errors.append((line, f"invalid date '{columns[profile['date_column']][line - first_line]}'"))
+            continue
+        if amount is None:
+            errors.append((line, "invalid or missing amount"))
+            continue
+
+        description = description.strip() or None
+        key = (t_date.isoformat(), format_cents(amount), description or "")
+        occurrence = occurrences.get(key, 0)
+        occurrences[key] = occurrence + 1
+
+        transactions.append(Transaction(
+            statement_line_id(user, source, list(key), occurrence),
+            "expense" if amount < 0 else "income",
+            user["id"], None, t_date,
+            category.strip().lower() or profile["default_category"],
+            description, profile["payment_method"], amount_cents=abs(amount),
+        ))
+    return transactions, errors
+
+
+# =============================================================Import=================================================================
+
+def _sniff_delimiter(sample):
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=",;\t|").delimiter
+    except csv.Error:
+        return "\t" if sample.count("\t") > sample.count(",") else ","
+
+
+def import_statement_file(user, filename, profile, chunk_size=5000):
+    """
+    Merge one bank statement file into the user's transactions.
+
+    Args:
+        user: User object
+        filename: CSV/TSV statement
+        profile: Resolved profile (see resolve_profile())
+        chunk_size: Number of rows parsed and appended per batch
+
+    Returns:
+        dict: {"rows", "imported", "duplicates", "invalid", "seconds"} or None
+    """
+    if not os.path.isfile(filename):
+        print(f"⚠️ Statement file '{filename}' not found.")
+        return None
+
+    start = time.perf_counter()
+    with open(filename, "r", newline="", encoding=profile["encoding"]) as file:
+        for _ in range(profile["skip_rows"]):
+            file.readline()
+        data_start = file.tell()
+        delimiter = profile["delimiter"] or _sniff_delimiter(file.read(64 * 1024))
+        file.seek(data_start)
+
+        reader = csv.reader(file, delimiter=delimiter)
+        header = [name.strip() for name in next(reader, [])]
+        needed = [profile["date_column"]]
+        if profile["debit_column"] and profile["credit_column"]:
+            needed += [profile["debit_column"], profile["credit_column"]]
+        else:
+            needed.append(profile["amount_column"])
+        if profile["type_column"]:
+            needed.append(profile["type_column"])
+        missing = [name for name in needed if name not in header]
+        if missing:
+            print(f"❌ '{filename}' has no column(s) {', '.join(missing)} (found: {', '.join(header)}).")
+            return None
+
+        state = _start_import(user)
+        stats = {"rows": 0, "imported": 0, "duplicates": 0, "invalid": 0, "seconds": 0.0}
+        errors = []
+        date_cache = {}
+        occurrences = {}
+        while True:
+            rows = list(itertools.islice(reader, chunk_size))
+            if not rows:
+                break
+            first_line = profile["skip_rows"] + stats["rows"] + 2  # +1 for the header
+            stats["rows"] += len(rows)
+            transactions, chunk_errors = convert_statement_chunk(
+                user, header, rows, profile, date_cache, occurrences, first_line, os.path.basename(filename))
+            stats["invalid"] += len(chunk_errors)
+            errors.extend(chunk_errors[:max(0, 10 - len(errors))])
+            _merge_import_batch(user, transactions, state, stats)
+
+    return _finish_import(user, filename, stats, errors, start)
+
+
+def import_statements(user, path, profile_name=None, settings=None):
+    """
+    Import a statement file, or every statement file in a directory.
+
+    Args:
+        user: User object
+        path: Statement file or directory
+        profile_name: Name of a saved profile
+        settings: Profile settings to use instead of a saved profile
+
+    Returns:
+        dict: Totals over all files, plus "files"
+    """
+    if settings is None:
+        profiles = load_import_profiles()
+        if profile_name not in profiles:
+            print(f"❌ Unknown import profile '{profile_name}'.")
+            return None
+        settings = profiles[profile_name]
+    profile = resolve_profile(settings)
+
+    if os.path.isdir(path):
+        filenames = sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if name.lower().endswith(STATEMENT_EXTENSIONS)
+        )
+    else:
+        filenames = [path]
+
+    totals = {"files": 0, "rows": 0, "imported": 0, "duplicates": 0, "invalid": 0, "seconds": 0.0}
+    for filename in filenames:
+        stats = import_statement_file(user, filename, profile)
+        if stats is None:
+            continue
+        totals["files"] += 1
+        for key in ("rows", "imported", "duplicates", "invalid", "seconds"):
+            totals[key] += stats[key]
+
+    if len(filenames) > 1:
+        print(f"✅ {totals['files']} statement file(s): {totals['imported']:,} transaction(s) imported "
+              f"in {totals['seconds']:.2f}s.")
+    return totals
+
+
+def statement_import_menu(user):
+    """Ask for a statement file/directory and a profile, creating the profile if needed."""
+    path = input("Statement file or directory: ").strip()
+    if not os.path.exists(path):
+        print(f"❌ '{path}' does not exist.")
+        return
+
+    profiles = load_import_profiles()
+    if profiles:
+        print("Saved profiles: " + ", ".join(sorted(profiles)))
+    name = input("Profile name: ").strip()
+    if not name:
+        print("❌ A profile name is required.")
+        return
+
+    if name not in profiles:
+        print(f"Creating profile '{name}' (press Enter to keep the default shown in brackets).")
+        settings = {}
+        for key in ("date_column", "date_format", "amount_column", "sign_convention",
+                    "description_column", "category_column", "decimal_separator", "thousands_separator"):
+            answer = input(f"  {key} [{DEFAULT_PROFILE[key]}]: ").strip()
+            if answer:
+                settings[key] = answer
+        try:
+            save_import_profile(name, settings)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+        print(f"✅ Profile '{name}' saved.")
+
+    import_statements(user, path, profile_name=name)
@@ -0,0 +1,256 @@
+import json # For JSON data storage
+import os # For file operations
+import re # For parsing existing transaction ids
+from .paths import transaction_file_path, recurring_transaction_file_path
+from .file_lock import locked, get_version, read_json, write_json
+from .archive import iter_archived_records
+
+
+# file path -> (file version, {transaction_id: [positions]}, number of transactions)
+_index_cache = {}
+
+
+def index_file_path(user):
+    """Return the path of the user's transaction id index."""
+    return os.path.join('data', 'transactions', f'transactions_{user["name"]}_{user["id"]}.idx')
+
+
+def id_sequence_file_path(user):
+    """Return the path of the user's transaction id counter."""
+    return os.path.join('data', 'transactions', f'transactions_{user["name"]}_{user["id"]}.idseq')
+
+
+def build_positions(transaction_list):
+    """
+    Map every transaction id to its position(s) in the list.
+
+    Older files can contain the same id more than once, so each id maps
+    to a list of positions.
+
+    Args:
+        transaction_list: List of Transaction objects
+
+    Returns:
+        dict: {transaction_id: [position, ...]}
+    """
+    return _positions_from_ids(t.transaction_id for t in transaction_list)
+
+
+def _positions_from_ids(transaction_ids, first_position=0, positions=None):
+    positions = {} if positions is None else positions
+    for position, transaction_id in enumerate(transaction_ids, first_position):
+        positions.setdefault(transaction_id, []).append(position)
+    return positions
+
+
+def _store_index(path, version, positions, length):
+    _index_cache[path] = (version, positions, length)
+    try:
+        write_json(path, {"version": version, "length": length, "positions": positions}, indent=None)
+    except OSError:
+        pass  # The index is only an accelerator; it is rebuilt when missing
+
+
+def _cached_index(path, version):
+    """Return (positions, length) for this file version from memory or disk, or None."""
+    cached = _index_cache.get(path)
+    if cached and cached[0] == version:
+        return cached[1], cached[2]
+
+    if os.path.exists(path):
+        try:
+            with open(path, "r") as file:
+                stored = json.load(file)
+            if stored.get("version") == version:
+                positions = stored["positions"]
+                length = stored.get("length", sum(len(p) for p in positions.values()))
+                _index_cache[path] = (version, positions, length)
+                return positions, length
+        except (json.JSONDecodeError, KeyError):
+            pass  # Stale or damaged; the caller rebuilds
+    return None
+
+
+def update_transaction_index(user, transaction_list, version):
+    """
+    Store the index for a freshly written transaction file.
+
+    Args:
+        user: User object
+        transaction_list: List of Transaction objects that was just saved
+        version: File version returned by the write
+
+    Returns:
+        dict: {transaction_id: [position, ...]}
+    """
+    positions = build_positions(transaction_list)
+    _store_index(index_file_path(user), version, positions, len(transaction_list))
+    return positions
+
+
+def load_transaction_index(user, transaction_list, version):
+    """
+    Return the id -> positions index for the given file version.
+
+    The in-memory copy is used when it matches the version, then the
+    persisted index file; the index is only rebuilt from the list when
+    both are stale (e.g. the file was edited by hand).
+
+    Args:
+        user: User object
+        transaction_list: List of Transaction objects read at that version
+        version: File version returned by read_transaction_file()
+
+    Returns:
+        dict: {transaction_id: [position, ...]}
+    """
+    cached = _cached_index(index_file_path(user), version)
+    if cached:
+        return cached[0]
+    return update_transaction_index(user, transaction_list, version)
+
+
+def current_transaction_index(user):
+    """
+    Return the index of the transaction file as it is on disk right now.
+
+    Unlike load_transaction_index() this does not need the parsed
+    Transaction objects: when no index matches the current version only
+    the raw ids are read to rebuild it.
+
+    Returns:
+        tuple: (version, {transaction_id: [position, ...]}, number of transactions)
+    """
+    path = index_file_path(user)
+    version = get_version(transaction_file_path(user))
+    cached = _cached_index(path, version)
+    if cached:
+        return version, cached[0], cached[1]
+
+    records, version = read_json(transaction_file_path(user), default=[])
+    positions = _positions_from_ids(record.get("transaction_id") for record in records)
+    _store_index(path, version, positions, len(records))
+    return version, positions, len(records)
+
+
+def extend_transaction_index(user, transaction_ids, old_version, new_version, persist=True):
+    """
+    Add appended transactions to the index without rebuilding it.
+
+    If the index in memory is not at old_version (someone else wrote in
+    between) it is simply dropped and rebuilt the next time it is needed.
+
+    Args:
+        user: User object
+        transaction_ids: Ids of the appended transactions, in order
+        old_version: File version before the append
+        new_version: File version returned by the append
+        persist: Also write the index file (skip for intermediate batches)
+    """
+    path = index_file_path(user)
+    cached = _index_cache.get(path)
+    if not cached or cached[0] != old_version:
+        _index_cache.pop(path, None)
+        return
+
+    _, positions, length = cached
+    transaction_ids = list(transaction_ids)
+    _positions_from_ids(transaction_ids, length, positions)
+    length += len(transaction_ids)
+    if persist:
+        _store_index(path, new_version, positions, length)
+    else:
+        _index_cache[path] = (new_version, positions, length)
+
+
+def persist_transaction_index(user):
+    """Write the in-memory index of the user to disk (after a series of appends)."""
+    path = index_file_path(user)
+    cached = _index_cache.get(path)
+    if cached:
+        _store_index(path, *cached)
+
+
+def find_transaction_positions(user, transaction_list, version, transaction_id):
+    """
+    Look up the position(s) of a transaction id in O(1).
+
+    Returns:
+        list: Positions of the transaction in transaction_list (empty if not found)
+    """
+    positions = load_transaction_index(user, transaction_list, version).get(transaction_id, [])
+    # Guard against an index that does not match the list it is used with
+    if any(p >= len(transaction_list) or transaction_list[p].transaction_id != transaction_id for p in positions):
+        positions = build_positions(transaction_list).get(transaction_id, [])
+    return positions
+
+
+def _highest_sequence(user, transaction_ids):
+    """Find the highest numeric suffix among ids of the form <name><number>."""
+    pattern = re.compile(re.escape(str(user["name"])) + r"(\d+)$")
+    highest = 0
+    for transaction_id in transaction_ids:
+        match = pattern.match(str(transaction_id))
+        if match:
+            highest = max(highest, int(match.group(1)))
+    return highest
+
+
+def next_transaction_id(user):
+    """
+    Allocate a new, never reused transaction id for the user.
+
+    See allocate_transaction_ids().
+
+    Returns:
+        str: The new transaction id
+    """
+    return allocate_transaction_ids(user, 1)[0]
+
+
+def allocate_transaction_ids(user, count):
+    """
+    Allocate a block of new, never reused transaction ids for the user.
+
+    Ids keep the "<name><number>" format, but the number comes from a
+    persisted counter that only ever goes up, so deleting a transaction
+    can no longer make the next id collide with an existing one. The
+    counter starts above every id already in the user's files, archived
+    years included (.idseq is a cache and may be lost).
+
+    Args:
+        user: User object
+        count: Number of ids to reserve
+
+    Returns:
+        list: The new transaction ids (str)
+    """
+    path = id_sequence_file_path(user)
+    with locked(path):
+        last = None
+        if os.path.exists(path):
+            with open(path, "r") as file:
+                content = file.read().strip()
+            if content.isdigit():
+                last = int(content)
+
+        if last is None:
+            # First allocation: start after every id that already exists
+            ids = []
+            for data_file in (transaction_file_path(user), recurring_transaction_file_path(user)):
+                if os.path.exists(data_file):
+                    try:
+                        with open(data_file, "r") as file:
+                            for record in json.load(file):
+                                ids.append(record.get("transaction_id") or record.get("transaction", {}).get("transaction_id"))
+                    except json.JSONDecodeError:
+                        pass
+            # Archived transactions keep their ids (imports and reports still see them)
+            ids.extend(record.get("transaction_id") for record in iter_archived_records(user))
+            last = max(_highest_sequence(user, ids), user.get("number_of_transactions", 0))
+
+        first = last + 1
+        last += count
+        with open(path, "w") as file:
+            file.write(str(last))
+    return [f"{user['name']}{n}" for n in range(first, last + 1)]
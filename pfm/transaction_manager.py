@@ -0,0 +1,1828 @@
+import datetime # For date/time handling
+import json # For JSON data storage
+import os
+import shutil # For file operations
+from .models import Transaction
+from .dates import year_month_key, month_key_of, month_of_key, parse_month_key
+from .money import to_cents, from_cents, record_cents, public_record
+from .paths import transaction_file_path
+from .ledger import update_ledger, rebuild_ledger, verify_ledger
+from .metrics import instrumented, measure, dump_metrics
+from .report_cache import show_cached, forget_reports
+from .file_lock import Version_Conflict, locked, get_version, read_json, write_json, create_json, iter_json_array
+from .write_ahead_log import log_change, logged_append, checkpoint
+from .archive import (has_archive, archived_months, archived_totals, read_archive_index, iter_archived_records,
+                      with_archive, month_bounds, finish_interrupted_archive)
+from .transaction_index import (update_transaction_index, find_transaction_positions, next_transaction_id,
+                               allocate_transaction_ids, current_transaction_index,
+                               extend_transaction_index, persist_transaction_index)
+import csv
+import gzip # For compressed exports
+import itertools # For reading CSV files in chunks
+import time
+
+# Optional Parquet support; pyarrow is slow to import, so it is only
+# loaded by the first Parquet export/import (see _load_pyarrow())
+pa = pq = None
+
+
+# =============================================================Functions=================================================================
+
+def show_menu():
+    print("""
+╔══════════════════════════════════════════════════════╗
+║            💰 PERSONAL FINANCE MANAGER 💰           ║
+╠══════════════════════════════════════════════════════╣
+║ [1] Add Income / Expenses                            ║
+║ [2] View All Transactions                            ║
+║ [3] Edit Transactions                                ║
+║ [4] Delete Transaction                               ║
+║ [5] Search by Date Range                             ║
+║ [6] Filter by Category                               ║
+║ [7] Filter by Amount Range                           ║
+║ [8] Sort Results                                     ║
+║ [9] Monthly Budget Tracker                           ║
+║ [10] Monthly Reports                                 ║
+║ [11] Category Breakdown                              ║
+║ [12] Spending Trends                                 ║
+║ [13] Recurring Transactions                          ║
+║ [14] Export Transactions to CSV                      ║
+║ [15] Import Transactions from CSV                    ║
+║ [16] Cash-Flow Forecast                              ║
+║ [17] Performance Metrics                             ║
+║ [0] Exit                                             ║
+╚══════════════════════════════════════════════════════╝
+👉 Please enter your choice: """, end="")
+    
+def _transaction_file_of(user, *args, **kwargs):
+    return transaction_file_path(user)
+
+@instrumented("read_transaction_file", path=_transaction_file_of, io="read")
+def read_transaction_file(user, with_version=False):
+    """
+    Load the user's transactions, creating an empty file if needed.
+
+    Args:
+        user: User object
+        with_version: Also return the file version, to pass back to
+                      save_transactions_to_file() as expected_version
+
+    Returns:
+        list of Transaction objects, or (list, version) if with_version is True
+    """
+    # Define full path to your file
+    file_path = transaction_file_path(user)
+    version = 0
+
+    try:
+        # Ensure the directory exists (creates folders if missing)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        # If file doesn't exist, create it and write empty list
+        if not os.path.exists(file_path):
+            version = create_json(file_path, [])
+            if version is not None:
+                # print("✅ transactions.json created successfully.")
+                transactions_list = []
+                return (transactions_list, version) if with_version else transactions_list
+            # Another session created it first, read theirs
+        # print("✅ transactions.json already exists.")
+        try:
+            with measure("read_transaction_file.parse"):
+                transactions_data, version = read_json(file_path, default=[])
+            with measure("read_transaction_file.build"):
+                transactions_list = [Transaction.from_dict(t) for t in transactions_data]
+            user["number_of_transactions"] = len(transactions_list)
+
+        except json.JSONDecodeError:
+            print("⚠️ Warning: Transaction file was corrupted. Starting with empty transactions.") #maybe I would want to change this later
+            transactions_list = []
+            version = get_version(file_path)
+
+    except Exception as e:
+        print(f"⚠️ Error while checking/creating file: {e}")
+        transactions_list = []
+
+    return (transactions_list, version) if with_version else transactions_list
+
+@instrumented("save_transactions_to_file", path=_transaction_file_of, io="write")
+def save_transactions_to_file(user, transaction_list, expected_version=None):
+    """
+    Save a list of Transaction objects to the user's JSON file.
+    
+    Args:
+        user: User object
+        transaction_list: List of Transaction objects
+        expected_version: Version returned by read_transaction_file(); if
+                          another session saved in the meantime a
+                          Version_Conflict is raised instead of losing its writes
+    """
+    file_path = transaction_file_path(user)
+    
+    try:
+        # Convert all Transaction objects to dictionaries
+        with measure("save_transactions_to_file.serialize"):
+            transactions_data = [t.to_dict() for t in transaction_list]
+        
+        # Write to file with nice formatting (atomically, under an exclusive lock)
+        with measure("save_transactions_to_file.write"):
+            version = write_json(file_path, transactions_data, expected_version=expected_version)
+        with measure("save_transactions_to_file.index"):
+            update_transaction_index(user, transaction_list, version)
+        
+        print(f"✅ Successfully saved {len(transaction_list)} transactions.")
+        return True
+        
+    except Version_Conflict:
+        raise
+    except Exception as e:
+        print(f"❌ Error saving transactions: {e}")
+        return False
+
+def add_transaction(user, new_transaction):
+    """
+    Add a new transaction to the user's file.
+    
+    Args:
+        user: User object
+        new_transaction: Transaction object to add
+    """
+    # Log the change first, so it is redone if we die while saving
+    with log_change("transaction.add", transaction_file_path(user), records=[new_transaction.to_dict()]) as change:
+        while True:
+            # Load existing transactions
+            transactions, version = read_transaction_file(user, with_version=True)
+            
+            # Add the new one
+            transactions.append(new_transaction)
+            
+            # Save back to file (retry if another session saved in between)
+            try:
+                if not save_transactions_to_file(user, transactions, expected_version=version):
+                    change.cancel()
+                    return False
+                break
+            except Version_Conflict:
+                continue
+        user["number_of_transactions"] = len(transactions)
+        update_ledger(user, added=[new_transaction])
+    return True
+
+def export_transactions_to_csv(user):
+    """Export all transactions of the user (archived months included) to a CSV file."""
+    transactions = with_archive(user, read_transaction_file(user))
+    if not transactions:
+        print("⚠️ No transactions to export.")
+        return
+
+    filename = f"{user['name']}_transactions.csv"
+    fieldnames = ["transaction_id", "type", "user_id", "amount", "date", "category", "description", "payment_method"]
+    
+    with open(filename, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows([public_record(t.to_dict()) for t in transactions])
+    
+    print(f"✅ Transactions exported successfully to '{filename}'.")
+
+def export_transactions_to_csv_streaming(user, filename=None, start_date=None, end_date=None,
+                                         categories=None, compress=False, include_archive=True):
+    """
+    Export the user's transactions to CSV one record at a time.
+
+    Records are decoded from the transaction file and written out as they
+    are read, so memory use stays the same whatever the size of the
+    history. Only the records that pass the filters are written. Archived
+    months come first; only the archive years in the date range are read.
+
+    Args:
+        user: User object
+        filename: Output file (defaults to "<name>_transactions.csv", plus ".gz" when compressed)
+        start_date: Only export transactions on or after this date (datetime.date)
+        end_date: Only export transactions on or before this date (datetime.date)
+        categories: Only export these categories (iterable of str)
+        compress: Write gzip-compressed output (also implied by a ".gz" filename)
+        include_archive: Also export the archived months (see archive.py)
+
+    Returns:
+        int: Number of transactions exported
+    """
+    filename = filename or f"{user['name']}_transactions.csv" + (".gz" if compress else "")
+    compress = compress or filename.endswith(".gz")
+    fieldnames = ["transaction_id", "type", "user_id", "amount", "date", "category", "description", "payment_method"]
+
+    # Dates are stored as ISO strings, which compare in date order
+    start = start_date.isoformat() if start_date else None
+    end = end_date.isoformat() if end_date else None
+    categories = {c.lower() for c in categories} if categories else None
+
+    def matching_records():
+        archived = iter_archived_records(user, start, end) if include_archive else ()
+        for record in itertools.chain(archived, iter_json_array(transaction_file_path(user))):
+            if start and record.get("date", "") < start:
+                continue
+            if end and record.get("date", "") > end:
+                continue
+            if categories and str(record.get("category", "")).lower() not in categories:
+                continue
+            counter[0] += 1
+            yield public_record(record)  # Amounts leave the program in currency units
+
+    counter = [0]
+    if compress:
+        csvfile = gzip.open(filename, "wt", newline="", encoding="utf-8")
+    else:
+        csvfile = open(filename, "w", newline="", encoding="utf-8")
+    with csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(matching_records())
+
+    if counter[0] == 0:
+        print(f"⚠️ No transactions matched; '{filename}' only contains the header.")
+    else:
+        print(f"✅ {counter[0]} transaction(s) exported successfully to '{filename}'.")
+    return counter[0]
+
+def export_transactions_menu(user):
+    """Ask for the export mode and optional filters, then run the export."""
+    from .incremental_export import export_transactions_incremental
+
+    print("[1] Full export (optionally filtered)")
+    print("[2] Incremental export (only new transactions since the last export)")
+    mode = input("Enter choice (1-2): ").strip()
+    if mode == "2":
+        export_transactions_incremental(user)
+        return
+
+    while True:
+        try:
+            start_input = input("Start date (YYYY-MM-DD, blank for all): ").strip()
+            end_input = input("End date (YYYY-MM-DD, blank for all): ").strip()
+            start_date = datetime.datetime.strptime(start_input, "%Y-%m-%d").date() if start_input else None
+            end_date = datetime.datetime.strptime(end_input, "%Y-%m-%d").date() if end_input else None
+            if start_date and end_date and start_date > end_date:
+                print("❌ Start date cannot be after end date.")
+                continue
+            break
+        except ValueError:
+            print("❌ Invalid date format. Please try again.")
+
+    category_input = input("Categories, comma separated (blank for all): ").strip()
+    categories = [c.strip() for c in category_input.split(",") if c.strip()] or None
+    compress = input("Compress the file with gzip? (y/n): ").strip().lower() in ("y", "yes")
+
+    export_transactions_to_csv_streaming(user, start_date=start_date, end_date=end_date,
+                                         categories=categories, compress=compress)
+
+# Encoding of imported CSV files; "-sig" drops the byte order mark spreadsheet programs put before the header
+CSV_IMPORT_ENCODING = "utf-8-sig"
+
+def import_transactions_from_csv(user):
+    """Import transactions from a CSV file into the user's record."""
+    filename = f"{user['name']}_transactions.csv"
+    
+    if not os.path.exists(filename):
+        print(f"⚠️ No CSV file found for user {user['name']}.")
+        return
+
+    with open(filename, "r", encoding=CSV_IMPORT_ENCODING) as csvfile:
+        reader = csv.DictReader(csvfile)
+        transactions_data = list(reader)
+    
+    if not transactions_data:
+        print("⚠️ The CSV file is empty.")
+        return
+    
+    # Convert CSV data to Transaction objects
+    transactions = []
+    for t in transactions_data:
+        # Convert string values to proper types
+        if "amount" in t:
+            t["amount_cents"] = to_cents(t.pop("amount"))  # Exact: "0.29" is 29 cents
+        if "user_id" in t:
+            t["user_id"] = int(t["user_id"]) if t["user_id"].isdigit() else t["user_id"]
+        
+        # Note: from_dict() will handle date conversion internally
+        # Create Transaction object from dict
+        transaction = Transaction.from_dict(t) # I change to dict because I know that my save function expects dicts, and it will be easier this way rather than implementing a save in this function
+        transactions.append(transaction)
+
+    # Archived months stay in the archive; a full export lists them too
+    if has_archive(user):
+        archived_ids = {record["transaction_id"] for record in iter_archived_records(user)}
+        transactions = [t for t in transactions if t.transaction_id not in archived_ids]
+    
+    # Log the new history first, so the replace is finished if we die while saving
+    with log_change("transaction.replace", transaction_file_path(user),
+                    records=[t.to_dict() for t in transactions]) as change:
+        if not save_transactions_to_file(user, transactions):
+            change.cancel()
+            return
+        # The import replaces the whole history, so the totals are rebuilt from it
+        rebuild_ledger(user, transactions)
+    forget_reports(user)
+    print(f"✅ Transactions imported successfully from '{filename}'.")
+
+def _record_line(line_num, values):
+    """
+    Return the line a CSV record starts on.
+
+    csv readers count the lines read so far; a record with quoted line
+    breaks spans several of them.
+
+    Args:
+        line_num: reader.line_num right after the record was read
+        values: Field values of the record
+
+    Returns:
+        int: Line number of the record's first line
+    """
+    return line_num - sum(value.count("\n") for value in values if isinstance(value, str))
+
+def _convert_csv_chunk(default_user_id, rows, first_line, date_cache, lines=None):
+    """
+    Validate and convert one chunk of CSV rows into Transaction objects.
+
+    Dates are parsed once per distinct value (bank exports repeat the same
+    dates many times). Rows without a transaction_id keep an empty id;
+    _merge_import_batch() assigns them.
+
+    Args:
+        default_user_id: user_id for rows that do not have one
+        rows: List of dicts from csv.DictReader
+        first_line: Line number of the first row in the CSV (for messages)
+        date_cache: Dict reused across chunks, {date string: datetime.date}
+        lines: Line number of each row, when the rows are not on consecutive
+               lines (blank lines, quoted line breaks); overrides first_line
+
+    Returns:
+        tuple: (list of Transaction objects, list of (line, error message))
+    """
+    transactions = []
+    errors = []
+
+    numbered = zip(lines, rows) if lines is not None else enumerate(rows, first_line)
+    for line, row in numbered:
+        if not row:
+            continue  # Blank line, or a row the caller already rejected
+        try:
+            t_type = (row.get("type") or "").strip().lower()
+            if t_type not in ("income", "expense"):
+                raise ValueError(f"invalid type '{row.get('type')}'")
+
+            amount_cents = to_cents(row.get("amount") or "")
+
+            date_str = (row.get("date") or "").strip()
+            t_date = date_cache.get(date_str)
+            if t_date is None:
+                t_date = datetime.datetime.fromisoformat(date_str).date()
+                date_cache[date_str] = t_date
+
+            category = (row.get("category") or "").strip().lower()
+            if not category:
+                raise ValueError("missing category")
+
+            user_id = (row.get("user_id") or "").strip()
+            user_id = int(user_id) if user_id.isdigit() else default_user_id
+        except ValueError as e:
+            errors.append((line, str(e)))
+            continue
+
+        transactions.append(Transaction(
+            (row.get("transaction_id") or "").strip(), t_type, user_id, None, t_date,
+            category, row.get("description") or None, row.get("payment_method") or None,
+            amount_cents=amount_cents,
+        ))
+
+    return transactions, errors
+
+def _merge_import_batch(user, transactions, state, stats):
+    """
+    Append one converted batch to the user's transactions file.
+
+    Rows without an id get ids reserved in one block; ids that are already
+    stored, archived or appeared earlier in the import are skipped.
+
+    Args:
+        user: User object
+        transactions: List of Transaction objects from _convert_csv_chunk()
+        state: Dict with "version", "stored_ids", "archived_ids" and "new_ids", carried across batches
+        stats: Import counters, updated in place
+    """
+    missing_ids = [t for t in transactions if not t.transaction_id]
+    if missing_ids:
+        for transaction, new_id in zip(missing_ids, allocate_transaction_ids(user, len(missing_ids))):
+            transaction.transaction_id = new_id
+
+    fresh = []
+    for transaction in transactions:
+        transaction_id = transaction.transaction_id
+        if transaction_id in state["stored_ids"] or transaction_id in state["archived_ids"] or transaction_id in state["new_ids"]:
+            stats["duplicates"] += 1
+            continue
+        state["new_ids"].add(transaction_id)
+        fresh.append(transaction)
+
+    if fresh:
+        new_version = logged_append(transaction_file_path(user), [t.to_dict() for t in fresh])
+        extend_transaction_index(user, [t.transaction_id for t in fresh], state["version"], new_version, persist=False)
+        state["version"] = new_version
+        update_ledger(user, added=fresh)
+        stats["imported"] += len(fresh)
+
+def _start_import(user):
+    """Prepare the merge state for an import into the user's transactions file."""
+    if not os.path.exists(transaction_file_path(user)):
+        read_transaction_file(user)  # Creates an empty transactions file
+    version, stored_ids, _ = current_transaction_index(user)
+    # Archived transactions left the transactions file but are still part of the history
+    archived_ids = {record["transaction_id"] for record in iter_archived_records(user)}
+    return {"version": version, "stored_ids": stored_ids, "archived_ids": archived_ids, "new_ids": set()}
+
+def _finish_import(user, filename, stats, errors, start):
+    """Persist the index, update the counters and print the import summary."""
+    persist_transaction_index(user)
+    user["number_of_transactions"] = user.get("number_of_transactions", 0) + stats["imported"]
+    stats["seconds"] = time.perf_counter() - start
+
+    for line, message in errors:
+        print(f"⚠️ Line {line}: {message}")
+    if stats["invalid"] > len(errors):
+        print(f"⚠️ ... and {stats['invalid'] - len(errors)} more invalid row(s).")
+    print(f"✅ Imported {stats['imported']:,} new transaction(s) from '{filename}' "
+          f"({stats['duplicates']:,} already present, {stats['invalid']:,} invalid) in {stats['seconds']:.2f}s.")
+    return stats
+
+def import_transactions_from_csv_streaming(user, filename=None, chunk_size=5000):
+    """
+    Merge a CSV file into the user's transactions, one chunk at a time.
+
+    Unlike import_transactions_from_csv() this keeps the existing history:
+    rows whose transaction_id is already stored are skipped, and new rows
+    are appended to the transactions file in batches. Only one chunk of
+    rows is held in memory at a time, so very large exports can be imported.
+
+    Args:
+        user: User object
+        filename: CSV file to read (defaults to "<name>_transactions.csv")
+        chunk_size: Number of rows converted and appended per batch
+
+    Returns:
+        dict: {"rows", "imported", "duplicates", "invalid", "seconds"} or None
+    """
+    filename = filename or f"{user['name']}_transactions.csv"
+    if not os.path.exists(filename):
+        print(f"⚠️ No CSV file found for user {user['name']}.")
+        return None
+
+    state = _start_import(user)
+    stats = {"rows": 0, "imported": 0, "duplicates": 0, "invalid": 0, "seconds": 0.0}
+    errors = []
+    date_cache = {}
+    start = time.perf_counter()
+
+    with open(filename, "r", newline="", encoding=CSV_IMPORT_ENCODING) as csvfile:
+        reader = csv.DictReader(csvfile)
+        while True:
+            rows = []
+            lines = []  # File line of each row, for messages
+            for row in itertools.islice(reader, chunk_size):
+                rows.append(row)
+                lines.append(_record_line(reader.line_num, row.values()))
+            if not rows:
+                break
+
+            stats["rows"] += len(rows)
+            transactions, chunk_errors = _convert_csv_chunk(user["id"], rows, 0, date_cache, lines)
+            stats["invalid"] += len(chunk_errors)
+            errors.extend(chunk_errors[:max(0, 10 - len(errors))])
+            _merge_import_batch(user, transactions, state, stats)
+
+            elapsed = time.perf_counter() - start
+            rate = stats["rows"] / elapsed if elapsed > 0 else 0
+            print(f"\r📥 {stats['rows']:,} rows processed, {stats['imported']:,} imported ({rate:,.0f} rows/s)", end="")
+
+    print()
+    return _finish_import(user, filename, stats, errors, start)
+
+# Rows per Parquet row group: large enough for efficient column scans,
+# small enough that one group fits comfortably in memory
+PARQUET_ROW_GROUP_SIZE = 128 * 1024
+
+def _load_pyarrow():
+    """Import pyarrow on first use. Returns False if it is not installed."""
+    global pa, pq
+    if pa is None:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            return False
+        pa, pq = pyarrow, pyarrow.parquet
+    return True
+
+def parquet_schema():
+    """Return the typed Arrow schema used for Parquet transaction files."""
+    category_type = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("transaction_id", pa.string()),
+        ("type", category_type),
+        ("user_id", pa.int64()),
+        ("amount", pa.float64()),
+        ("date", pa.date32()),
+        ("category", category_type),
+        ("description", pa.string()),
+        ("payment_method", category_type),
+    ])
+
+def _records_to_record_batch(records, schema, date_cache):
+    """Convert a list of stored transaction dicts into one Arrow record batch."""
+    dates = []
+    for record in records:
+        date_str = record.get("date") or ""
+        t_date = date_cache.get(date_str)
+        if t_date is None:
+            t_date = datetime.date.fromisoformat(date_str)
+            date_cache[date_str] = t_date
+        dates.append(t_date)
+
+    def column(name):
+        return [record.get(name) for record in records]
+
+    def encoded(name):
+        return pa.array(column(name), type=pa.string()).dictionary_encode()
+
+    user_ids = [u if isinstance(u, int) else (int(u) if str(u).isdigit() else None) for u in column("user_id")]
+    return pa.RecordBatch.from_arrays([
+        pa.array([str(t) for t in column("transaction_id")], type=pa.string()),
+        encoded("type"),
+        pa.array(user_ids, type=pa.int64()),
+        pa.array([from_cents(record_cents(record)) for record in records], type=pa.float64()),
+        pa.array(dates, type=pa.date32()),
+        encoded("category"),
+        pa.array(column("description"), type=pa.string()),
+        encoded("payment_method"),
+    ], schema=schema)
+
+def export_transactions_to_parquet(user, filename=None, row_group_size=PARQUET_ROW_GROUP_SIZE,
+                                   compression="zstd"):
+    """
+    Export the user's transactions to an Apache Parquet file.
+
+    Columns are typed (date32 dates, float64 amounts) and the low-cardinality
+    columns type, category and payment_method are dictionary-encoded. The
+    transaction file is streamed and written one row group at a time, so
+    large histories never have to fit in memory.
+
+    Args:
+        user: User object
+        filename: Output file (defaults to "<name>_transactions.parquet")
+        row_group_size: Number of rows per Parquet row group
+        compression: Parquet compression codec
+
+    Returns:
+        int: Number of transactions exported, or None if pyarrow is missing
+    """
+    if not _load_pyarrow():
+        print("⚠️ Parquet export needs the 'pyarrow' package (pip install pyarrow).")
+        return None
+
+    filename = filename or f"{user['name']}_transactions.parquet"
+    schema = parquet_schema()
+    date_cache = {}
+    exported = 0
+
+    with pq.ParquetWriter(filename, schema, compression=compression) as writer:
+        records = iter_json_array(transaction_file_path(user))
+        while True:
+            batch = list(itertools.islice(records, row_group_size))
+            if not batch:
+                break
+            table = pa.Table.from_batches([_records_to_record_batch(batch, schema, date_cache)])
+            writer.write_table(table, row_group_size=row_group_size)
+            exported += len(batch)
+
+    print(f"✅ {exported} transaction(s) exported successfully to '{filename}'.")
+    return exported
+
+def _convert_parquet_batch(default_user_id, columns, first_row):
+    """
+    Validate the typed columns of one Parquet batch and build Transaction objects.
+
+    Returns:
+        tuple: (list of Transaction objects, list of (row, error message))
+    """
+    transactions = []
+    errors = []
+
+    rows = zip(columns["transaction_id"], columns["type"], columns["user_id"], columns["amount"],
+               columns["date"], columns["category"], columns["description"], columns["payment_method"])
+    for row, (t_id, t_type, user_id, amount, t_date, category, description, payment_method) in enumerate(rows, first_row):
+        t_type = (t_type or "").strip().lower()
+        if t_type not in ("income", "expense"):
+            errors.append((row, f"invalid type '{t_type}'"))
+            continue
+        if amount is None or t_date is None:
+            errors.append((row, "missing amount or date"))
+            continue
+        category = (category or "").strip().lower()
+        if not category:
+            errors.append((row, "missing category"))
+            continue
+
+        transactions.append(Transaction(
+            (t_id or "").strip(), t_type, default_user_id if user_id is None else user_id,
+            None, t_date, category, description or None, payment_method or None, amount_cents=to_cents(amount),
+        ))
+
+    return transactions, errors
+
+def import_transactions_from_parquet(user, filename=None, batch_size=PARQUET_ROW_GROUP_SIZE):
+    """
+    Merge a Parquet file written by export_transactions_to_parquet().
+
+    The file is read batch by batch and merged like the streaming CSV
+    import: transactions whose id is already stored are skipped.
+
+    Args:
+        user: User object
+        filename: Parquet file to read (defaults to "<name>_transactions.parquet")
+        batch_size: Number of rows read and appended per batch
+
+    Returns:
+        dict: {"rows", "imported", "duplicates", "invalid", "seconds"} or None
+    """
+    if not _load_pyarrow():
+        print("⚠️ Parquet import needs the 'pyarrow' package (pip install pyarrow).")
+        return None
+
+    filename = filename or f"{user['name']}_transactions.parquet"
+    if not os.path.exists(filename):
+        print(f"⚠️ No Parquet file found for user {user['name']}.")
+        return None
+
+    state = _start_import(user)
+    stats = {"rows": 0, "imported": 0, "duplicates": 0, "invalid": 0, "seconds": 0.0}
+    errors = []
+    start = time.perf_counter()
+    fieldnames = parquet_schema().names
+
+    parquet_file = pq.ParquetFile(filename)
+    missing = [name for name in fieldnames if name not in parquet_file.schema_arrow.names]
+    if missing:
+        print(f"❌ '{filename}' is missing column(s): {', '.join(missing)}")
+        return None
+
+    for batch in parquet_file.iter_batches(batch_size=batch_size, columns=fieldnames):
+        first_row = stats["rows"] + 1
+        stats["rows"] += batch.num_rows
+        transactions, batch_errors = _convert_parquet_batch(user["id"], batch.to_pydict(), first_row)
+        stats["invalid"] += len(batch_errors)
+        errors.extend(batch_errors[:max(0, 10 - len(errors))])
+        _merge_import_batch(user, transactions, state, stats)
+
+    return _finish_import(user, filename, stats, errors, start)
+
+def delete_transaction(user, transaction_id):
+    """
+    Delete a transaction by its ID.
+    
+    Args:
+        user: User object
+        transaction_id: ID of transaction to delete
+        
+    Returns:
+        bool: True if deleted, False if not found
+    """
+    with log_change("transaction.delete", transaction_file_path(user), ids=[transaction_id]) as change:
+        while True:
+            # Load all transactions
+            transactions, version = read_transaction_file(user, with_version=True)
+            
+            # Find and remove the transaction through the id index
+            positions = find_transaction_positions(user, transactions, version, transaction_id)
+            
+            # Check if anything was deleted
+            if not positions:
+                change.cancel()
+                print(f"❌ Transaction '{transaction_id}' not found.")
+                return False
+            removed = [transactions.pop(p) for p in sorted(positions, reverse=True)]
+            
+            # Save the updated list (retry if another session saved in between)
+            try:
+                if not save_transactions_to_file(user, transactions, expected_version=version):
+                    change.cancel()
+                    return False
+                break
+            except Version_Conflict:
+                continue
+        update_ledger(user, removed=removed)
+    print(f"✅ Transaction '{transaction_id}' deleted successfully.")
+    user["number_of_transactions"] -= len(removed)  # Every stored copy of a duplicated id is removed
+    return True
+
+def edit_transaction(user, transaction_id):
+    """
+    Edit an existing transaction with interactive prompts and validation.
+    
+    Args:
+        user: User object
+        transaction_id: ID of transaction to edit
+        
+    Returns:
+        bool: True if edited successfully, False if not found
+    """
+    # Load all transactions
+    transactions, version = read_transaction_file(user, with_version=True)
+    
+    # Find the transaction to edit through the id index
+    positions = find_transaction_positions(user, transactions, version, transaction_id)
+    target_transaction = transactions[positions[0]] if positions else None
+    
+    # Check if transaction exists
+    if not target_transaction:
+        print(f"❌ Transaction '{transaction_id}' not found.")
+        return False
+    
+    # Keep the old version so the ledger can be adjusted after saving
+    original_transaction = Transaction.from_dict(target_transaction.to_dict())
+    
+    # Display current transaction details
+    print("\n" + "="*60)
+    print("📝 EDITING TRANSACTION")
+    print("="*60)
+    print(target_transaction)
+    print("\n💡 Press Enter to keep current value, or enter new value\n")
+    
+    # ===== Edit Transaction Type =====
+    print(f"Current type: {target_transaction.type}")
+    print("Options: [1] Income  [2] Expense")
+    type_choice = input("Enter choice (1-2) or press Enter to keep: ").strip()
+    
+    if type_choice:
+        type_options = ["income", "expense"]
+        while True:
+            try:
+                choice_num = int(type_choice)
+                if 1 <= choice_num <= 2:
+                    target_transaction.type = type_options[choice_num - 1]
+                    print(f"✅ Type updated to: {target_transaction.type}")
+                    break
+                else:
+                    print("❌ Invalid choice. Please select 1 or 2.")
+                    type_choice = input("Enter choice (1-2): ").strip()
+            except ValueError:
+                print("❌ Please enter a number.")
+                type_choice = input("Enter choice (1-2): ").strip()
+    
+    # ===== Edit Amount =====
+    print(f"\nCurrent amount: {target_transaction.amount}")
+    amount_input = input("Enter new amount or press Enter to keep: ").strip()
+    
+    if amount_input:
+        while True:
+            try:
+                new_amount = float(amount_input)
+                if new_amount <= 0:
+                    print("❌ Amount must be positive.")
+                    amount_input = input("Enter new amount: ").strip()
+                    continue
+                target_transaction.amount = new_amount
+                print(f"✅ Amount updated to: {new_amount}")
+                break
+            except ValueError:
+                print("❌ Please enter a valid number.")
+                amount_input = input("Enter new amount: ").strip()
+    
+    # ===== Edit Date =====
+    print(f"\nCurrent date: {target_transaction.date}")
+    date_input = input("Enter new date (YYYY-MM-DD) or press Enter to keep: ").strip()
+    
+    if date_input:
+        while True:
+            try:
+                new_date = datetime.datetime.strptime(date_input, "%Y-%m-%d").date()
+                target_transaction.date = new_date
+                print(f"✅ Date updated to: {new_date}")
+                break
+            except ValueError:
+                print("❌ Invalid date format. Use YYYY-MM-DD")
+                date_input = input("Enter new date: ").strip()
+                if not date_input:  # Allow user to cancel
+                    break
+    
+    # ===== Edit Category =====
+    print(f"\nCurrent category: {target_transaction.category}")
+    print("Options: [1] Food  [2] Transport  [3] Entertainment  [4] Other")
+    category_choice = input("Enter choice (1-4) or press Enter to keep: ").strip()
+    
+    if category_choice:
+        category_options = ["food", "transport", "entertainment", "other"]
+        while True:
+            try:
+                choice_num = int(category_choice)
+                if 1 <= choice_num <= 4:
+                    target_transaction.category = category_options[choice_num - 1]
+                    print(f"✅ Category updated to: {target_transaction.category}")
+                    break
+                else:
+                    print("❌ Invalid choice. Please select between 1 and 4.")
+                    category_choice = input("Enter choice (1-4): ").strip()
+            except ValueError:
+                print("❌ Please enter a number.")
+                category_choice = input("Enter choice (1-4): ").strip()
+    
+    # ===== Edit Payment Method =====
+    print(f"\nCurrent payment method: {target_transaction.payment_method or 'N/A'}")
+    print("Options: [1] Cash  [2] Credit  [3] Debit  [4] Other")
+    payment_choice = input("Enter choice (1-4) or press Enter to keep: ").strip()
+    
+    if payment_choice:
+        payment_options = ["cash", "credit", "debit", "other"]
+        while True:
+            try:
+                choice_num = int(payment_choice)
+                if 1 <= choice_num <= 4:
+                    target_transaction.payment_method = payment_options[choice_num - 1]
+                    print(f"✅ Payment method updated to: {target_transaction.payment_method}")
+                    break
+                else:
+                    print("❌ Invalid choice. Please select between 1 and 4.")
+                    payment_choice = input("Enter choice (1-4): ").strip()
+            except ValueError:
+                print("❌ Please enter a number.")
+                payment_choice = input("Enter choice (1-4): ").strip()
+    
+    # ===== Edit Description =====
+    print(f"\nCurrent description: {target_transaction.description or 'No description'}")
+    desc_input = input("Enter new description or press Enter to keep: ").strip()
+    
+    if desc_input:
+        target_transaction.description = desc_input
+        print(f"✅ Description updated")
+    
+    # ===== Save Changes =====
+    print("\n" + "="*60)
+    confirm = input("💾 Save changes? (y/n): ").strip().lower()
+    
+    if confirm == 'y' or confirm == 'yes':
+        with log_change("transaction.put", transaction_file_path(user), records=[target_transaction.to_dict()]) as change:
+            while True:
+                try:
+                    saved = save_transactions_to_file(user, transactions, expected_version=version)
+                    break
+                except Version_Conflict:
+                    # Another session saved meanwhile: put the edit on top of its version
+                    transactions, version = read_transaction_file(user, with_version=True)
+                    positions = find_transaction_positions(user, transactions, version, transaction_id)
+                    if not positions:
+                        change.cancel()
+                        print(f"❌ Transaction '{transaction_id}' was deleted by another session.")
+                        return False
+                    transactions[positions[0]] = target_transaction
+            if saved:
+                update_ledger(user, added=[target_transaction], removed=[original_transaction])
+            else:
+                change.cancel()
+        if saved:
+            print("\n✅ Transaction updated successfully!")
+            print("\n📋 Updated Transaction:")
+            print(target_transaction)
+            return True
+        else:
+            print("❌ Failed to save changes.")
+            return False
+    else:
+        print("❌ Changes discarded.")
+        return False
+
+def create_transaction(current_user):
+
+    print("\n🧾  Create a New Transaction")
+    print("=" * 40)    
+    t_id = next_transaction_id(current_user)
+    t_userId = current_user["id"]
+    current_user["number_of_transactions"] += 1
+    type_options = ["income", "expense"]
+    category_options = ["food", "transport", "entertainment", "other"]
+    payment_options = ["cash", "credit", "debit", "other"]
+    
+    # ---- Transaction Type ----
+    print("\nSelect transaction type:")
+    for i, option in enumerate(type_options, 1):
+        print(f"[{i}] {option.capitalize()}")
+    while True:
+        try:
+            t_type_choice = int(input("Enter choice (1-2): "))
+            if 1 <= t_type_choice <= len(type_options):
+                t_type = type_options[t_type_choice - 1]
+                break
+            else:
+                print("❌ Invalid choice. Please select 1 or 2.")
+        except ValueError:
+            print("❌ Please enter a number, not text.")
+
+    # --- Amount input ---
+    while True:
+        try:
+            t_amount = float(input("💰  Enter the amount (e.g., 150.75): "))
+            if t_amount <= 0:
+                print("❌  Amount must be positive.")
+                continue
+            break
+        except ValueError:
+            print("❌  Please enter a valid number.")
+
+    # --- Date input ---
+    while True:
+        print("\n📅  Enter the transaction date:")
+        print("   - Format: YYYY-MM-DD")
+        print("   - Leave empty for today’s date")
+        date_input = input("👉  Date: ").strip()
+        if not date_input:
+            t_date = datetime.datetime.today().date()
+            break
+        try:
+            t_date = datetime.datetime.strptime(date_input, "%Y-%m-%d").date()
+            break
+        except ValueError:
+            print("❌  Invalid date format. Please try again.")  
+    
+    # ---- Category ----
+    print("\nSelect category:")
+    for i, option in enumerate(category_options, 1):
+        print(f"[{i}] {option.capitalize()}")
+    while True:
+        try:
+            t_category_choice = int(input("Enter choice (1-4): "))
+            if 1 <= t_category_choice <= len(category_options):
+                t_category = category_options[t_category_choice - 1]
+                break
+            else:
+                print("❌ Invalid choice. Please select between 1 and 4.")
+        except ValueError:
+            print("❌ Please enter a number, not text.")
+
+    # ---- Payment Method ----
+    print("\nSelect payment method:")
+    for i, option in enumerate(payment_options, 1):
+        print(f"[{i}] {option.capitalize()}")
+    while True:
+        try:
+            t_payment_choice = int(input("Enter choice (1-4): "))
+            if 1 <= t_payment_choice <= len(payment_options):
+                t_payment_method = payment_options[t_payment_choice - 1]
+                break
+            else:
+                print("❌ Invalid choice. Please select between 1 and 4.")
+        except ValueError:
+            print("❌ Please enter a number, not text.")
+
+    # --- Description ---
+    t_description = input("\n📝  Add a short description (optional): ").strip()
+    if not t_description:
+        t_description = "No description provided."
+
+
+    return Transaction( t_id, t_type, t_userId, t_amount, t_date, t_category, t_description, t_payment_method )
+
+@instrumented("filter.category")
+def filter_transactions_by_category(transaction_list):
+    """
+    Filter transactions by category.
+    
+    Args:
+        transaction_list: List of Transaction objects
+        category: Category to filter by (string)
+        
+    Returns:
+        List of Transaction objects matching the category
+    """
+    category_options = ["food", "transport", "entertainment", "other"]
+    print("\nSelect category You want to filter by:")
+    for i, option in enumerate(category_options, 1):
+        print(f"[{i}] {option.capitalize()}")
+    while True:
+        try:
+            t_category_choice = int(input("Enter choice (1-4): "))
+            if 1 <= t_category_choice <= len(category_options):
+                t_category = category_options[t_category_choice - 1]
+                break
+            else:
+                print("❌ Invalid choice. Please select between 1 and 4.")
+        except ValueError:
+            print("❌ Please enter a number, not text.")
+    filtered = [t for t in transaction_list if t.category == t_category]
+    for t in filtered:
+        print(t)
+    sortOrnot = input("Do you want to sort the results? (y/n): ").strip().lower()
+    if sortOrnot == 'y' or sortOrnot == 'yes':
+        sort_transactions(filtered)
+
+@instrumented("filter.amount_range")
+def filter_transactions_by_amount_range(transaction_list):
+    """
+    Filter transactions by amount range.
+    
+    Args:
+        transaction_list: List of Transaction objects
+        min_amount: Minimum amount (float)
+        max_amount: Maximum amount (float)
+        
+    Returns:
+        List of Transaction objects within the amount range
+    """
+    while True:
+        try:
+            min_amount = float(input("Enter minimum amount: "))
+            max_amount = float(input("Enter maximum amount: "))
+            if min_amount < 0 or max_amount < 0:
+                print("❌ Amounts must be non-negative.")
+                continue
+            if min_amount > max_amount:
+                print("❌ Minimum cannot be greater than maximum.")
+                continue
+            break
+        except ValueError:
+            print("❌ Please enter valid numbers.")
+
+    min_cents, max_cents = to_cents(min_amount), to_cents(max_amount)
+    filtered = [t for t in transaction_list if min_cents <= t.amount_cents <= max_cents]
+    for t in filtered:
+        print(t)
+    sortOrnot = input("Do you want to sort the results? (y/n): ").strip().lower()
+    if sortOrnot == 'y' or sortOrnot == 'yes':
+        sort_transactions(filtered) 
+
+@instrumented("filter.sort")
+def sort_transactions(transaction_list):
+    """
+    Sort transactions by a specified field.
+    
+    Args:
+        transaction_list: List of Transaction objects
+        sort_by: Field to sort by ("date", "amount", "category")
+        descending: Whether to sort in descending order (bool)
+    """
+    valid_sort_fields = ["date", "amount", "category"]
+    print("\nSelect field You want to sort by:")
+    for i, option in enumerate(valid_sort_fields, 1):
+        print(f"[{i}] {option.capitalize()}")
+    while True:
+        try:
+            t_sort_choice = int(input("Enter choice (1-3): "))
+            if 1 <= t_sort_choice <= len(valid_sort_fields):
+                sort_by = valid_sort_fields[t_sort_choice - 1]
+                break
+            else:
+                print("❌ Invalid choice. Please select between 1 and 3.")
+        except ValueError:
+            print("❌ Please enter a number, not text.")
+
+    # Ask for sort order
+    while True:
+        order = input("Sort order (asc/desc): ").strip().lower()
+        if order in ["asc", "desc"]:
+            descending = (order == "desc")
+            break
+        print("❌ Invalid input. Please enter 'asc' or 'desc'.")
+
+    # Sort the transactions
+    key = {"amount": "amount_cents", "date": "date_ordinal"}.get(sort_by, sort_by)
+    sorted_list = sorted(transaction_list, key=lambda x: getattr(x, key), reverse=descending)
+    print(f"\n✅ Transactions sorted by {sort_by} in {'descending' if descending else 'ascending'} order.")
+    for t in sorted_list:
+        print(t)
+
+@instrumented("filter.date_range")
+def search_transactions_by_date_range(transaction_list):
+    """
+    Search transactions within a date range.
+    
+    Args:
+        transaction_list: List of Transaction objects
+        start_date: Start date (datetime.date)
+        end_date: End date (datetime.date)
+        
+    Returns:
+        List of Transaction objects within the date range
+    """
+    while True:
+        try:
+            start_input = input("Enter start date (YYYY-MM-DD): ").strip()
+            end_input = input("Enter end date (YYYY-MM-DD): ").strip()
+            start_date = datetime.datetime.strptime(start_input, "%Y-%m-%d").date()
+            end_date = datetime.datetime.strptime(end_input, "%Y-%m-%d").date()
+            if start_date > end_date:
+                print("❌ Start date cannot be after end date.")
+                continue
+            break
+        except ValueError:
+            print("❌ Invalid date format. Please try again.")
+
+    first, last = start_date.toordinal(), end_date.toordinal()
+    filtered = [t for t in transaction_list if first <= t.date_ordinal <= last]
+    for t in filtered:
+        print(t)
+    
+    sortOrnot = input("Do you want to sort the results? (y/n): ").strip().lower()
+    if sortOrnot == 'y' or sortOrnot == 'yes':
+        sort_transactions(filtered)
+
+@instrumented("report.dashboard_summary")
+def dashboard_summary(transaction_list, archived=None):
+    """
+    Display a summary dashboard of transactions.
+    
+    Args:
+        transaction_list: List of Transaction objects
+        archived: Totals of the archived months (archive.archived_totals()), included in the figures
+    """
+    # Sums are exact in integer cents; converted for display only
+    archived_count = archived["transactions"] if archived else 0
+    if not transaction_list and not archived_count:
+        print("\n" + "="*40)
+        print("📊 DASHBOARD SUMMARY")
+        print("="*40)
+        print("No transactions found.")
+        print("="*40 + "\n")
+        return
+    
+    income_cents = sum(t.amount_cents for t in transaction_list if t.type == "income")
+    expense_cents = sum(t.amount_cents for t in transaction_list if t.type == "expense")
+    if archived_count:
+        income_cents += archived["income_cents"]
+        expense_cents += archived["expense_cents"]
+    total_income = from_cents(income_cents)
+    total_expense = from_cents(expense_cents)
+    net_balance = from_cents(income_cents - expense_cents)
+
+    print("\n" + "="*40)
+    print("📊 DASHBOARD SUMMARY")
+    print("="*40)
+    print(f"Total Income : ${total_income:.2f}")
+    print(f"Total Expense: ${total_expense:.2f}")
+    print(f"Net Balance  : ${net_balance:.2f}")
+    if archived_count:
+        print(f"📦 Includes {archived_count} archived transaction(s)")
+    print("="*40 + "\n")
+
+@instrumented("report.monthly_report")
+def monthly_report(transaction_list, user=None, version=None):
+        """
+        Generate a monthly financial report with income, expenses, net balance, and most spent category.
+        
+        Archived months (see archive.py) are listed too; the archive of a
+        year is only read when one of its months is selected.
+        
+        Args:
+            transaction_list: List of Transaction objects
+            user: User object; with version, the report output is cached (see report_cache.py)
+            version: Version of the transaction file transaction_list was read from
+        """
+        archived = archived_months(user) if user is not None and has_archive(user) else {}
+        if not transaction_list and not archived:
+            print("❌ No transactions found. Cannot generate report.")
+            return
+        
+        # Step 1: Get all unique months from transactions
+        available_months = {}  # {(year, month): "display_string"}
+        current_date = datetime.datetime.now()
+        current_month = (current_date.year, current_date.month)
+        
+        for key in {trans.month_key for trans in transaction_list}:
+            year, month = month_of_key(key)
+            available_months[(year, month)] = datetime.datetime(year, month, 1).strftime("%B %Y")
+        
+        for year, month in archived:
+            available_months.setdefault((year, month), datetime.datetime(year, month, 1).strftime("%B %Y"))
+        
+        # Sort months chronologically (oldest to newest)
+        sorted_months = sorted(available_months.keys())
+        
+        if not sorted_months:
+            print("❌ No valid dates found in transactions.")
+            return
+        
+        # Step 2: Display menu with current month option
+        print("\n" + "="*60)
+        print("📅 MONTHLY REPORT - SELECT MONTH")
+        print("="*60)
+        
+        # Check if current month has transactions
+        if current_month in available_months:
+            print("[0] Current Month (Default) - " + available_months[current_month])
+            print("-" * 60)
+        
+        print("Available months:")
+        for i, month_key in enumerate(sorted_months, 1):
+            marker = " ← Current" if month_key == current_month else " 📦" if month_key in archived else ""
+            print(f"[{i}] {available_months[month_key]}{marker}")
+        
+        print("="*60)
+        
+        # Step 3: Get user choice
+        while True:
+            choice_input = input("👉 Select month (0 for current, or number): ").strip()
+            
+            # Default to current month if empty and current month exists
+            if not choice_input:
+                if current_month in available_months:
+                    selected_month = current_month
+                    break
+                else:
+                    print("❌ Current month has no transactions. Please select a valid month.")
+                    continue
+            
+            try:
+                choice = int(choice_input)
+                
+                # Option 0: Current month
+                if choice == 0:
+                    if current_month in available_months:
+                        selected_month = current_month
+                        break
+                    else:
+                        print("❌ No transactions in current month. Please select another.")
+                        continue
+                
+                # Option 1-N: Specific month
+                elif 1 <= choice <= len(sorted_months):
+                    selected_month = sorted_months[choice - 1]
+                    break
+                else:
+                    print(f"❌ Invalid choice. Please select between 0 and {len(sorted_months)}.")
+            except ValueError:
+                print("❌ Please enter a valid number.")
+        
+        # An archived month: load that part of the archive as well
+        if selected_month in archived:
+            transaction_list = with_archive(user, transaction_list, *month_bounds(*selected_month))
+            if version is not None:
+                version = [version, read_archive_index(user)[1]]
+        
+        # Step 4-8: Compute and display the report (from the cache while the data is unchanged)
+        month_display = available_months[selected_month]
+        if user is not None and version is not None:
+            show_cached(user, "monthly_report", list(selected_month), version,
+                        lambda: _render_monthly_report(transaction_list, selected_month, month_display))
+        else:
+            _render_monthly_report(transaction_list, selected_month, month_display)
+        
+        # Step 9: Ask if user wants to see detailed transactions
+        show_details = input("Would you like to see detailed transactions? (y/n): ").strip().lower()
+        if show_details == 'y' or show_details == 'yes':
+            selected_key = year_month_key(*selected_month)
+            monthly_transactions = [t for t in transaction_list if t.month_key == selected_key]
+            print("\n" + "="*70)
+            print(f"📋 DETAILED TRANSACTIONS - {month_display.upper()}")
+            print("="*70)
+            
+            # Group by type
+            income_trans = [t for t in monthly_transactions if t.type == "income"]
+            expense_trans = [t for t in monthly_transactions if t.type == "expense"]
+            
+            if income_trans:
+                print("\n💰 INCOME TRANSACTIONS:")
+                print("-"*70)
+                for trans in sorted(income_trans, key=lambda x: x.date_ordinal):
+                    print(f"   {trans.date} | ${trans.amount:>10,.2f} | {trans.category:<15} | {trans.description}")
+            
+            if expense_trans:
+                print("\n💸 EXPENSE TRANSACTIONS:")
+                print("-"*70)
+                for trans in sorted(expense_trans, key=lambda x: x.date_ordinal):
+                    print(f"   {trans.date} | ${trans.amount:>10,.2f} | {trans.category:<15} | {trans.description}")
+            
+            print("="*70 + "\n")        
+
+def _render_monthly_report(transaction_list, selected_month, month_display):
+    """
+    Print Steps 4-8 of monthly_report() for the selected month.
+
+    Args:
+        transaction_list: List of Transaction objects
+        selected_month: (year, month) tuple
+        month_display: Month name shown in the heading, e.g. "March 2025"
+    """
+    # Step 4: Filter transactions for selected month
+    selected_key = year_month_key(*selected_month)
+    monthly_transactions = [t for t in transaction_list if t.month_key == selected_key]
+
+    if not monthly_transactions:
+        print(f"❌ No transactions found for {month_display}.")
+        return
+
+    # Step 5: Calculate statistics (in cents, exact)
+    income_cents = sum(t.amount_cents for t in monthly_transactions if t.type == "income")
+    expense_cents = sum(t.amount_cents for t in monthly_transactions if t.type == "expense")
+    total_income = from_cents(income_cents)
+    total_expense = from_cents(expense_cents)
+    net_balance = from_cents(income_cents - expense_cents)
+
+    # Step 6: Find most spent category
+    category_spending = {}
+    for trans in monthly_transactions:
+        if trans.type == "expense":
+            if trans.category not in category_spending:
+                category_spending[trans.category] = 0
+            category_spending[trans.category] += trans.amount_cents
+    category_spending = {category: from_cents(cents) for category, cents in category_spending.items()}
+
+    most_spent_category = None
+    max_spent = 0
+    if category_spending:
+        most_spent_category = max(category_spending, key=category_spending.get)
+        max_spent = category_spending[most_spent_category]
+
+    # Step 7: Display the report
+    print("\n" + "="*70)
+    print(f"📊 MONTHLY REPORT - {month_display.upper()}")
+    print("="*70)
+    print(f"📅 Period: {month_display}")
+    print(f"📝 Total Transactions: {len(monthly_transactions)}")
+    print("-"*70)
+
+    print(f"\n💰 INCOME")
+    print(f"   Total Income:     ${total_income:>12,.2f}")
+
+    print(f"\n💸 EXPENSES")
+    print(f"   Total Expenses:   ${total_expense:>12,.2f}")
+
+    print(f"\n📈 NET BALANCE")
+    balance_symbol = "+" if net_balance >= 0 else ""
+    balance_indicator = "✅" if net_balance >= 0 else "⚠️"
+    print(f"   {balance_indicator} Net Balance:     {balance_symbol}${net_balance:>12,.2f}")
+
+    if most_spent_category:
+        print(f"\n🏆 MOST SPENT CATEGORY")
+        print(f"   Category: {most_spent_category.capitalize()}")
+        print(f"   Amount:   ${max_spent:>12,.2f}")
+        if total_expense > 0:
+            percentage = (max_spent / total_expense) * 100
+            print(f"   Percentage of total expenses: {percentage:.1f}%")
+    else:
+        print(f"\n🏆 MOST SPENT CATEGORY")
+        print(f"   No expenses recorded this month")
+
+    # Step 8: Category breakdown (optional, but useful)
+    if category_spending:
+        print(f"\n📊 EXPENSE BREAKDOWN BY CATEGORY")
+        print("-"*70)
+        # Sort categories by spending (highest first)
+        sorted_categories = sorted(category_spending.items(), key=lambda x: x[1], reverse=True)
+        for category, amount in sorted_categories:
+            percentage = (amount / total_expense) * 100 if total_expense > 0 else 0
+            bar_length = int(percentage / 5)  # 20 chars max (100% / 5)
+            bar = "█" * bar_length
+            print(f"   {category.capitalize():<15} ${amount:>10,.2f}  {percentage:>5.1f}% {bar}")
+
+    print("="*70 + "\n")
+
+@instrumented("report.category_breakdown")
+def category_breakdown(transaction_list, archived=None):
+    """
+    Display a breakdown of all transactions by category (all time).
+    Shows total income and expense breakdown by category.
+    
+    Args:
+        transaction_list: List of Transaction objects
+        archived: Summaries of the archived months to include (archive.archived_months())
+    """
+    if not transaction_list and not archived:
+        print("❌ No transactions found. Cannot generate breakdown.")
+        return
+    
+    # Step 1 + 2: Total income and expenses by category (in cents, archived months from their summaries)
+    income_cents, expense_cents_by_category = category_totals(transaction_list)
+    for summary in (archived or {}).values():
+        income_cents += summary["income_cents"]
+        for category, cents in summary["expense_cents_by_category"].items():
+            expense_cents_by_category[category] = expense_cents_by_category.get(category, 0) + cents
+    
+    # Step 3: Calculate totals
+    expense_cents = sum(expense_cents_by_category.values())
+    total_income = from_cents(income_cents)
+    total_expense = from_cents(expense_cents)
+    net_balance = from_cents(income_cents - expense_cents)
+    expense_by_category = {category: from_cents(cents) for category, cents in expense_cents_by_category.items()}
+    
+    # Step 4: Display the report
+    print("\n" + "="*70)
+    print("📊 CATEGORY BREAKDOWN - ALL TIME")
+    print("="*70)
+    if archived:
+        print(f"📦 Includes {len(archived)} archived month(s)")
+    
+    # Income section
+    print(f"\n💰 INCOME (All Categories)")
+    print(f"   Total Income:     ${total_income:>12,.2f}")
+    
+    # Expense section
+    print(f"\n💸 EXPENSES BY CATEGORY")
+    print("-"*70)
+    
+    if expense_by_category:
+        # Sort categories by amount (highest to lowest)
+        sorted_categories = sorted(expense_by_category.items(), 
+                                   key=lambda x: x[1], 
+                                   reverse=True)
+        
+        for category, amount in sorted_categories:
+            percentage = (amount / total_expense) * 100 if total_expense > 0 else 0
+            bar_length = int(percentage / 5)  # Visual bar (max 20 chars)
+            bar = "█" * bar_length
+            print(f"   {category.capitalize():<15} ${amount:>10,.2f}  {percentage:>5.1f}% {bar}")
+        
+        print("-"*70)
+        print(f"   {'TOTAL EXPENSES':<15} ${total_expense:>10,.2f}")
+    else:
+        print("   No expenses recorded.")
+    
+    # Net balance
+    print(f"\n📈 SUMMARY")
+    print("-"*70)
+    balance_symbol = "+" if net_balance >= 0 else ""
+    balance_indicator = "✅" if net_balance >= 0 else "⚠️"
+    print(f"   Total Income:     ${total_income:>12,.2f}")
+    print(f"   Total Expenses:   ${total_expense:>12,.2f}")
+    print(f"   {balance_indicator} Net Balance:     {balance_symbol}${net_balance:>12,.2f}")
+    
+    print("="*70 + "\n")
+
+def category_totals(transaction_list):
+    """
+    Sum income and expenses per category (the figures behind category_breakdown()).
+
+    Args:
+        transaction_list: List of Transaction objects
+
+    Returns:
+        tuple: (total income, {category: total expense}), in cents
+    """
+    total_income = 0
+    expense_by_category = {}
+    for trans in transaction_list:
+        if trans.type == "income":
+            total_income += trans.amount_cents
+        elif trans.type == "expense":
+            expense_by_category[trans.category] = expense_by_category.get(trans.category, 0) + trans.amount_cents
+    return total_income, expense_by_category
+
+@instrumented("report.monthly_budget")
+def show_monthly_budget(user):
+    """
+    Show this month's total expenses and compare them to a set budget.
+    """
+    transactions = read_transaction_file(user)
+    if not transactions:
+        print("❌ No transactions found.")
+        return
+
+    # Get current month and filter only expenses
+    today = datetime.date.today()
+    current_month = month_key_of(today)
+    monthly_expenses = [
+        t.amount_cents for t in transactions
+        if t.type == "expense" and t.month_key == current_month
+    ]
+    
+    total_spent = from_cents(sum(monthly_expenses))
+    
+    # Default budget limit
+    monthly_limit = user["monthly_budget_limit"]     
+    print("\n" + "="*50)
+    print("📅 MONTHLY BUDGET TRACKER")
+    print("="*50)
+    print(f"Month: {today.strftime('%Y-%m')}")
+    print(f"Total Spent: ${total_spent:.2f}")
+    print(f"Budget Limit: ${monthly_limit:.2f}")
+    remaining = monthly_limit - total_spent
+    if remaining >= 0:
+        print(f"✅ You have ${remaining:.2f} remaining this month.")
+    else:
+        print(f"⚠️ You are over budget by ${abs(remaining):.2f}!")
+    print("="*50 + "\n")
+
+    new_budget = input("Would you like to set a new budget limit? (y/n): ")
+    if new_budget.lower() == "y":
+        while True:
+            try:
+                monthly_limit = float(input("Enter new budget limit: $"))
+                user["monthly_budget_limit"]     = monthly_limit
+                print(f"✅ New budget limit set: ${monthly_limit:.2f}")
+                break
+            except ValueError:
+                print("❌ Invalid input. Please enter a valid number.")
+
+@instrumented("report.spending_trends")
+def spending_trends(transaction_list, archived=None):
+    """
+    Display spending trends across all months with visual representation.
+    Shows which months had the highest spending.
+    
+    Args:
+        transaction_list: List of Transaction objects
+        archived: Summaries of the archived months to include (archive.archived_months())
+    """
+    if not transaction_list and not archived:
+        print("❌ No transactions found. Cannot generate trends.")
+        return
+    
+    # Step 1: Group expenses by month in cents (archived months come from their summaries)
+    monthly_spending = monthly_spending_totals(transaction_list)  # {(year, month): total_spending}
+    for month_key, summary in (archived or {}).items():
+        spent = sum(summary["expense_cents_by_category"].values())
+        if spent:
+            monthly_spending[month_key] = monthly_spending.get(month_key, 0) + spent
+    monthly_spending = {month_key: from_cents(cents) for month_key, cents in monthly_spending.items()}
+    
+    if not monthly_spending:
+        print("❌ No expense transactions found.")
+        return
+    
+    # Step 2: Sort months chronologically
+    sorted_months = sorted(monthly_spending.keys())
+    
+    # Step 3: Find the maximum spending for scaling
+    max_spending = max(monthly_spending.values())
+    
+    # Step 4: Calculate average spending
+    avg_spending = sum(monthly_spending.values()) / len(monthly_spending)
+    
+    # Step 5: Display the trend report
+    print("\n" + "="*80)
+    print("📈 SPENDING TRENDS - ALL TIME")
+    print("="*80)
+    print(f"Months tracked: {len(sorted_months)}")
+    print(f"Average monthly spending: ${avg_spending:,.2f}")
+    print(f"Highest monthly spending: ${max_spending:,.2f}")
+    print("="*80)
+    
+    # Step 6: Display visual chart
+    print("\n📊 MONTHLY SPENDING CHART")
+    print("-"*80)
+    
+    for month_key in sorted_months:
+        year, month = month_key
+        amount = monthly_spending[month_key]
+        
+        # Format month name
+        month_name = datetime.datetime(year, month, 1).strftime("%b %Y")
+        
+        # Calculate bar length (scale to 50 characters max)
+        bar_length = int((amount / max_spending) * 50) if max_spending > 0 else 0
+        bar = "█" * bar_length
+        
+        # Indicator if above/below average
+        indicator = "🔥" if amount > avg_spending else "  "
+        
+        # Display the bar chart
+        print(f"{month_name:<12} {indicator} ${amount:>10,.2f} {bar}")
+    
+    print("-"*80)
+    print("🔥 = Above average spending")
+    print("="*80)
+    
+    # Step 7: Find highest and lowest spending months
+    highest_month = max(monthly_spending, key=monthly_spending.get)
+    lowest_month = min(monthly_spending, key=monthly_spending.get)
+    
+    highest_name = datetime.datetime(highest_month[0], highest_month[1], 1).strftime("%B %Y")
+    lowest_name = datetime.datetime(lowest_month[0], lowest_month[1], 1).strftime("%B %Y")
+    
+    print(f"\n🏆 HIGHEST SPENDING MONTH")
+    print(f"   {highest_name}: ${monthly_spending[highest_month]:,.2f}")
+    
+    print(f"\n💚 LOWEST SPENDING MONTH")
+    print(f"   {lowest_name}: ${monthly_spending[lowest_month]:,.2f}")
+    
+    # Step 8: Calculate trend (spending increasing or decreasing?)
+    if len(sorted_months) >= 2:
+        first_month_spending = monthly_spending[sorted_months[0]]
+        last_month_spending = monthly_spending[sorted_months[-1]]
+        
+        difference = last_month_spending - first_month_spending
+        percentage_change = (difference / first_month_spending * 100) if first_month_spending > 0 else 0
+        
+        print(f"\n📉 TREND ANALYSIS")
+        if difference > 0:
+            print(f"   ⬆️ Spending has INCREASED by ${difference:,.2f} ({percentage_change:+.1f}%)")
+            print(f"   From ${first_month_spending:,.2f} ({sorted_months[0][0]}-{sorted_months[0][1]:02d}) to ${last_month_spending:,.2f} ({sorted_months[-1][0]}-{sorted_months[-1][1]:02d})")
+        elif difference < 0:
+            print(f"   ⬇️ Spending has DECREASED by ${abs(difference):,.2f} ({percentage_change:.1f}%)")
+            print(f"   From ${first_month_spending:,.2f} ({sorted_months[0][0]}-{sorted_months[0][1]:02d}) to ${last_month_spending:,.2f} ({sorted_months[-1][0]}-{sorted_months[-1][1]:02d})")
+        else:
+            print(f"   ➡️ Spending has remained STABLE")
+    
+    print("="*80 + "\n")
+
+def monthly_spending_totals(transaction_list, by_category=False):
+    """
+    Sum expenses per calendar month (the figures behind spending_trends()).
+
+    Args:
+        transaction_list: List of Transaction objects
+        by_category: Also split every month by category
+
+    Returns:
+        dict: {(year, month): total}, or {(year, month): {category: total}} with by_category, in cents
+    """
+    monthly_spending = {}  # Bucketed by month key, see dates.py
+    for trans in transaction_list:
+        if trans.type == "expense":
+            if by_category:
+                categories = monthly_spending.setdefault(trans.month_key, {})
+                categories[trans.category] = categories.get(trans.category, 0) + trans.amount_cents
+            else:
+                monthly_spending[trans.month_key] = monthly_spending.get(trans.month_key, 0) + trans.amount_cents
+    return {month_of_key(key): total for key, total in monthly_spending.items()}
+
+def summarize_transactions(transaction_list, month=None):
+    """
+    Compute the figures shown by the reports, without printing or prompting.
+
+    Args:
+        transaction_list: List of Transaction objects
+        month: Optional "YYYY-MM" to limit the summary to one month
+
+    Returns:
+        dict: {"month", "transactions", "income", "expenses", "net",
+               "expenses_by_category", "top_category"}
+    """
+    income = 0
+    expenses = 0
+    count = 0
+    by_category = {}
+    selected_key = parse_month_key(month) if month else None
+
+    for t in transaction_list:
+        if month and t.month_key != selected_key:
+            continue
+        count += 1
+        if t.type == "income":
+            income += t.amount_cents
+        elif t.type == "expense":
+            expenses += t.amount_cents
+            by_category[t.category] = by_category.get(t.category, 0) + t.amount_cents
+
+    by_category = {c: from_cents(a) for c, a in sorted(by_category.items(), key=lambda item: item[1], reverse=True)}
+    return {
+        "month": month,
+        "transactions": count,
+        "income": from_cents(income),
+        "expenses": from_cents(expenses),
+        "net": from_cents(income - expenses),
+        "expenses_by_category": by_category,
+        "top_category": next(iter(by_category), None),
+    }
+
+def create_backup_transaction_file(user):
+    """
+    Create a backup of the user's transaction file.
+    
+    Args:
+        user: User object
+    """
+    original_file = transaction_file_path(user)
+    backup_file = os.path.join('data', 'transactions', f'transactions_{user["name"]}_{user["id"]}_backup.json')
+
+    try:
+        if os.path.exists(original_file):
+            with locked(original_file, shared=True):
+                shutil.copyfile(original_file, backup_file)
+            print(f"✅ Backup created: {backup_file}")
+        else:
+            print(f"⚠️ No transaction file found to backup.")
+    except Exception as e:
+        print(f"❌ Failed to create backup: {e}")
+
+# =============================================================Main Menu=================================================================
+
+def Transaction_Manager(current_user):
+    """
+    Main transaction management loop for the user.
+    """
+    # The recurring manager builds on this module, so it is imported here
+    # rather than at the top to keep the import graph one-directional
+    from .recurring_transactions_manager import recurring_transactions_menu, check_recurring_transactions
+    from .forecast import cash_flow_forecast_menu
+
+    finish_interrupted_archive(current_user)
+    verify_ledger(current_user, read_transaction_file(current_user))
+    while True:
+        transaction_list = read_transaction_file(current_user)  # Ensure file exists before operations
+        dashboard_summary(transaction_list, archived_totals(current_user))
+        check_recurring_transactions(current_user)
+        show_menu()
+        choice = input().strip()
+        # Ensure file exists before operations; the version keys the report cache
+        transaction_list, data_version = read_transaction_file(current_user, with_version=True)
+        if choice == '1':
+            # Code to add income/expense
+            new_transaction = create_transaction(current_user)
+            add_transaction(current_user, new_transaction)
+
+        elif choice == '2':
+            # Code to view all transactions
+            for t in transaction_list:
+                print(t)
+
+        elif choice == '3':
+            # Code to edit a transaction
+            transaction_id = input("Enter Transaction ID to edit: ").strip()
+            edit_transaction(current_user, transaction_id)
+            
+        elif choice == '4':
+            # Code to delete a transaction
+            transaction_id = input("Enter Transaction ID to delete: ").strip()
+            delete_transaction(current_user, transaction_id)
+
+        elif choice == '5':
+            search_transactions_by_date_range(transaction_list)
+            # Code to search transactions by date range
+
+        elif choice == '6':
+            filter_transactions_by_category(transaction_list)
+            # Code to filter transactions by category
+
+        elif choice == '7':
+            filter_transactions_by_amount_range(transaction_list)
+            # Code to filter transactions by amount range
+            
+        elif choice == '8':
+            sort_transactions(transaction_list)
+            # Code to sort transaction results
+        
+        elif choice == '9':
+            show_monthly_budget(current_user)
+            # Code to track monthly budget
+        
+        elif choice == '10':
+            monthly_report(transaction_list, current_user, data_version)
+            # Code to generate monthly reports
+
+        elif choice == '11':
+            if has_archive(current_user):
+                archive_version = read_archive_index(current_user)[1]
+                show_cached(current_user, "category_breakdown", "archived", [data_version, archive_version],
+                            lambda: category_breakdown(transaction_list, archived_months(current_user)))
+            else:
+                show_cached(current_user, "category_breakdown", None, data_version,
+                            lambda: category_breakdown(transaction_list))
+            # Code to generate category breakdown
+        
+        elif choice == '12':
+            include_archive = has_archive(current_user) and input(
+                "Include archived months? (y/n): ").strip().lower() in ("y", "yes")
+            if include_archive:
+                archive_version = read_archive_index(current_user)[1]
+                show_cached(current_user, "spending_trends", "archived", [data_version, archive_version],
+                            lambda: spending_trends(transaction_list, archived_months(current_user)))
+            else:
+                show_cached(current_user, "spending_trends", None, data_version,
+                            lambda: spending_trends(transaction_list))
+            # Code to analyze spending trends
+            show_forecast = input("Would you like to see the projected cash flow? (y/n): ").strip().lower()
+            if show_forecast == 'y' or show_forecast == 'yes':
+                cash_flow_forecast_menu(current_user, transaction_list)
+
+        elif choice == '13':
+            recurring_transactions_menu(current_user)
+            # Code to add recuring transactions
+        
+        elif choice == "14":
+            export_transactions_menu(current_user)
+            # Code to export transactions to CSV
+
+        elif choice == "15":
+            print("[1] Merge with existing transactions")
+            print("[2] Replace all transactions")
+            print("[3] Import bank statement(s) with a column profile")
+            import_mode = input("Enter choice (1-3): ").strip()
+            if import_mode == "2":
+                import_transactions_from_csv(current_user)
+            elif import_mode == "3":
+                from .statement_importer import statement_import_menu
+                statement_import_menu(current_user)
+            else:
+                import_transactions_from_csv_streaming(current_user)
+            # Code to import transactions from CSV
+
+        elif choice == "16":
+            cash_flow_forecast_menu(current_user, transaction_list)
+            # Code to project future balances from recurring transactions
+
+        elif choice == "17":
+            dump_metrics()
+            # Code to show timings recorded with PFM_METRICS=1
+            
+        elif choice == '0':
+            print("Returning to main menu!")
+            # Flush this session's logged changes into the main files
+            checkpoint(block=False)
+            return
+        else:
+            print("Invalid choice. Please try again.")
\ No newline at end of file
@@ -2,36 +2,111 @@ import json
 import os
 import hashlib
 import re
+from collections.abc import MutableMapping
+from .paths import PROJECT_DIR
+from .user_registry import User_Registry
+from .metrics import instrumented
+
+
+class Lazy_User_Records(MutableMapping):
+    """
+    Dictionary-like view of the user registry.
+
+    A user's record is only read from the registry the first time it is
+    accessed (e.g. on login) and then kept in memory. flush() writes back
+    just the records that changed since they were loaded.
+    """
+
+    def __init__(self, registry):
+        self.registry = registry
+        self._records = {}
+        self._snapshots = {}
+
+    def __getitem__(self, username):
+        if username not in self._records:
+            record = self.registry.get_user(username)
+            if record is None:
+                raise KeyError(username)
+            self._records[username] = record
+            self._snapshots[username] = json.dumps(record, sort_keys=True)
+        return self._records[username]
+
+    def __setitem__(self, username, record):
+        self._records[username] = record
+        self._snapshots.pop(username, None)
+
+    def add(self, username, record):
+        """
+        Register a new user (a plain insert, never an overwrite).
+
+        Returns:
+            bool: True if added, False if the username is already taken
+        """
+        if not self.registry.add_user(username, record):
+            return False
+        self._records[username] = record
+        self._snapshots[username] = json.dumps(record, sort_keys=True)
+        return True
+
+    def __delitem__(self, username):
+        self._records.pop(username, None)
+        self._snapshots.pop(username, None)
+        if not self.registry.delete_user(username):
+            raise KeyError(username)
+
+    def __contains__(self, username):
+        return username in self._records or self.registry.exists(username)
+
+    def __iter__(self):
+        return self.registry.usernames()
+
+    def __len__(self):
+        return self.registry.count()
+
+    def flush(self):
+        """
+        Save every loaded record that changed. Returns the number written.
+
+        Only existing users are updated; new users go through add(), so a
+        session never overwrites a user another session registered meanwhile.
+        """
+        written = 0
+        for username, record in self._records.items():
+            snapshot = json.dumps(record, sort_keys=True)
+            if self._snapshots.get(username) != snapshot:
+                if not self.registry.update_user(username, record):
+                    print(f"⚠️ User '{username}' no longer exists; changes were not saved.")
+                    continue
+                self._snapshots[username] = json.dumps(record, sort_keys=True)
+                written += 1
+        return written
+
 
 class User_Manager:
     USERS_FILE = "users.json"
 
-    def __init__(self):
-        self.BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+    def __init__(self, registry=None):
+        self.BASE_DIR = PROJECT_DIR
         self.USERS_FILE = os.path.join(self.BASE_DIR, 'data', 'users.json')
+        self.registry = registry or User_Registry(legacy_file=self.USERS_FILE)
         self.users = self.load_users()
 
+    @instrumented("User_Manager.load_users")
     def load_users(self):
-        """Load users from the JSON file."""
-        if not os.path.exists(self.USERS_FILE):
-            return {}
-        with open(self.USERS_FILE, 'r') as file:
-            return json.load(file)
+        """Open a lazy view of the registered users (records load on first access)."""
+        return Lazy_User_Records(self.registry)
 
+    @instrumented("User_Manager.save_users")
     def save_users(self):
-        """Save users to the JSON file."""
-        os.makedirs(os.path.dirname(self.USERS_FILE), exist_ok=True)
-        with open(self.USERS_FILE, 'w') as file:
-            json.dump(self.users, file, indent=4)
+        """Save the users whose records changed."""
+        self.users.flush()
 
     def hash_password(self, password):
         """Hash a password for storing."""
         return hashlib.sha256(password.encode()).hexdigest()
 
-    def register_user(self):
-        """Add a new user interactively."""
-
-        # === Username Validation ===
+    def ask_username(self):
+        """Prompt until a valid username that is not taken yet is entered."""
         while True:
             username = input("Enter your username: ").strip()
             if not username:
@@ -43,7 +118,13 @@ class User_Manager:
             elif username in self.users:
                 print("⚠️ Username already exists.")
             else:
-                break
+                return username
+
+    def register_user(self):
+        """Add a new user interactively."""
+
+        # === Username Validation ===
+        username = self.ask_username()
 
         # === Password Validation ===
         while True:
@@ -74,11 +155,9 @@ class User_Manager:
 
         hashed_pw = self.hash_password(password)
 
-        existing_ids = [user.get("id", 0) for user in self.users.values()]
-        new_id = max(existing_ids) + 1 if existing_ids else 1
+        new_id = self.registry.allocate_id()
 
-        # ✅ Update the class attribute directly
-        self.users[username] = {
+        record = {
             "id": new_id,
             "name": username,
             "password": hashed_pw,
@@ -87,10 +166,12 @@ class User_Manager:
             "number_of_transactions": 0,
             "monthly_budget_limit": 1000.0,
         }
-        
 
-        # ✅ Save updated users
-        self.save_users()
+        # ✅ Insert the new user; another session may have taken the name since the check above
+        while not self.users.add(username, record):
+            print("⚠️ Username already exists.")
+            username = self.ask_username()
+            record["name"] = username
         print(f"✅ User '{username}' registered successfully!\nYour user ID is {new_id}.")
 
     def login_user(self):
@@ -124,7 +205,7 @@ class User_Manager:
         """Update the user's balance and save changes."""
         if username in self.users:
             self.users[username]['balance'] = new_balance
-            self.save_users()
+            self.registry.change_user(username, lambda record: record.update(balance=new_balance))
             print("✅ Balance updated successfully.")
         else:
             print("⚠️ User not found.")
@@ -163,55 +244,3 @@ class User_Manager:
 
         if percent >= 100:
             print("🏆 Congratulations! You've reached your savings goal!")
-
-    
-
-
-def banner():
-    banner = r"""
-    /$$      /$$           /$$                                                  
-    | $$  /$ | $$          | $$                                                  
-    | $$ /$$$| $$  /$$$$$$ | $$  /$$$$$$$  /$$$$$$  /$$$$$$/$$$$   /$$$$$$       
-    | $$/$$ $$ $$ /$$__  $$| $$ /$$_____/ /$$__  $$| $$_  $$_  $$ /$$__  $$      
-    | $$$$_  $$$$| $$$$$$$$| $$| $$      | $$  \ $$| $$ \ $$ \ $$| $$$$$$$$      
-    | $$$/ \  $$$| $$_____/| $$| $$      | $$  | $$| $$ | $$ | $$| $$_____/      
-    | $$/   \  $$|  $$$$$$$| $$|  $$$$$$$|  $$$$$$/| $$ | $$ | $$|  $$$$$$$      
-    |__/     \__/ \_______/|__/ \_______/ \______/ |__/ |__/ |__/ \_______/      
-                                                                                
-                                                                                
-                                                                                
-    /$$                     /$$     /$$                                       
-    | $$                    |  $$   /$$/                                       
-    /$$$$$$    /$$$$$$        \  $$ /$$//$$$$$$  /$$   /$$  /$$$$$$             
-    |_  $$_/   /$$__  $$        \  $$$$//$$__  $$| $$  | $$ /$$__  $$            
-    | $$    | $$  \ $$         \  $$/| $$  \ $$| $$  | $$| $$  \__/            
-    | $$ /$$| $$  | $$          | $$ | $$  | $$| $$  | $$| $$                  
-    |  $$$$/|  $$$$$$/          | $$ |  $$$$$$/|  $$$$$$/| $$                  
-    \___/   \______/           |__/  \______/  \______/ |__/                  
-                                                                                
-                                                                                
-                                                                                
-    /$$$$$$$$ /$$                                                               
-    | $$_____/|__/                                                               
-    | $$       /$$ /$$$$$$$   /$$$$$$  /$$$$$$$   /$$$$$$$  /$$$$$$              
-    | $$$$$   | $$| $$__  $$ |____  $$| $$__  $$ /$$_____/ /$$__  $$             
-    | $$__/   | $$| $$  \ $$  /$$$$$$$| $$  \ $$| $$      | $$$$$$$$             
-    | $$      | $$| $$  | $$ /$$__  $$| $$  | $$| $$      | $$_____/             
-    | $$      | $$| $$  | $$|  $$$$$$$| $$  | $$|  $$$$$$$|  $$$$$$$             
-    |__/      |__/|__/  |__/ \_______/|__/  |__/ \_______/ \_______/             
-                                                                                
-                                                                                
-                                                                                
-    /$$      /$$                                                                
-    | $$$    /$$$                                                                
-    | $$$$  /$$$$  /$$$$$$  /$$$$$$$   /$$$$$$   /$$$$$$   /$$$$$$               
-    | $$ $$/$$ $$ |____  $$| $$__  $$ /$$__  $$ /$$__  $$ /$$__  $$              
-    | $$  $$$| $$  /$$$$$$$| $$  \ $$| $$  \ $$| $$$$$$$$| $$  \__/              
-    | $$\  $ | $$ /$$__  $$| $$  | $$| $$  | $$| $$_____/| $$                    
-    | $$ \/  | $$|  $$$$$$$| $$  | $$|  $$$$$$$|  $$$$$$$| $$                    
-    |__/     |__/ \_______/|__/  |__/ \____  $$ \_______/|__/                    
-                                    /$$  \ $$                                  
-                                    |  $$$$$$/                                  
-                                    \______/                                   
-                                    """
-    print(banner)
\ No newline at end of file
@@ -0,0 +1,215 @@
+import json # For JSON data storage
+import os # For file operations
+import sqlite3 # For the indexed user table
+from .paths import PROJECT_DIR
+from .file_lock import read_json
+from .write_ahead_log import log_change
+
+
+# Running totals kept by ledger.py; whole-record updates leave them as stored
+LEDGER_FIELDS = ("balance", "total_income", "total_expense", "ledger_verified_at")
+
+
+class User_Registry:
+    """
+    Indexed user storage backed by a SQLite table.
+
+    Each user is one row keyed by username (with a unique index on the id),
+    so looking up, adding or updating a user touches only that user's row.
+    New ids come from a persisted counter instead of scanning every user.
+    On first use the legacy data/users.json file is imported once.
+    Every change to a record is logged in the write-ahead log first.
+
+    With shared=True the connection may be used from several threads; the
+    caller must then make sure only one thread uses it at a time.
+    """
+
+    def __init__(self, db_file=None, legacy_file=None, shared=False):
+        self.DB_FILE = db_file or os.path.join(PROJECT_DIR, 'data', 'users.db')
+        self.LEGACY_FILE = legacy_file or os.path.join(os.path.dirname(self.DB_FILE), 'users.json')
+
+        os.makedirs(os.path.dirname(self.DB_FILE), exist_ok=True)
+        self.connection = sqlite3.connect(self.DB_FILE, check_same_thread=not shared)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+        self._migrate_legacy_file()
+
+    def _create_tables(self):
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS users ("
+                " name TEXT PRIMARY KEY,"
+                " id INTEGER NOT NULL UNIQUE,"
+                " record TEXT NOT NULL)"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            self.connection.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('next_id', 1)")
+            self.connection.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('migrated', 0)")
+
+    def _migrate_legacy_file(self):
+        """Import users.json into the table the first time the registry is opened."""
+        migrated = self.connection.execute("SELECT value FROM meta WHERE key = 'migrated'").fetchone()[0]
+        if migrated:
+            return
+
+        legacy_users = {}
+        if os.path.exists(self.LEGACY_FILE):
+            try:
+                legacy_users, _ = read_json(self.LEGACY_FILE, default={})
+            except json.JSONDecodeError:
+                print("⚠️ Warning: users.json is corrupted and was not imported.")
+
+        with self.connection:
+            existing_ids = [r["id"] for r in legacy_users.values() if isinstance(r.get("id"), int)]
+            next_id = max(existing_ids) + 1 if existing_ids else 1
+            rows = []
+            for username, record in legacy_users.items():
+                record = dict(record)
+                record.setdefault("name", username)
+                if not isinstance(record.get("id"), int):
+                    # Old records without an id get a fresh one
+                    record["id"] = next_id
+                    next_id += 1
+                rows.append((username, record["id"], json.dumps(record)))
+
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO users (name, id, record) VALUES (?, ?, ?)", rows
+            )
+            self.connection.execute(
+                "UPDATE meta SET value = MAX(value, ?) WHERE key = 'next_id'", (next_id,)
+            )
+            self.connection.execute("UPDATE meta SET value = 1 WHERE key = 'migrated'")
+
+    def allocate_id(self):
+        """Reserve and return the next user id (O(1), safe across processes)."""
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            new_id = self.connection.execute("SELECT value FROM meta WHERE key = 'next_id'").fetchone()[0]
+            self.connection.execute("UPDATE meta SET value = ? WHERE key = 'next_id'", (new_id + 1,))
+        return new_id
+
+    def exists(self, username):
+        """Return True if a user with this username is registered."""
+        row = self.connection.execute("SELECT 1 FROM users WHERE name = ?", (username,)).fetchone()
+        return row is not None
+
+    def get_user(self, username):
+        """
+        Load a single user record.
+
+        Args:
+            username: Name of the user
+
+        Returns:
+            dict: The user record, or None if the user does not exist
+        """
+        row = self.connection.execute("SELECT record FROM users WHERE name = ?", (username,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def add_user(self, username, record):
+        """
+        Insert a new user record.
+
+        Returns:
+            bool: True if inserted, False if the username is already taken
+        """
+        try:
+            with log_change("user.add", self.DB_FILE, name=username, record=record), self.connection:
+                self.connection.execute(
+                    "INSERT INTO users (name, id, record) VALUES (?, ?, ?)",
+                    (username, record["id"], json.dumps(record)),
+                )
+            return True
+        except sqlite3.IntegrityError:
+            return False
+
+    def save_user(self, username, record):
+        """Write back a single (existing or new) user record."""
+        with log_change("user.put", self.DB_FILE, name=username, record=record), self.connection:
+            self.connection.execute(
+                "INSERT INTO users (name, id, record) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET id = excluded.id, record = excluded.record",
+                (username, record["id"], json.dumps(record)),
+            )
+
+    def change_user(self, username, change):
+        """
+        Read, change and write back one record inside a single write transaction.
+
+        BEGIN IMMEDIATE makes other connections (and processes) wait until
+        the new record is committed, so a change made in between is never
+        overwritten with an older copy.
+
+        Args:
+            username: Name of the user
+            change: Function that edits the stored record (a dict) in place
+
+        Returns:
+            dict: The record as written, or None if the user does not exist
+        """
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.connection.execute("SELECT record FROM users WHERE name = ?", (username,)).fetchone()
+            if row is None:
+                self.connection.rollback()
+                return None
+            record = json.loads(row[0])
+            change(record)
+            with log_change("user.update", self.DB_FILE, name=username, record=record):
+                self.connection.execute(
+                    "UPDATE users SET id = ?, record = ? WHERE name = ?",
+                    (record["id"], json.dumps(record), username),
+                )
+                self.connection.commit()
+            return record
+        except BaseException:
+            self.connection.rollback()
+            raise
+
+    def update_user(self, username, record):
+        """
+        Overwrite the record of an existing user.
+
+        The running totals (LEDGER_FIELDS) are kept as stored and copied into
+        record: they change only through ledger.py, so a session's older copy
+        cannot undo another session's update.
+
+        Returns:
+            bool: True if the user existed and was updated
+        """
+        def replace(stored):
+            totals = {key: stored[key] for key in LEDGER_FIELDS if key in stored}
+            stored.clear()
+            stored.update(record, **totals)
+
+        stored = self.change_user(username, replace)
+        if stored is None:
+            return False
+        record.update({key: stored[key] for key in LEDGER_FIELDS if key in stored})
+        return True
+
+    def delete_user(self, username):
+        """Remove a user record. Returns True if a row was deleted."""
+        with log_change("user.delete", self.DB_FILE, name=username), self.connection:
+            cursor = self.connection.execute("DELETE FROM users WHERE name = ?", (username,))
+        return cursor.rowcount > 0
+
+    def usernames(self):
+        """Yield every registered username without loading the records."""
+        for (name,) in self.connection.execute("SELECT name FROM users ORDER BY name"):
+            yield name
+
+    def iter_users(self):
+        """Yield (username, record) for every user, one row at a time."""
+        for name, record in self.connection.execute("SELECT name, record FROM users ORDER BY name"):
+            yield name, json.loads(record)
+
+    def count(self):
+        """Return the number of registered users."""
+        return self.connection.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def close(self):
+        self.connection.close()
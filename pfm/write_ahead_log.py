@@ -0,0 +1,509 @@
+"""
+Write-ahead log for every change to the transactions, recurring items and user records.
+
+Before a change is written to a data file it is described in
+data/wal/pfm.wal and the log is fsynced; only then is the main file
+updated. If the process dies half-way, recover() (run on start-up) finds
+the changes that were logged but never marked as finished and finishes
+them, so a change is either fully in the main files or not at all.
+
+Records are JSON lines with a CRC, appended with O_APPEND:
+    transaction.add / transaction.put / transaction.delete  (redo: upsert or remove by transaction_id)
+    transaction.replace                                     (redo: the whole file, e.g. a replacing CSV import)
+    recurring.add / recurring.put / recurring.delete        (same, keyed on the transaction's id)
+    user.add / user.put / user.update / user.delete         (redo on the SQLite user registry)
+    append                                                  (undo: where append_json_array() started)
+    done / abort                                            (the change with id "of" finished / failed)
+
+Group commit: threads that log at the same time share one write and one
+fsync; whoever finds no flush running writes everything queued so far.
+
+Checkpoint: when the log is over WAL_CHECKPOINT_BYTES (and on logout or
+start-up) the unfinished changes of crashed writers are finished, the
+main files are flushed to disk and the log is emptied. Writers hold a
+shared lock on the log while a change is in flight and the checkpoint
+takes it exclusively, so it never sees a change that is still running.
+
+Fault injection (tools/fault_inject_wal.py): PFM_WAL_FAULTS="logged:0.1,appended:0.1"
+kills the process with SIGKILL at those points with the given probability.
+"""
+import contextlib # For lock context managers
+import json # For JSON data storage
+import os # For file operations
+import random
+import signal
+import sqlite3
+import threading
+import zlib # For the record checksums
+
+from .file_lock import lock_path, read_json, write_json, append_json_array, restore_json_array
+
+try:
+    import fcntl # Advisory locks (POSIX only)
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+WAL_FILE = os.path.join('data', 'wal', 'pfm.wal')
+WAL_CHECKPOINT_BYTES = 1024 * 1024
+
+_commit_lock = threading.Condition()
+_queue = []             # Encoded records waiting for the next flush
+_queued = 0             # Records ever queued by this process
+_flushed = 0            # Records known to be on disk
+_failed = 0             # Records up to here were lost by a failed flush
+_flushing = False
+_log = {"fd": None, "path": None}
+_stats = {"records": 0, "flushes": 0}
+_replaying = threading.local()  # Set while recover() replays, so the replay is not logged again
+
+_faults = {}
+for _fault in filter(None, os.environ.get("PFM_WAL_FAULTS", "").split(",")):
+    _name, _, _probability = _fault.partition(":")
+    _faults[_name.strip()] = float(_probability or 1)
+
+
+def fault_point(name):
+    """Kill the process here if PFM_WAL_FAULTS asks for it (fault-injection tests only)."""
+    if name in _faults and random.random() < _faults[name]:
+        os.kill(os.getpid(), signal.SIGKILL)
+
+
+def _after_fork():
+    global _commit_lock, _queue, _flushing
+    _commit_lock = threading.Condition()
+    _queue = []
+    _flushing = False
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+# =============================================================Log file=================================================================
+
+def _encode(record):
+    payload = json.dumps(record, separators=(",", ":"))
+    return f"{zlib.crc32(payload.encode('utf-8')):08x} {payload}\n".encode("utf-8")
+
+
+def _log_fd():
+    """Return this process's append-only handle on the log (reopened if the working folder changed)."""
+    path = os.path.abspath(WAL_FILE)
+    if _log["path"] != path:
+        if _log["fd"] is not None:
+            os.close(_log["fd"])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _log["fd"] = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        _log["path"] = path
+    return _log["fd"]
+
+
+def _write_all(fd, data):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _commit(records, sync=True):
+    """
+    Append records to the log; with sync=True wait until they are on disk.
+
+    The first thread to find no flush running becomes the leader: it
+    writes every queued record with one write() and one fsync() while the
+    others wait, so concurrent changes share the cost of the fsync.
+    """
+    global _queued, _flushed, _failed, _flushing
+    lines = [_encode(record) for record in records]
+    with _commit_lock:
+        _stats["records"] += len(lines)
+        if not sync:
+            _write_all(_log_fd(), b"\n" + b"".join(lines))
+            return
+
+        _queue.extend(lines)
+        _queued += len(lines)
+        ticket = _queued
+        while _flushed < ticket:
+            if _flushing:
+                _commit_lock.wait()
+                continue
+
+            # The leading newline ends a line torn by a writer that died mid-write
+            batch, target = b"\n" + b"".join(_queue), _queued
+            _queue.clear()
+            _flushing = True
+            _commit_lock.release()
+            try:
+                fd = _log_fd()
+                _write_all(fd, batch)
+                os.fsync(fd)
+            except BaseException:
+                _commit_lock.acquire()
+                _failed = target
+                raise
+            else:
+                _commit_lock.acquire()
+                _stats["flushes"] += 1
+            finally:
+                _flushing = False
+                _flushed = max(_flushed, target)
+                _commit_lock.notify_all()
+
+        if ticket <= _failed:
+            raise OSError("the write-ahead log could not be written")
+
+
+def _read_log():
+    """Return every intact record in the log (a torn or corrupted line is skipped)."""
+    records = []
+    try:
+        with open(WAL_FILE, "rb") as file:
+            for line in file:
+                checksum, _, payload = line.rstrip(b"\n").partition(b" ")
+                try:
+                    if int(checksum, 16) == zlib.crc32(payload):
+                        records.append(json.loads(payload))
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def log_stats():
+    """Return how many records were logged and how many fsyncs that took (this process)."""
+    return dict(_stats)
+
+
+# =============================================================Changes=================================================================
+
+class Logged_Change:
+    """
+    A change that is in the log but not yet finished.
+
+    Use it as a context manager around the write to the main file: leaving
+    the block marks the change as done, an exception marks it as aborted.
+    Call cancel() when the write fails without an exception.
+    """
+
+    def __init__(self, record, lock_file):
+        self.record = record
+        self._lock_file = lock_file
+
+    def _release(self):
+        if self._lock_file is not None:
+            self._lock_file.close()  # Closing the file releases the shared lock
+            self._lock_file = None
+            _maybe_checkpoint()
+
+    def finish(self, sync=False):
+        """Mark the change as written to the main file."""
+        if self._lock_file is not None:
+            fault_point("applied")
+            _commit([{"op": "done", "of": self.record["id"]}], sync=sync)
+        self._release()
+
+    def cancel(self):
+        """Mark the change as not made, so recover() never replays it."""
+        if self._lock_file is not None:
+            _commit([{"op": "abort", "of": self.record["id"]}])
+        self._release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.finish()
+        else:
+            self.cancel()
+
+
+class _Unlogged_Change(Logged_Change):
+    """Stands in for Logged_Change while recover() replays the log."""
+
+    def __init__(self):
+        super().__init__(None, None)
+
+
+def log_change(op, path, **fields):
+    """
+    Log a change before it is made, and wait until the record is on disk.
+
+    Args:
+        op: Record type (e.g. "transaction.add")
+        path: Data file (or user registry database) being changed
+        **fields: What recover() needs to redo the change (records, ids, name, ...)
+
+    Returns:
+        Logged_Change: Finish it once the main file is written
+    """
+    if getattr(_replaying, "active", False):
+        return _Unlogged_Change()
+
+    record = dict(fields, id=os.urandom(8).hex(), op=op, path=path)
+    os.makedirs(os.path.dirname(WAL_FILE), exist_ok=True)
+    lock_file = open(lock_path(WAL_FILE), "a+")
+    try:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_SH)
+        _commit([record])
+    except BaseException:
+        lock_file.close()
+        raise
+    fault_point("logged")
+    return Logged_Change(record, lock_file)
+
+
+def logged_append(path, items):
+    """
+    append_json_array() that recover() can undo if the process dies during the append.
+
+    Before the file is touched, its size and the bytes the append will
+    overwrite (the closing bracket) are logged; recover() cuts an
+    unfinished append back to exactly that.
+
+    Returns:
+        int: The new version number
+    """
+    changes = []
+
+    def journal(size, tail):
+        changes.append(log_change("append", path, size=size, tail=tail.decode("utf-8")))
+        fault_point("append")
+
+    try:
+        version = append_json_array(path, items, journal=journal)
+    except BaseException:
+        for change in changes:
+            change.cancel()
+        raise
+    fault_point("appended")
+    for change in changes:
+        change.finish(sync=True)  # Otherwise a crash right after could undo a finished import
+    return version
+
+
+# =============================================================Recovery=================================================================
+
+def _record_key(op, record):
+    if op.startswith("recurring."):
+        return record["transaction"]["transaction_id"]
+    return record["transaction_id"]
+
+
+def _change_keys(record):
+    if record["op"].startswith("user."):
+        return {record["name"]}
+    if "ids" in record:
+        return set(record["ids"])
+    return {_record_key(record["op"], r) for r in record.get("records", [])}
+
+
+def _redo_file(path, changes):
+    """Redo transaction/recurring changes on one JSON file; return how many were applied."""
+    data, _ = read_json(path, default=[])
+    data = data or []
+    applied = 0
+    for record, skip in changes:
+        op = record["op"]
+        kind = op.split(".", 1)[1]
+        if kind == "add":
+            present = {_record_key(op, item) for item in data}
+            new = [r for r in record["records"]
+                   if _record_key(op, r) not in present and _record_key(op, r) not in skip]
+            data.extend(new)
+            applied += bool(new)
+        elif kind == "put":
+            replacements = {_record_key(op, r): r for r in record["records"] if _record_key(op, r) not in skip}
+            for position, item in enumerate(data):
+                key = _record_key(op, item)
+                if key in replacements and item != replacements[key]:
+                    data[position] = replacements[key]
+                    applied += 1
+        elif kind == "delete":
+            ids = set(record["ids"]) - skip
+            kept = [item for item in data if _record_key(op, item) not in ids]
+            applied += len(kept) != len(data)
+            data = kept
+        elif kind == "replace":
+            if data != record["records"]:
+                data = list(record["records"])
+                applied += 1
+    if applied:
+        write_json(path, data)
+    return applied
+
+
+def _redo_users(db_file, changes):
+    """Redo user record changes on one registry database; return how many were applied."""
+    from .user_registry import User_Registry
+
+    registry = User_Registry(db_file)
+    applied = 0
+    try:
+        for record, skip in changes:
+            name = record["name"]
+            if name in skip:
+                continue
+            current = registry.get_user(name)
+            if record["op"] == "user.delete":
+                applied += registry.delete_user(name)
+            elif record["op"] == "user.add":
+                if current is None:
+                    applied += registry.add_user(name, record["record"])
+            elif current != record["record"] and (current is not None or record["op"] == "user.put"):
+                registry.save_user(name, record["record"])
+                applied += 1
+    finally:
+        registry.close()
+    return applied
+
+
+def _finish_crashed(records):
+    """
+    Finish the changes of writers that died before marking them done.
+
+    Unfinished appends are cut back (newest first); the other changes are
+    redone in log order. A change is not redone for an id that a later,
+    finished change already wrote, so a stale change never overwrites it.
+
+    Returns:
+        dict: {"replayed", "undone", "skipped", "errors"}
+    """
+    finished = {r["of"] for r in records if r["op"] in ("done", "abort")}
+    aborted = {r["of"] for r in records if r["op"] == "abort"}
+    result = {"replayed": 0, "undone": 0, "skipped": 0, "errors": []}
+
+    # Walk backwards so every unfinished change knows the ids written after it
+    later = {}
+    by_path = {}
+    for record in reversed(records):
+        if record["op"] in ("done", "abort") or record["id"] in aborted:
+            continue
+        keys = _change_keys(record) if record["op"] != "append" else set()
+        if record["id"] in finished:
+            later.setdefault(record["path"], set()).update(keys)
+            continue
+        if record["op"] == "append":
+            if record["path"] in later:
+                result["skipped"] += 1  # The file was written since; cutting it back would lose that
+            elif restore_json_array(record["path"], record["size"], record["tail"].encode("utf-8")):
+                result["undone"] += 1
+            continue
+        if record["op"].endswith(".replace") and record["path"] in later:
+            result["skipped"] += 1  # The file was written since; replacing it would lose that
+            continue
+        skip = keys & later.get(record["path"], set())
+        result["skipped"] += bool(skip)
+        by_path.setdefault(record["path"], []).insert(0, (record, skip))
+
+    for path, changes in by_path.items():
+        try:
+            if changes[0][0]["op"].startswith("user."):
+                result["replayed"] += _redo_users(path, changes)
+            else:
+                result["replayed"] += _redo_file(path, changes)
+        except (OSError, ValueError, KeyError, sqlite3.Error) as e:
+            result["errors"].append(f"{path}: {type(e).__name__}: {e}")
+    return result
+
+
+def _sync_main_files(records):
+    """Flush what the logged changes wrote: the folders of the renamed files and the registry databases."""
+    folders = set()
+    databases = set()
+    for record in records:
+        if record["op"].startswith("user."):
+            databases.add(record["path"])
+        elif "path" in record:
+            folders.add(os.path.dirname(record["path"]) or ".")
+
+    for folder in folders:
+        with contextlib.suppress(OSError):
+            fd = os.open(folder, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+    for db_file in databases:
+        with contextlib.suppress(sqlite3.Error):
+            connection = sqlite3.connect(db_file)
+            try:
+                connection.execute("PRAGMA wal_checkpoint(FULL)")
+            finally:
+                connection.close()
+
+
+@contextlib.contextmanager
+def _exclusive(block=True):
+    """Hold the log's lock exclusively (no change in flight); yields False if busy and block is False."""
+    os.makedirs(os.path.dirname(WAL_FILE), exist_ok=True)
+    with open(lock_path(WAL_FILE), "a+") as lock_file:
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | (0 if block else fcntl.LOCK_NB))
+            except BlockingIOError:
+                yield False
+                return
+        yield True
+
+
+def checkpoint(block=True):
+    """
+    Move everything in the log into the main files and empty the log.
+
+    Args:
+        block: Wait for changes in flight; with False give up if there are any
+
+    Returns:
+        dict: Result of finishing crashed changes (plus "records"), or None if skipped
+    """
+    if not os.path.exists(WAL_FILE):
+        return {"records": 0, "replayed": 0, "undone": 0, "skipped": 0, "errors": []}
+
+    with _exclusive(block) as acquired:
+        if not acquired:
+            return None
+        records = _read_log()
+        _replaying.active = True
+        try:
+            result = _finish_crashed(records)
+        finally:
+            _replaying.active = False
+        _sync_main_files(records)
+        if result["errors"]:
+            return dict(result, records=len(records))  # Keep the log for the next attempt
+
+        fault_point("checkpoint")
+        with open(WAL_FILE, "r+b") as file:
+            file.truncate(0)
+            os.fsync(file.fileno())
+        return dict(result, records=len(records))
+
+
+def _maybe_checkpoint():
+    fd = _log["fd"]
+    if fd is not None and os.fstat(fd).st_size > WAL_CHECKPOINT_BYTES:
+        checkpoint(block=False)
+
+
+def recover():
+    """
+    Finish whatever a crashed session left in the log (run on start-up).
+
+    Returns:
+        dict: {"records", "replayed", "undone", "skipped", "errors"}
+    """
+    if not os.path.exists(WAL_FILE) or os.path.getsize(WAL_FILE) == 0:
+        return {"records": 0, "replayed": 0, "undone": 0, "skipped": 0, "errors": []}
+
+    result = checkpoint()
+    if result["replayed"]:
+        print(f"🛟 Recovered {result['replayed']} unfinished change(s) from the write-ahead log.")
+    if result["undone"]:
+        print(f"🛟 Rolled back {result['undone']} interrupted import batch(es).")
+    for error in result["errors"]:
+        print(f"⚠️ Could not recover {error}")
+    return result
@@ -0,0 +1,124 @@
+"""
+Show how much the async storage layer keeps the event loop responsive.
+
+One "large" user's transaction file is saved over and over while several
+small users' files are read concurrently and a ticker measures how late
+the event loop wakes up. The same run is done with the blocking functions
+called directly from the coroutines, and with pfm/async_storage.py.
+
+Usage (from the project root):
+    python tools/bench_async_storage.py --large 200000 --small-users 8 --duration 5
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synthetic_data  # noqa: E402
+
+
+async def ticker(stop, lags, interval=0.001):
+    """Record how late every 1 ms sleep wakes up (the time the loop was blocked)."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lags.append(loop.time() - start - interval)
+
+
+async def run(large_user, large_transactions, small_users, duration, use_async):
+    from pfm import async_storage
+    from pfm.transaction_manager import read_transaction_file, save_transactions_to_file
+
+    async def save_large():
+        if use_async:
+            await async_storage.save_transactions_to_file_async(large_user, large_transactions)
+        else:
+            save_transactions_to_file(large_user, large_transactions)
+
+    async def read_small(user):
+        if use_async:
+            await async_storage.read_transaction_file_async(user)
+        else:
+            read_transaction_file(user)
+
+    stop = asyncio.Event()
+    lags = []
+    read_latencies = []
+    saves = 0
+
+    async def writer():
+        nonlocal saves
+        while not stop.is_set():
+            await save_large()
+            saves += 1
+            await asyncio.sleep(0)  # The blocking version never yields otherwise
+
+    async def reader(user):
+        while not stop.is_set():
+            start = time.perf_counter()
+            await read_small(user)
+            read_latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(0.005)
+
+    tasks = [asyncio.create_task(ticker(stop, lags)), asyncio.create_task(writer())]
+    tasks += [asyncio.create_task(reader(user)) for user in small_users]
+    await asyncio.sleep(duration)
+    stop.set()
+    await asyncio.gather(*tasks)
+    return {
+        "saves": saves,
+        "reads": len(read_latencies),
+        "read_p50_ms": statistics.median(read_latencies) * 1000 if read_latencies else 0.0,
+        "read_max_ms": max(read_latencies, default=0.0) * 1000,
+        "lag_p99_ms": sorted(lags)[int(len(lags) * 0.99)] * 1000 if lags else 0.0,
+        "lag_max_ms": max(lags, default=0.0) * 1000,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Event-loop stalls with blocking vs async storage.")
+    parser.add_argument("--large", type=int, default=200000, help="transactions of the user being saved")
+    parser.add_argument("--small", type=int, default=500, help="transactions of each reading user")
+    parser.add_argument("--small-users", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        from pfm.paths import transaction_file_path
+
+        users = synthetic_data.populate(users=1 + args.small_users, transactions=args.small, recurring=10)
+        large_user, small_users = users[0], users[1:]
+        synthetic_data.write_json_array(transaction_file_path(large_user),
+                                        synthetic_data.iter_transactions(large_user, args.large))
+
+        from pfm.transaction_manager import read_transaction_file
+        large_transactions = read_transaction_file(large_user)
+
+        print("=" * 78)
+        print(f"⏱️ 1 user saving {args.large:,} transactions, {args.small_users} users reading {args.small:,} each")
+        print("=" * 78)
+        print(f"{'mode':<10} {'saves':>6} {'reads':>7} {'read p50':>10} {'read max':>10} {'loop p99':>10} {'loop max':>10}")
+        print("-" * 78)
+        for mode in ("blocking", "async"):
+            with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+                result = asyncio.run(run(large_user, large_transactions, small_users, args.duration, mode == "async"))
+            print(f"{mode:<10} {result['saves']:>6} {result['reads']:>7} {result['read_p50_ms']:>8.1f}ms "
+                  f"{result['read_max_ms']:>8.1f}ms {result['lag_p99_ms']:>8.1f}ms {result['lag_max_ms']:>8.1f}ms")
+        print("=" * 78)
+        print("loop = how late a 1 ms timer fired, i.e. how long other users' requests had to wait.")
+        os.chdir(PROJECT_DIR)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
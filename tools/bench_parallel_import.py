@@ -0,0 +1,92 @@
+"""
+Benchmark the CSV importers on a generated statement file.
+
+Compares the original import_transactions_from_csv() (serial, whole file
+in memory) with the streaming importer and the parallel importer.
+
+Usage (from the project root):
+    python tools/bench_parallel_import.py --rows 500000 --workers 4
+"""
+import argparse
+import contextlib
+import csv
+import datetime
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+FIELDNAMES = ["transaction_id", "type", "user_id", "amount", "date", "category", "description", "payment_method"]
+
+
+def generate_csv(filename, rows, user, seed=42):
+    rng = random.Random(seed)
+    first_day = datetime.date(2015, 1, 1).toordinal()
+    with open(filename, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(FIELDNAMES)
+        for n in range(rows):
+            writer.writerow([
+                f"{user['name']}{n + 1}",
+                "income" if rng.random() < 0.2 else "expense",
+                user["id"],
+                round(rng.uniform(1, 500), 2),
+                datetime.date.fromordinal(first_day + rng.randrange(3650)).isoformat(),
+                rng.choice(["food", "transport", "entertainment", "other"]),
+                f"Statement line {n + 1}",
+                rng.choice(["cash", "credit", "debit", "other"]),
+            ])
+
+
+def timed(label, function, *args, **kwargs):
+    from pfm.transaction_manager import transaction_file_path
+    from pfm.transaction_index import index_file_path
+
+    user = args[0]
+    for path in (transaction_file_path(user), index_file_path(user)):
+        if os.path.exists(path):
+            os.remove(path)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        function(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    return label, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark serial, streaming and parallel CSV import.")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        from pfm.transaction_manager import import_transactions_from_csv, import_transactions_from_csv_streaming
+        from pfm.parallel_import import import_transactions_from_csv_parallel
+
+        user = {"name": "BenchUser", "id": 0, "number_of_transactions": 0}
+        filename = f"{user['name']}_transactions.csv"
+        generate_csv(filename, args.rows, user)
+        size_mb = os.path.getsize(filename) / 1e6
+        print(f"📄 {args.rows:,} rows, {size_mb:.1f} MB, {args.workers} worker(s)")
+
+        results = [
+            timed("serial (import_transactions_from_csv)", import_transactions_from_csv, user),
+            timed("streaming", import_transactions_from_csv_streaming, user),
+            timed("parallel", import_transactions_from_csv_parallel, user, workers=args.workers),
+        ]
+
+    baseline = results[0][1]
+    print("-" * 70)
+    for label, elapsed in results:
+        print(f"{label:<40} {elapsed:>8.2f}s {args.rows / elapsed:>10,.0f} rows/s  x{baseline / elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Startup benchmark: how long until the first menu is on screen.
+
+Runs `python main.py` with "3" (Exit) as input several times and reports
+the median wall time, then lists what each pfm module costs to import
+according to `python -X importtime`. Exits with status 1 when the median is over the
+budget, so it can run in CI.
+
+Usage (from the project root):
+    python tools/bench_startup.py
+    python tools/bench_startup.py --runs 20 --budget 40
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Wall time budget for `python main.py` to reach the menu and exit, interpreter start included
+STARTUP_BUDGET_MS = 50
+
+
+def time_startup(runs):
+    """Return the wall time of each run of `python main.py` (choosing Exit) in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "main.py"], cwd=PROJECT_DIR, input="3\n", text=True,
+                       stdout=subprocess.DEVNULL, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def import_times(module):
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Returns:
+        list: (module name, self microseconds, cumulative microseconds) for every module imported.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=PROJECT_DIR,
+                            capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        # Format: "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure startup time against a budget.")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_MS, help="budget in milliseconds")
+    args = parser.parse_args(argv)
+
+    timings = time_startup(args.runs)
+    # The same interpreter start without the application, to show what the app itself adds
+    interpreter = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        interpreter.append((time.perf_counter() - start) * 1000)
+
+    median = statistics.median(timings)
+    print("=" * 70)
+    print("🚀 STARTUP TIME")
+    print("=" * 70)
+    print(f"python main.py (menu + exit) : {median:8.1f} ms median of {args.runs} (min {min(timings):.1f} ms)")
+    print(f"python -c pass               : {statistics.median(interpreter):8.1f} ms")
+    print(f"budget                       : {args.budget:8.1f} ms")
+
+    for module in ("pfm.app", "pfm.transaction_manager"):
+        rows = import_times(module)
+        total = next((cumulative for name, _, cumulative in rows if name == module), 0)
+        print("-" * 70)
+        print(f"import {module}: {total / 1000:.1f} ms cumulative")
+        for name, self_us, cumulative_us in sorted(rows, key=lambda row: row[2], reverse=True):
+            if not name.startswith("pfm"):
+                continue
+            print(f"  {name:<40} self {self_us / 1000:7.2f} ms   cumulative {cumulative_us / 1000:7.2f} ms")
+    print("=" * 70)
+
+    if median > args.budget:
+        print(f"❌ Startup is over budget by {median - args.budget:.1f} ms")
+        return 1
+    print("✅ Startup is within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,349 @@
+"""
+Benchmark suite for storage, reports and import/export.
+
+Every benchmark runs against deterministic synthetic data (see
+synthetic_data.py) in a scratch directory, at each requested size. Time is
+the best of --repeat runs; peak memory is measured in a separate run with
+tracemalloc (which slows code down, so it never affects the timings).
+Results are saved as JSON so two commits can be compared.
+
+Usage (from the project root):
+    python tools/benchmark_suite.py --sizes 1000,10000,100000 --output bench.json
+    python tools/benchmark_suite.py --sizes 10000 --only report --compare bench.json
+"""
+import argparse
+import builtins
+import contextlib
+import datetime
+import itertools
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synthetic_data  # noqa: E402
+
+
+@contextlib.contextmanager
+def scripted_input(answers):
+    """Answer input() prompts from a fixed list (repeated as often as needed)."""
+    replies = itertools.cycle(answers or [""])
+    original = builtins.input
+    builtins.input = lambda prompt="": next(replies)
+    try:
+        yield
+    finally:
+        builtins.input = original
+
+
+class Context:
+    """Data shared by the benchmarks of one size."""
+
+    def __init__(self, size, user, pristine_dir):
+        self.size = size
+        self.user = user
+        self.pristine_dir = pristine_dir
+        self.transactions = None  # Loaded once for the filter/report benchmarks
+
+    def restore(self):
+        """Put the generated data files back (for benchmarks that modify them)."""
+        shutil.rmtree("data", ignore_errors=True)
+        shutil.copytree(self.pristine_dir, "data")
+        for name in os.listdir("."):
+            if name.endswith(".csv") or name.endswith(".csv.gz"):
+                os.remove(name)
+
+    def export_csv(self):
+        from pfm.transaction_manager import export_transactions_to_csv
+        export_transactions_to_csv(self.user)
+
+
+# =============================================================Benchmarks=================================================================
+
+def bench_read(ctx):
+    from pfm.transaction_manager import read_transaction_file
+    read_transaction_file(ctx.user)
+
+
+def bench_save(ctx):
+    from pfm.transaction_manager import save_transactions_to_file
+    save_transactions_to_file(ctx.user, ctx.transactions)
+
+
+def bench_add(ctx):
+    from pfm.transaction_manager import Transaction, add_transaction
+    add_transaction(ctx.user, Transaction("", "expense", ctx.user["id"], 12.5, datetime.date(2025, 6, 30),
+                                          "food", "bench", "cash"))
+
+
+def bench_filter_category(ctx):
+    from pfm.transaction_manager import filter_transactions_by_category
+    filter_transactions_by_category(ctx.transactions)
+
+
+def bench_filter_amount(ctx):
+    from pfm.transaction_manager import filter_transactions_by_amount_range
+    filter_transactions_by_amount_range(ctx.transactions)
+
+
+def bench_search_dates(ctx):
+    from pfm.transaction_manager import search_transactions_by_date_range
+    search_transactions_by_date_range(ctx.transactions)
+
+
+def bench_sort(ctx):
+    from pfm.transaction_manager import sort_transactions
+    sort_transactions(list(ctx.transactions))
+
+
+def bench_dashboard(ctx):
+    from pfm.transaction_manager import dashboard_summary
+    dashboard_summary(ctx.transactions)
+
+
+def bench_monthly_report(ctx):
+    from pfm.transaction_manager import monthly_report
+    monthly_report(ctx.transactions)
+
+
+def bench_category_breakdown(ctx):
+    from pfm.transaction_manager import category_breakdown
+    category_breakdown(ctx.transactions)
+
+
+def bench_spending_trends(ctx):
+    from pfm.transaction_manager import spending_trends
+    spending_trends(ctx.transactions)
+
+
+def bench_monthly_budget(ctx):
+    from pfm.transaction_manager import show_monthly_budget
+    show_monthly_budget(ctx.user)
+
+
+def bench_forecast(ctx):
+    from pfm.forecast import forecast_cash_flow
+    from pfm.recurring_transactions_manager import read_recurring_transaction_file
+    forecast_cash_flow(ctx.transactions, read_recurring_transaction_file(ctx.user))
+
+
+def bench_export_streaming(ctx):
+    from pfm.transaction_manager import export_transactions_to_csv_streaming
+    export_transactions_to_csv_streaming(ctx.user)
+
+
+def bench_import(ctx):
+    from pfm.transaction_manager import import_transactions_from_csv
+    import_transactions_from_csv(ctx.user)
+
+
+def bench_import_streaming(ctx):
+    from pfm.transaction_manager import import_transactions_from_csv_streaming
+    import_transactions_from_csv_streaming(ctx.user)
+
+
+def bench_apply_recurring(ctx):
+    from pfm.recurring_transactions_manager import apply_recurring_transactions
+    apply_recurring_transactions(ctx.user)
+
+
+def setup_import(ctx):
+    ctx.restore()
+    ctx.export_csv()
+
+
+def setup_import_into_empty(ctx):
+    from pfm.transaction_manager import transaction_file_path
+    setup_import(ctx)
+    os.remove(transaction_file_path(ctx.user))
+
+
+def setup_restore(ctx):
+    ctx.restore()
+
+
+# name -> (function(ctx), setup(ctx) run untimed before each repetition, answers for input())
+BENCHMARKS = {
+    "read_transaction_file": (bench_read, None, None),
+    "save_transactions_to_file": (bench_save, None, None),
+    "add_transaction": (bench_add, None, None),
+    "filter_by_category": (bench_filter_category, None, ["1", "n"]),
+    "filter_by_amount_range": (bench_filter_amount, None, ["10", "200", "n"]),
+    "search_by_date_range": (bench_search_dates, None, ["2024-01-01", "2024-12-31", "n"]),
+    "sort_transactions": (bench_sort, None, ["1", "asc"]),
+    "dashboard_summary": (bench_dashboard, None, None),
+    "report_monthly": (bench_monthly_report, None, ["1", "n"]),
+    "report_category_breakdown": (bench_category_breakdown, None, None),
+    "report_spending_trends": (bench_spending_trends, None, None),
+    "report_monthly_budget": (bench_monthly_budget, None, ["n"]),
+    "report_cash_flow_forecast": (bench_forecast, None, None),
+    "export_csv": (lambda ctx: ctx.export_csv(), None, None),
+    "export_csv_streaming": (bench_export_streaming, None, None),
+    "import_csv": (bench_import, setup_import, None),
+    "import_csv_streaming": (bench_import_streaming, setup_import_into_empty, None),
+    "apply_recurring_transactions": (bench_apply_recurring, setup_restore, None),
+}
+
+# Benchmarks that leave the data as it was; the others restore it afterwards
+READ_ONLY = {"read_transaction_file", "filter_by_category", "filter_by_amount_range", "search_by_date_range",
+             "sort_transactions", "dashboard_summary", "report_monthly", "report_category_breakdown",
+             "report_spending_trends", "report_monthly_budget", "report_cash_flow_forecast",
+             "export_csv", "export_csv_streaming"}
+
+
+def run_once(function, ctx, answers, trace_memory):
+    """Run one benchmark once with its output discarded; return (seconds, peak bytes or None)."""
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink), scripted_input(answers):
+        if trace_memory:
+            tracemalloc.start()
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            function(ctx)
+        finally:
+            elapsed = time.perf_counter() - start
+            peak = None
+            if trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+    return elapsed, peak
+
+
+def run_size(size, names, repeat, memory, seed):
+    """Generate data of the given size and run the selected benchmarks on it."""
+    from pfm import ledger
+    from pfm.transaction_manager import read_transaction_file
+    from pfm.user_registry import User_Registry
+
+    user = synthetic_data.populate(users=1, transactions=size, recurring=max(10, size // 1000), seed=seed)[0]
+    pristine_dir = os.path.abspath(os.path.join("..", f"pristine_{size}"))
+    shutil.copytree("data", pristine_dir)
+    # Ledger updates go to the scratch registry, not the project's users.db
+    ledger._registry = User_Registry(db_file=os.path.abspath(os.path.join("data", "users.db")))
+
+    ctx = Context(size, user, pristine_dir)
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        ctx.transactions = read_transaction_file(user)
+
+    results = []
+    for name in names:
+        function, setup, answers = BENCHMARKS[name]
+        timings = []
+        for _ in range(repeat):
+            if setup:
+                with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+                    setup(ctx)
+            timings.append(run_once(function, ctx, answers, trace_memory=False)[0])
+
+        peak = None
+        if memory:
+            if setup:
+                with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+                    setup(ctx)
+            peak = run_once(function, ctx, answers, trace_memory=True)[1]
+
+        if name not in READ_ONLY:
+            ledger._registry.close()
+            ctx.restore()
+            ledger._registry = User_Registry(db_file=os.path.abspath(os.path.join("data", "users.db")))
+
+        result = {"benchmark": name, "size": size, "seconds": min(timings), "peak_bytes": peak}
+        results.append(result)
+        print_result(result)
+
+    ledger._registry.close()
+    ledger._registry = None
+    shutil.rmtree(pristine_dir, ignore_errors=True)
+    return results
+
+
+def print_result(result, baseline=None):
+    peak = f"{result['peak_bytes'] / 1e6:>9.1f} MB" if result["peak_bytes"] is not None else " " * 12
+    line = f"{result['benchmark']:<28} {result['size']:>10,} {result['seconds'] * 1000:>11.2f} ms {peak}"
+    if baseline:
+        line += f"   x{baseline['seconds'] / result['seconds']:.2f} vs baseline" if result["seconds"] else ""
+    print(line)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_file):
+    """Print each result next to the same benchmark/size from an earlier run."""
+    with open(baseline_file, "r") as file:
+        baseline = json.load(file)
+    previous = {(r["benchmark"], r["size"]): r for r in baseline["results"]}
+    print("\n" + "=" * 80)
+    print(f"📊 Compared with {baseline_file} (commit {baseline.get('commit')})")
+    print("=" * 80)
+    for result in results:
+        print_result(result, previous.get((result["benchmark"], result["size"])))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark suite on synthetic data.")
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="Comma-separated transaction counts, e.g. 1000,100000,10000000")
+    parser.add_argument("--only", default=None, help="Run only benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Save the results to this JSON file")
+    parser.add_argument("--compare", default=None, help="Earlier results file to compare with")
+    parser.add_argument("--list", action="store_true", help="List the benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+
+    names = [name for name in BENCHMARKS if not args.only or args.only in name]
+    sizes = [int(float(size)) for size in args.sizes.split(",") if size.strip()]
+    output = os.path.abspath(args.output) if args.output else None
+    baseline = os.path.abspath(args.compare) if args.compare else None
+
+    print(f"{'benchmark':<28} {'size':>10} {'time':>14} {'peak memory':>12}")
+    print("-" * 70)
+    results = []
+    with tempfile.TemporaryDirectory() as scratch:
+        for size in sizes:
+            work_dir = os.path.join(scratch, f"run_{size}")
+            os.makedirs(work_dir)
+            os.chdir(work_dir)
+            results.extend(run_size(size, names, args.repeat, not args.no_memory, args.seed))
+            os.chdir(scratch)
+
+    report = {
+        "commit": git_commit(),
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if output:
+        with open(output, "w") as file:
+            json.dump(report, file, indent=4)
+        print(f"\n✅ Results saved to {output}")
+    if baseline:
+        compare(results, baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,275 @@
+"""
+Fault-injection test for the write-ahead log (pfm/write_ahead_log.py).
+
+Every round starts a writer process that keeps adding, deleting and
+importing transactions and applying recurring bills for a few users, and
+kills it at a random point: either from inside (PFM_WAL_FAULTS makes it
+SIGKILL itself right after logging a change, after writing the main file,
+before or after an import's append, or during a checkpoint) or from outside with SIGKILL
+after a random delay. Then recover() runs and the files are checked:
+
+    - every data file is valid JSON without duplicate transaction ids
+    - every change the writer saw succeed is there (adds, deletes, imports)
+    - every change that was committed to the log is there, even if the
+      writer died before writing the main file
+    - an import batch is either completely there or not at all
+    - the log is empty after recovery
+
+The state carries over from round to round, like a real installation.
+
+Usage (from the project root):
+    python tools/fault_inject_wal.py --rounds 100 --seed 1
+"""
+import argparse
+import csv
+import datetime
+import io
+import contextlib
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synthetic_data  # noqa: E402
+
+FAULT_POINTS = ["logged", "applied", "append", "appended", "checkpoint"]
+ACK_FILE = "acks.log"
+
+
+# =============================================================Writer=================================================================
+
+def ack(file, *fields):
+    """Record an event of the writer durably (the checker trusts nothing that is not in here)."""
+    file.write(" ".join(str(f) for f in fields) + "\n")
+    file.flush()
+    os.fsync(file.fileno())
+
+
+def writer(round_number, seed, operations):
+    """Run random changes until killed (or done); called in the child process."""
+    from pfm import ledger, write_ahead_log
+    from pfm.models import Transaction
+    from pfm.transaction_manager import (add_transaction, delete_transaction, read_transaction_file,
+                                         import_transactions_from_csv_streaming)
+    from pfm.recurring_transactions_manager import apply_recurring_transactions
+    from pfm.user_registry import User_Registry
+
+    write_ahead_log.WAL_CHECKPOINT_BYTES = 16 * 1024  # Checkpoint often, so the checkpoint gets killed too
+    rng = random.Random(seed)
+    registry = User_Registry(os.path.abspath(os.path.join("data", "users.db")))
+    ledger._registry = registry
+    users = [registry.get_user(name) for name in registry.usernames()]
+
+    with open(ACK_FILE, "a") as acks, contextlib.redirect_stdout(io.StringIO()):
+        for n in range(operations):
+            user = rng.choice(users)
+            roll = rng.random()
+            if roll < 0.55:
+                transaction_id = f"r{round_number}-{n}"
+                transaction = Transaction(transaction_id, rng.choice(["income", "expense"]), user["id"],
+                                          round(rng.uniform(1, 500), 2), datetime.date(2025, rng.randint(1, 12), 1),
+                                          rng.choice(["food", "rent", "fun"]), "fault test", "cash")
+                ack(acks, "begin", "add", user["name"], transaction_id)
+                add_transaction(user, transaction)
+                ack(acks, "ok", "add", user["name"], transaction_id)
+            elif roll < 0.75:
+                stored = read_transaction_file(user)
+                if not stored:
+                    continue
+                transaction_id = rng.choice(stored).transaction_id
+                ack(acks, "begin", "delete", user["name"], transaction_id)
+                delete_transaction(user, transaction_id)
+                ack(acks, "ok", "delete", user["name"], transaction_id)
+            elif roll < 0.95:
+                prefix = f"r{round_number}-imp{n}-"
+                rows = rng.randint(50, 500)
+                filename = f"import_{round_number}_{n}.csv"
+                with open(filename, "w", newline="") as file:
+                    out = csv.writer(file)
+                    out.writerow(["transaction_id", "type", "amount", "date", "category", "description"])
+                    for i in range(rows):
+                        out.writerow([f"{prefix}{i}", "expense", "9.99", "2024-06-01", "import", "x" * 40])
+                ack(acks, "begin", "import", user["name"], prefix, rows)
+                import_transactions_from_csv_streaming(user, filename, chunk_size=rows)
+                ack(acks, "ok", "import", user["name"], prefix, rows)
+                os.remove(filename)
+            else:
+                ack(acks, "begin", "apply", user["name"])
+                apply_recurring_transactions(user)
+                ack(acks, "ok", "apply", user["name"])
+
+
+# =============================================================Checker=================================================================
+
+def committed_changes():
+    """Return the changes in the log that were committed and not aborted (read before recovery)."""
+    from pfm.write_ahead_log import _read_log
+
+    records = _read_log()
+    aborted = {r["of"] for r in records if r["op"] == "abort"}
+    return [r for r in records if r["op"].startswith("transaction.") and r["id"] not in aborted]
+
+
+def check(users, acks_before, committed):
+    """Return a list of invariant violations after recovery."""
+    from pfm.paths import transaction_file_path, recurring_transaction_file_path
+    from pfm.write_ahead_log import WAL_FILE
+
+    problems = []
+    stored = {}
+    for user in users:
+        for path in (transaction_file_path(user), recurring_transaction_file_path(user)):
+            try:
+                with open(path) as file:
+                    records = json.load(file)
+            except FileNotFoundError:
+                records = []
+            except ValueError as e:
+                problems.append(f"{path} is not valid JSON: {e}")
+                continue
+            ids = [r["transaction"]["transaction_id"] if "transaction" in r else r["transaction_id"] for r in records]
+            if len(ids) != len(set(ids)):
+                problems.append(f"{path} has duplicate ids")
+            if path == transaction_file_path(user):
+                stored[user["name"]] = set(ids)
+
+    # Replay the acknowledgements in order: what should (not) be stored now
+    expected_present = {}
+    expected_absent = {}
+    imports = []
+    deleted = {}  # Ids a delete was started for (the rows of an import may be deleted later)
+    for line in acks_before:
+        fields = line.split()
+        if fields[0] == "begin" and fields[1] == "import":
+            imports.append(fields[2:] + [False])
+        if fields[0] == "begin" and fields[1] == "delete":
+            deleted.setdefault(fields[2], set()).add(fields[3])
+        if fields[0] != "ok":
+            continue
+        kind, name = fields[1], fields[2]
+        if kind == "add":
+            expected_present.setdefault(name, set()).add(fields[3])
+            expected_absent.setdefault(name, set()).discard(fields[3])
+        elif kind == "delete":
+            expected_absent.setdefault(name, set()).add(fields[3])
+            expected_present.setdefault(name, set()).discard(fields[3])
+        elif kind == "import":
+            imports[-1][-1] = True
+
+    for name, ids in expected_present.items():
+        for transaction_id in sorted(ids - stored.get(name, set()))[:5]:
+            problems.append(f"{name}: acknowledged add {transaction_id} is missing")
+    for name, ids in expected_absent.items():
+        for transaction_id in sorted(ids & stored.get(name, set()))[:5]:
+            problems.append(f"{name}: acknowledged delete {transaction_id} is still stored")
+
+    for name, prefix, rows, acknowledged in imports:
+        found = sum(1 for t in stored.get(name, set()) | deleted.get(name, set()) if t.startswith(prefix))
+        if found not in (0, int(rows)) or (acknowledged and found != int(rows)):
+            problems.append(f"{name}: import {prefix}* has {found} of {rows} rows")
+
+    # Committed but unacknowledged changes must have been redone by recovery
+    name_of_path = {transaction_file_path(user): user["name"] for user in users}
+    deleted_later = set()
+    for record in reversed(committed):
+        name = name_of_path.get(record["path"])
+        if record["op"] == "transaction.delete":
+            deleted_later.update(record["ids"])
+        elif record["op"] == "transaction.add":
+            for item in record["records"]:
+                if item["transaction_id"] not in deleted_later and item["transaction_id"] not in stored.get(name, ()):
+                    problems.append(f"{name}: committed add {item['transaction_id']} was not recovered")
+
+    if os.path.exists(WAL_FILE) and os.path.getsize(WAL_FILE) > 0:
+        problems.append("the log is not empty after recovery")
+    return problems
+
+
+def run_round(round_number, rng, operations, env):
+    """Run one writer until it dies; return (how it was killed, seconds it ran)."""
+    mode = rng.choice(FAULT_POINTS + ["kill", "kill"])
+    child_env = dict(env)
+    if mode in FAULT_POINTS:
+        child_env["PFM_WAL_FAULTS"] = f"{mode}:{rng.choice([0.02, 0.05, 0.2])}"
+    command = [sys.executable, os.path.abspath(__file__), "--child", str(round_number),
+               "--seed", str(rng.randrange(1 << 30)), "--operations", str(operations)]
+
+    start = time.perf_counter()
+    process = subprocess.Popen(command, env=child_env)
+    if mode == "kill":
+        try:
+            process.wait(timeout=rng.uniform(0.05, 1.5))
+        except subprocess.TimeoutExpired:
+            process.send_signal(signal.SIGKILL)
+    process.wait()
+    killed = process.returncode == -signal.SIGKILL
+    return (mode if killed else "finished"), time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kill a writer at random points and check recovery.")
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--operations", type=int, default=60, help="changes per writer before it stops by itself")
+    parser.add_argument("--users", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--child", type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child is not None:
+        writer(args.child, args.seed, args.operations)
+        return 0
+
+    rng = random.Random(args.seed)
+    env = dict(os.environ, PYTHONPATH=PROJECT_DIR)
+    env.pop("PFM_WAL_FAULTS", None)
+    failures = 0
+    outcomes = {}
+    totals = {"replayed": 0, "undone": 0, "skipped": 0}
+
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        users = synthetic_data.populate(users=args.users, transactions=200, recurring=5, seed=args.seed)
+        from pfm.write_ahead_log import recover
+
+        print("=" * 78)
+        print(f"💥 WAL FAULT INJECTION: {args.rounds} rounds, {args.users} users")
+        print("=" * 78)
+        print(f"{'round':>5} {'killed at':<11} {'ran':>6} {'log recs':>9} {'redone':>7} {'undone':>7}  result")
+        print("-" * 78)
+        for round_number in range(args.rounds):
+            mode, seconds = run_round(round_number, rng, args.operations, env)
+            with open(ACK_FILE) as file:
+                acks_before = file.read().splitlines()
+            committed = committed_changes()
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = recover()
+            problems = check(users, acks_before, committed) + result["errors"]
+
+            outcomes[mode] = outcomes.get(mode, 0) + 1
+            for key in totals:
+                totals[key] += result[key]
+            failures += bool(problems)
+            print(f"{round_number:>5} {mode:<11} {seconds:>5.2f}s {result['records']:>9} {result['replayed']:>7} "
+                  f"{result['undone']:>7}  {'❌' if problems else '✅'}", flush=True)
+            for problem in problems[:10]:
+                print(f"      {problem}")
+        os.chdir(PROJECT_DIR)
+
+    print("=" * 78)
+    print("Killed at: " + ", ".join(f"{mode} {count}" for mode, count in sorted(outcomes.items())))
+    print(f"Recovery redid {totals['replayed']} change(s), rolled back {totals['undone']} import batch(es), "
+          f"skipped {totals['skipped']} superseded change(s).")
+    print(f"{'❌' if failures else '✅'} {failures} of {args.rounds} round(s) violated an invariant")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
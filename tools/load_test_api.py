@@ -0,0 +1,199 @@
+"""
+Load test for the JSON API (pfm/api_server.py) on localhost.
+
+Generates synthetic data in a scratch folder (see synthetic_data.py),
+starts the API server on it in a separate process and then, for each
+concurrency level, runs that many client threads for a fixed time. Every
+client keeps one connection open (keep-alive) and sends --pipeline
+requests at a time before reading the responses. Prints requests/sec and
+latency percentiles per level.
+
+Usage (from the project root):
+    python tools/load_test_api.py --concurrency 1,2,4,8,16,32,64 --duration 5
+    python tools/load_test_api.py --pipeline 8
+    python tools/load_test_api.py --close          # new connection per request, for comparison
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synthetic_data  # noqa: E402
+
+
+def request_mix(username):
+    """The endpoints every client cycles through (a typical dashboard's reads)."""
+    base = f"/users/{username}"
+    return [
+        base,
+        f"{base}/transactions?limit=50&sort=date&order=desc",
+        f"{base}/transactions?category=food&from=2024-01-01&to=2024-12-31&limit=50",
+        f"{base}/reports/summary",
+        f"{base}/reports/summary?month=2025-01",
+        f"{base}/reports/monthly",
+        f"{base}/reports/forecast?months=6",
+        f"{base}/recurring",
+        "/users",
+        "/health",
+    ]
+
+
+def read_response(reader):
+    """Read one HTTP response from a buffered socket reader; return (status, body)."""
+    status_line = reader.readline()
+    if not status_line:
+        raise ConnectionError("server closed the connection")
+    status = int(status_line.split()[1])
+    length = 0
+    while True:
+        line = reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value)
+    return status, reader.read(length)
+
+
+def connect(host, port):
+    sock = socket.create_connection((host, port))
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock, sock.makefile("rb")
+
+
+def client(host, port, paths, start_index, pipeline, close, deadline, results):
+    """
+    Send requests until the deadline.
+
+    Appends (requests, errors, list of per-batch latencies in seconds) to results.
+    """
+    requests = errors = 0
+    latencies = []
+    sock = reader = None
+    i = start_index
+    try:
+        while time.perf_counter() < deadline:
+            if sock is None:
+                sock, reader = connect(host, port)
+            batch = [paths[(i + k) % len(paths)] for k in range(pipeline)]
+            i += pipeline
+            header = "Connection: close\r\n" if close else ""
+            payload = "".join(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n{header}\r\n" for path in batch)
+
+            start = time.perf_counter()
+            sock.sendall(payload.encode())
+            for _ in batch:
+                status, _ = read_response(reader)
+                requests += 1
+                if status != 200:
+                    errors += 1
+            latencies.append(time.perf_counter() - start)
+
+            if close:
+                reader.close()
+                sock.close()
+                sock = reader = None
+    except (OSError, ValueError):
+        errors += 1
+    finally:
+        if sock is not None:
+            reader.close()
+            sock.close()
+    results.append((requests, errors, latencies))
+
+
+def run_level(host, port, paths, concurrency, duration, pipeline, close):
+    """Run one concurrency level; return a result dict."""
+    results = []
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=client, args=(host, port, paths, n * 3, pipeline, close, deadline, results))
+        for n in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    requests = sum(r[0] for r in results)
+    latencies = sorted(latency for r in results for latency in r[2])
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": sum(r[1] for r in results),
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000 if latencies else 0.0,
+    }
+
+
+def start_server(data_dir):
+    """Start the API server on a free port in its own process; return (process, host, port)."""
+    env = dict(os.environ, PYTHONPATH=PROJECT_DIR)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "pfm.api_server", "--port", "0", "--db", os.path.join(data_dir, "data", "users.db")],
+        cwd=data_dir, env=env, stdout=subprocess.PIPE, text=True,
+    )
+    line = process.stdout.readline()  # "🌐 Serving on http://127.0.0.1:PORT (Ctrl+C to stop)"
+    address = line.split("http://", 1)[1].split()[0]
+    host, port = address.rsplit(":", 1)
+    return process, host, int(port)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure API requests/sec at several concurrency levels.")
+    parser.add_argument("--concurrency", default="1,2,4,8,16,32,64", help="comma-separated client counts")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per level")
+    parser.add_argument("--pipeline", type=int, default=1, help="requests sent before reading the responses")
+    parser.add_argument("--close", action="store_true", help="open a new connection for every request")
+    parser.add_argument("--transactions", type=int, default=10000, help="transactions per generated user")
+    parser.add_argument("--users", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if args.close and args.pipeline > 1:
+        parser.error("--pipeline needs keep-alive connections (drop --close)")
+
+    levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        users = synthetic_data.populate(users=args.users, transactions=args.transactions,
+                                        recurring=max(10, args.transactions // 1000), seed=args.seed)
+        os.chdir(PROJECT_DIR)
+        paths = [path for user in users for path in request_mix(user["name"])]
+
+        process, host, port = start_server(scratch)
+        try:
+            # Warm-up: load every user's files into the server's store
+            run_level(host, port, paths, 1, 0.5, 1, False)
+
+            print("=" * 78)
+            mode = "new connection per request" if args.close else f"keep-alive, pipeline {args.pipeline}"
+            print(f"🌐 API LOAD TEST: {args.users} users x {args.transactions:,} transactions, {mode}")
+            print("=" * 78)
+            print(f"{'clients':>8} {'requests':>10} {'errors':>7} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9}")
+            print("-" * 78)
+            for level in levels:
+                result = run_level(host, port, paths, level, args.duration, args.pipeline, args.close)
+                print(f"{result['concurrency']:>8} {result['requests']:>10,} {result['errors']:>7} "
+                      f"{result['rps']:>10,.0f} {result['p50_ms']:>9.2f} {result['p99_ms']:>9.2f}")
+            print("=" * 78)
+            print("Latency is per round trip (one batch of --pipeline requests).")
+        finally:
+            process.terminate()
+            process.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
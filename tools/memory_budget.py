@@ -0,0 +1,233 @@
+"""
+Memory budget check for storage, import/export and the reports.
+
+Runs each workload of benchmark_suite.py on synthetic data under
+tracemalloc and fails when the peak allocation per transaction goes over
+its budget in MEMORY_BUDGETS. Only memory allocated during the call is
+counted (the data the reports are given is already loaded), minus the
+workload's fixed allowance for buffers that do not grow with the data
+(read chunks, an import batch). For every
+workload over budget (or all of them with --top) the lines that held the
+most memory at the highest point are listed; that comes from a second run
+that takes tracemalloc snapshots from a background thread, so the
+snapshots never inflate the measured peak.
+
+Exit status 1 if any workload is over budget, so it can run in CI.
+
+Usage (from the project root):
+    python tools/memory_budget.py --sizes 10000,100000
+    python tools/memory_budget.py --only import --budget import_csv=3000,1048576 --top 15
+"""
+import argparse
+import contextlib
+import linecache
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import tracemalloc
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synthetic_data  # noqa: E402
+from benchmark_suite import BENCHMARKS, READ_ONLY, Context, scripted_input  # noqa: E402
+
+KB = 1024
+MB = 1024 * KB
+
+# Workload -> (peak bytes per transaction, fixed allowance in bytes)
+MEMORY_BUDGETS = {
+    "read_transaction_file": (1500, 1 * MB),
+    "import_csv": (2500, 1 * MB),
+    "import_csv_streaming": (100, 8 * MB),  # One batch of chunk_size rows
+    "export_csv": (1500, 1 * MB),
+    "export_csv_streaming": (50, 6 * MB),  # Read chunk, its decoded text and the CSV buffer
+    "dashboard_summary": (16, 256 * KB),
+    "report_monthly": (16, 256 * KB),
+    "report_category_breakdown": (16, 256 * KB),
+    "report_spending_trends": (16, 256 * KB),
+    "report_monthly_budget": (1500, 1 * MB),
+}
+
+SNAPSHOT_INTERVAL = 0.02  # Seconds between snapshots of the top-lines run
+SNAPSHOT_FRAMES = 1
+
+
+# =============================================================Measuring=================================================================
+
+def measure_peak(function, ctx, answers):
+    """Run a workload once; return the peak bytes it allocated."""
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink), scripted_input(answers):
+        tracemalloc.start()
+        try:
+            function(ctx)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+
+class Peak_Sampler(threading.Thread):
+    """Keeps the tracemalloc snapshot taken when the most memory was in use."""
+
+    def __init__(self, interval=SNAPSHOT_INTERVAL):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.snapshot = None
+        self.snapshot_bytes = -1
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        current = tracemalloc.get_traced_memory()[0]
+        if current > self.snapshot_bytes:
+            # The previous snapshot is freed first, so it does not count against this one
+            self.snapshot = None
+            self.snapshot = tracemalloc.take_snapshot()
+            self.snapshot_bytes = current
+
+
+def top_lines(function, ctx, answers, limit):
+    """Run a workload with the sampler; return [(bytes, blocks, "file:line", source)] at the sampled peak."""
+    sampler = Peak_Sampler()
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink), scripted_input(answers):
+        tracemalloc.start(SNAPSHOT_FRAMES)
+        sampler.start()
+        try:
+            function(ctx)
+            sampler.sample()  # The end of the run may be the highest point
+        finally:
+            sampler.stopped.set()
+            sampler.join()
+            tracemalloc.stop()
+
+    snapshot = sampler.snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, threading.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ])
+    lines = []
+    for stat in snapshot.statistics("lineno")[:limit]:
+        frame = stat.traceback[0]
+        filename = os.path.relpath(frame.filename, PROJECT_DIR) if frame.filename.startswith(PROJECT_DIR) \
+            else frame.filename
+        source = linecache.getline(frame.filename, frame.lineno).strip()
+        lines.append((stat.size, stat.count, f"{filename}:{frame.lineno}", source))
+    return lines
+
+
+def print_top_lines(lines):
+    for size, count, location, source in lines:
+        print(f"      {size / 1e6:>8.2f} MB {count:>9,} blocks  {location}")
+        if source:
+            print(f"      {'':>30}{source[:90]}")
+
+
+# =============================================================Runner=================================================================
+
+def run_size(size, names, budgets, top, seed):
+    """Generate data of the given size and check each workload against its budget."""
+    from pfm import ledger
+    from pfm.transaction_manager import read_transaction_file
+    from pfm.user_registry import User_Registry
+
+    user = synthetic_data.populate(users=1, transactions=size, recurring=max(10, size // 1000), seed=seed)[0]
+    pristine_dir = os.path.abspath(os.path.join("..", f"pristine_{size}"))
+    shutil.copytree("data", pristine_dir)
+    # Ledger updates go to the scratch registry, not the project's users.db
+    ledger._registry = User_Registry(db_file=os.path.abspath(os.path.join("data", "users.db")))
+
+    ctx = Context(size, user, pristine_dir)
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        ctx.transactions = read_transaction_file(user)
+
+    results = []
+    for name in names:
+        function, setup, answers = BENCHMARKS[name]
+
+        def prepare():
+            if setup:
+                with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+                    setup(ctx)
+
+        prepare()
+        peak = measure_peak(function, ctx, answers)
+        budget, allowance = budgets[name]
+        per_transaction = max(0, peak - allowance) / size
+        over = per_transaction > budget
+        result = {"workload": name, "size": size, "peak_bytes": peak,
+                  "bytes_per_transaction": per_transaction, "budget": budget, "over": over}
+        results.append(result)
+        print(f"{name:<28} {size:>10,} {peak / 1e6:>10.1f} MB {per_transaction:>10,.0f} B "
+              f"{budget:>9,} B  {'❌ over budget' if over else '✅'}")
+
+        if over or top:
+            if name not in READ_ONLY:
+                ctx.restore()
+            prepare()
+            print_top_lines(top_lines(function, ctx, answers, top or 10))
+
+        if name not in READ_ONLY:
+            ledger._registry.close()
+            ctx.restore()
+            ledger._registry = User_Registry(db_file=os.path.abspath(os.path.join("data", "users.db")))
+
+    ledger._registry.close()
+    ledger._registry = None
+    shutil.rmtree(pristine_dir, ignore_errors=True)
+    return results
+
+
+def parse_budgets(overrides):
+    """Return MEMORY_BUDGETS with the --budget NAME=BYTES[,ALLOWANCE] overrides applied."""
+    budgets = dict(MEMORY_BUDGETS)
+    for override in overrides or []:
+        name, _, value = override.partition("=")
+        values = value.split(",")
+        if name not in budgets or len(values) > 2 or not all(v.isdigit() for v in values):
+            raise SystemExit(f"invalid --budget '{override}' "
+                             f"(expected NAME=BYTES[,ALLOWANCE] with NAME one of {', '.join(budgets)})")
+        budgets[name] = (int(values[0]), int(values[1]) if len(values) > 1 else budgets[name][1])
+    return budgets
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check peak memory per transaction against budgets.")
+    parser.add_argument("--sizes", default="10000,100000", help="Comma-separated transaction counts")
+    parser.add_argument("--only", default=None, help="Check only workloads whose name contains this text")
+    parser.add_argument("--budget", action="append", metavar="NAME=BYTES[,ALLOWANCE]",
+                        help="Override a budget (bytes per transaction, optionally the fixed allowance); repeatable")
+    parser.add_argument("--top", type=int, default=0,
+                        help="Show this many top allocating lines for every workload (default: only when over)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    budgets = parse_budgets(args.budget)
+    names = [name for name in MEMORY_BUDGETS if not args.only or args.only in name]
+    sizes = [int(float(size)) for size in args.sizes.split(",") if size.strip()]
+
+    print(f"{'workload':<28} {'size':>10} {'peak':>13} {'per trans.':>12} {'budget':>11}")
+    print("-" * 80)
+    results = []
+    with tempfile.TemporaryDirectory() as scratch:
+        for size in sizes:
+            work_dir = os.path.join(scratch, f"run_{size}")
+            os.makedirs(work_dir)
+            os.chdir(work_dir)
+            results.extend(run_size(size, names, budgets, args.top, args.seed))
+            os.chdir(scratch)
+        os.chdir(PROJECT_DIR)
+
+    over = [r for r in results if r["over"]]
+    print("=" * 80)
+    print(f"{'❌' if over else '✅'} {len(over)} of {len(results)} check(s) over budget")
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,507 @@
+"""
+Regression checks for bugs that were fixed once and must stay fixed.
+
+Every check builds its own synthetic data in a scratch directory (never
+the project's data/users.db), runs one scenario end to end and returns a
+list of problems. The script exits with 1 if any check found one.
+
+Usage (from the project root):
+    python tools/regression_checks.py
+    python tools/regression_checks.py --only reimport_after_archive
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synthetic_data  # noqa: E402
+
+
+def scratch_user(transactions=400, seed=0):
+    """Populate ./data with one synthetic user and point the ledger at its registry; return the stored user."""
+    from pfm import ledger
+    from pfm.user_registry import User_Registry
+
+    name = synthetic_data.populate(users=1, transactions=transactions, recurring=5, seed=seed)[0]["name"]
+    ledger._registry = User_Registry(db_file=os.path.abspath(os.path.join("data", "users.db")))
+    return ledger._registry.get_user(name)
+
+
+# =============================================================Checks=================================================================
+
+def check_reimport_after_archive():
+    """Re-importing a full export after archiving must not add the archived rows again (merge or replace)."""
+    from pfm.archive import archive_transactions, archived_totals
+    from pfm.transaction_manager import (export_transactions_to_csv_streaming, import_transactions_from_csv,
+                                         import_transactions_from_csv_streaming, read_transaction_file)
+
+    problems = []
+    user = scratch_user()
+    with contextlib.redirect_stdout(io.StringIO()):
+        archived = archive_transactions(user)["archived"]
+        hot = len(read_transaction_file(user))
+        before = {key: user[key] for key in ("balance", "total_income", "total_expense")}
+        exported = export_transactions_to_csv_streaming(user, "full_export.csv")
+        stats = import_transactions_from_csv_streaming(user, "full_export.csv")
+
+    if not archived:
+        problems.append("the scenario archived nothing, so it checks nothing")
+    if exported != hot + archived_totals(user)["transactions"]:
+        problems.append(f"the export has {exported} rows, expected {hot} hot + {archived} archived")
+    if stats["imported"]:
+        problems.append(f"the re-import added {stats['imported']} transaction(s), expected 0")
+    if len(read_transaction_file(user)) != hot:
+        problems.append(f"the transactions file grew from {hot} to {len(read_transaction_file(user))} rows")
+    after = {key: user[key] for key in before}
+    if after != before:
+        problems.append(f"the totals changed from {before} to {after}")
+
+    # The replacing import reads "<name>_transactions.csv"
+    os.replace("full_export.csv", f"{user['name']}_transactions.csv")
+    with contextlib.redirect_stdout(io.StringIO()):
+        import_transactions_from_csv(user)
+    if len(read_transaction_file(user)) != hot:
+        problems.append(f"the replacing import left {len(read_transaction_file(user))} rows, expected {hot}")
+    after = {key: user[key] for key in before}
+    if after != before:
+        problems.append(f"the replacing import changed the totals from {before} to {after}")
+    return problems
+
+
+def check_archived_history_in_reports():
+    """The forecast's starting balance and the all-time category breakdown must include the archived months."""
+    from pfm.archive import archive_transactions, archived_months, archived_totals
+    from pfm.forecast import forecast_cash_flow
+    from pfm.recurring_transactions_manager import read_recurring_transaction_file
+    from pfm.transaction_manager import category_breakdown, read_transaction_file
+
+    problems = []
+    user = scratch_user()
+    with contextlib.redirect_stdout(io.StringIO()):
+        archive_transactions(user)
+    transactions = read_transaction_file(user)
+
+    forecast = forecast_cash_flow(transactions, read_recurring_transaction_file(user), months=3,
+                                  archived=archived_totals(user))
+    if round(forecast["starting_balance"] - user["balance"], 2):
+        problems.append(f"the forecast starts at ${forecast['starting_balance']:,.2f}, "
+                        f"the ledger balance is ${user['balance']:,.2f}")
+
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        category_breakdown(transactions, archived_months(user))
+    for label, amount in (("Total Income:", user["total_income"]), ("Total Expenses:", user["total_expense"])):
+        expected = f"{label:<18}${amount:>12,.2f}"
+        if expected not in buffer.getvalue():
+            problems.append(f"the category breakdown does not show '{expected.strip()}'")
+    return problems
+
+
+def check_monthly_budget_month_label():
+    """The monthly budget tracker must print the month as "YYYY-MM", not as its internal month key."""
+    import builtins
+    import datetime
+    from pfm.models import Transaction
+    from pfm.transaction_manager import add_transaction, show_monthly_budget
+
+    problems = []
+    user = scratch_user(transactions=50)
+    today = datetime.date.today()
+    buffer = io.StringIO()
+    prompt = builtins.input
+    builtins.input = lambda *args: "n"  # Keep the budget limit
+    try:
+        with contextlib.redirect_stdout(buffer):
+            add_transaction(user, Transaction("budget-check", "expense", user["id"], 12.34, today, "food", "check"))
+            show_monthly_budget(user)
+    finally:
+        builtins.input = prompt
+
+    lines = buffer.getvalue().splitlines()
+    label = f"Month: {today.strftime('%Y-%m')}"
+    if label not in lines:
+        shown = next((line for line in lines if line.startswith("Month:")), "no month line")
+        problems.append(f"expected '{label}', the tracker printed '{shown}'")
+    if "Total Spent: $12.34" not in lines:
+        problems.append("this month's expense is not in the total spent")
+    return problems
+
+
+def check_concurrent_registration():
+    """Registering a name another session took after the check must re-prompt, not overwrite that user."""
+    import builtins
+    from pfm.user_manager import User_Manager
+    from pfm.user_registry import User_Registry
+
+    problems = []
+    db_file = os.path.abspath(os.path.join("data", "users.db"))
+    os.makedirs("data", exist_ok=True)
+    other = User_Registry(db_file=db_file)
+    manager = User_Manager(User_Registry(db_file=db_file))
+    first = {"id": other.allocate_id(), "name": "Racer", "password": "first", "email": "first@example.com",
+             "balance": 0.0, "number_of_transactions": 0, "monthly_budget_limit": 1000.0}
+
+    def answer(prompt=""):
+        if "email" in prompt:
+            other.add_user("Racer", first)  # The other session wins the race
+            return "second@example.com"
+        if "password" in prompt:
+            return "Second1!"
+        return answers.pop(0)
+
+    answers = ["Racer", "Racer2"]
+    prompt = builtins.input
+    builtins.input = answer
+    try:
+        with contextlib.redirect_stdout(io.StringIO()) as buffer:
+            manager.register_user()
+            manager.save_users()
+    finally:
+        builtins.input = prompt
+
+    if other.get_user("Racer") != first:
+        problems.append(f"the first user's record was overwritten: {other.get_user('Racer')}")
+    if "⚠️ Username already exists." not in buffer.getvalue():
+        problems.append("the second session was not told the name is taken")
+    second = other.get_user("Racer2")
+    if second is None or second["email"] != "second@example.com":
+        problems.append(f"the second session did not register under the name it re-entered: {second}")
+    other.close()
+    manager.registry.close()
+    return problems
+
+
+def check_batch_uses_given_registry():
+    """run_batch(db_file=X) must keep the ledger and the transaction count of X up to date."""
+    from pfm import ledger
+    from pfm.batch_runner import run_batch
+    from pfm.ledger import compute_ledger
+    from pfm.transaction_manager import read_transaction_file
+    from pfm.user_registry import User_Registry
+
+    problems = []
+    user = scratch_user(transactions=100)
+    db_file = os.path.abspath(os.path.join("data", "users.db"))
+    # Like `pfm apply-recurring --all-users --db X`: nothing points the ledger at X beforehand
+    ledger._registry.close()
+    ledger._registry = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        summary = run_batch(["apply_recurring"], workers=1, db_file=db_file)
+    if summary["failed"]:
+        problems.append(f"the batch failed: {summary['results']}")
+
+    ledger._registry = User_Registry(db_file=db_file)
+    stored = ledger._registry.get_user(user["name"])
+    counted = stored["number_of_transactions"]  # Read before read_transaction_file() recounts it
+    transactions = read_transaction_file(stored)
+    if len(transactions) == user["number_of_transactions"]:
+        problems.append("no recurring transaction was applied, so the scenario checks nothing")
+    if counted != len(transactions):
+        problems.append(f"the registry counts {counted} transaction(s), the file has {len(transactions)}")
+    expected = compute_ledger(transactions)
+    if stored["balance"] != expected["balance"]:
+        problems.append(f"the registry balance is {stored['balance']:.2f} (was {user['balance']:.2f}), "
+                        f"the transactions add up to {expected['balance']:.2f}")
+    return problems
+
+
+def check_report_cache_after_outside_edit():
+    """A cached report must not be served after the transactions file was changed outside the program."""
+    import json
+    from pfm.paths import transaction_file_path
+    from pfm.report_cache import clear_report_cache, show_cached
+    from pfm.transaction_manager import category_breakdown, read_transaction_file
+
+    problems = []
+    user = scratch_user(transactions=100)
+
+    def cached_breakdown():
+        transactions, version = read_transaction_file(user, with_version=True)
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer):
+            show_cached(user, "category_breakdown", None, version, lambda: category_breakdown(transactions))
+        fresh = io.StringIO()
+        with contextlib.redirect_stdout(fresh):
+            category_breakdown(transactions)
+        return buffer.getvalue(), fresh.getvalue()
+
+    cached_breakdown()
+    # Restore an older copy by hand: the version counter in the .lock sidecar does not move
+    path = transaction_file_path(user)
+    with open(path) as file:
+        records = json.load(file)
+    with open(path, "w") as file:
+        json.dump(records[:50], file, indent=4)
+    clear_report_cache(disk=False)  # A restart: only the disk tier is left
+
+    shown, fresh = cached_breakdown()
+    if shown != fresh:
+        problems.append("the cache served the report of the file as it was before the outside edit")
+    return problems
+
+
+def check_new_ids_after_lost_id_counter():
+    """With .idseq gone, new transaction ids must not repeat ids kept in the archive."""
+    from pfm.archive import archive_transactions, iter_archived_records
+    from pfm.file_lock import write_json
+    from pfm.paths import transaction_file_path
+    from pfm.transaction_index import allocate_transaction_ids, id_sequence_file_path
+
+    problems = []
+    user = scratch_user(transactions=100)
+    with contextlib.redirect_stdout(io.StringIO()):
+        archive_transactions(user, months=0)
+    archived_ids = {record["transaction_id"] for record in iter_archived_records(user)}
+    # Only archived history left, and the counter cache lost
+    write_json(transaction_file_path(user), [])
+    user["number_of_transactions"] = 0
+    if os.path.exists(id_sequence_file_path(user)):
+        os.remove(id_sequence_file_path(user))
+
+    reused = set(allocate_transaction_ids(user, 10)) & archived_ids
+    if not archived_ids:
+        problems.append("the scenario archived nothing, so it checks nothing")
+    if reused:
+        problems.append(f"allocated id(s) already in the archive: {sorted(reused)}")
+    return problems
+
+
+def check_identical_lines_in_two_statements():
+    """Equal lines in two statement files are two transactions; importing the directory again adds nothing."""
+    from pfm.statement_importer import import_statements
+
+    problems = []
+    user = scratch_user(transactions=10)
+    os.makedirs("statements")
+    for day in ("monday", "tuesday"):
+        with open(os.path.join("statements", f"{day}.csv"), "w") as file:
+            file.write("date,amount,description\n2025-06-02,-4.50,COFFEE BAR\n")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        first = import_statements(user, "statements", settings={})
+        again = import_statements(user, "statements", settings={})
+    if first["imported"] != 2:
+        problems.append(f"the first import added {first['imported']} transaction(s), expected 2")
+    if again["imported"]:
+        problems.append(f"importing the directory again added {again['imported']} transaction(s)")
+    return problems
+
+
+def check_month_end_recurring_schedule():
+    """A monthly item on the 31st must apply without error and land where the forecast puts it."""
+    import calendar
+    import datetime
+    from pfm.dates import add_months
+    from pfm.forecast import expand_schedule
+    from pfm.models import RecurringTransaction, Transaction
+    from pfm.recurring_transactions_manager import (apply_recurring_transactions, read_recurring_transaction_file,
+                                                    save_recurring_transactions_to_file)
+
+    problems = []
+    user = scratch_user(transactions=10)
+    today = datetime.date.today()
+    # Overdue since the 31st of a month at least three months ago, so rolling it forward passes a shorter month
+    due = add_months(today.replace(day=1), -3)
+    while calendar.monthrange(due.year, due.month)[1] != 31:
+        due = add_months(due, -1)
+    due = due.replace(day=31)
+    bill = Transaction("rent-check", "expense", user["id"], 900.0, due, "rent", "month-end rent")
+    with contextlib.redirect_stdout(io.StringIO()):
+        save_recurring_transactions_to_file(user, [RecurringTransaction(bill, "monthly", due)])
+
+    forecast = expand_schedule(RecurringTransaction(bill, "monthly", due), today, add_months(today, 12))
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            apply_recurring_transactions(user)
+    except ValueError as e:
+        return [f"applying the item failed: {e}"]
+    next_date = read_recurring_transaction_file(user)[0].next_date
+    if len(forecast) < 2 or next_date.toordinal() != forecast[1]:
+        predicted = datetime.date.fromordinal(forecast[1]) if len(forecast) > 1 else None
+        problems.append(f"apply moved the item to {next_date}, the forecast predicts {predicted}")
+    return problems
+
+
+def check_api_includes_archive():
+    """The API's transaction list and reports must include the archived months, like the CLI."""
+    from pfm.api_server import Transaction_Store, route_monthly, route_summary, route_transactions
+    from pfm.archive import archive_transactions, archived_totals
+    from pfm.transaction_manager import read_transaction_file
+
+    problems = []
+    user = scratch_user()
+    with contextlib.redirect_stdout(io.StringIO()):
+        archive_transactions(user)
+    from pfm import ledger
+    store = Transaction_Store(ledger._registry)
+    name = user["name"]
+
+    expected = len(read_transaction_file(user)) + archived_totals(user)["transactions"]
+    listed = route_transactions(store, {}, name)["total"]
+    if listed != expected:
+        problems.append(f"/transactions lists {listed} transaction(s), expected {expected}")
+    income = round(sum(month["income"] for month in route_monthly(store, {}, name)), 2)
+    if income != user["total_income"]:
+        problems.append(f"/reports/monthly adds up to {income:.2f} income, the ledger has {user['total_income']:.2f}")
+    summary = route_summary(store, {}, name)
+    if summary["transactions"] != expected:
+        problems.append(f"/reports/summary counts {summary['transactions']} transaction(s), expected {expected}")
+    return problems
+
+
+def check_ledger_writes_only_totals():
+    """A ledger update must persist the running totals only, not the rest of the session's record."""
+    import datetime
+    from pfm.models import Transaction
+    from pfm.recurring_transactions_manager import read_recurring_transaction_file
+    from pfm.transaction_manager import add_transaction, read_transaction_file
+
+    problems = []
+    user = scratch_user(transactions=50)
+    from pfm import ledger
+    stored_before = ledger._registry.get_user(user["name"])
+
+    count = len(read_transaction_file(user))
+    read_recurring_transaction_file(user)
+    if user["number_of_transactions"] != count:
+        problems.append(f"reading the recurring items set the transaction count to {user['number_of_transactions']}")
+    user["email"] = "unsaved@example.com"  # Changed in the session, not saved yet
+    with contextlib.redirect_stdout(io.StringIO()):
+        add_transaction(user, Transaction("ledger-check", "income", user["id"], 10.0, datetime.date.today(),
+                                          "other", "check"))
+
+    stored = ledger._registry.get_user(user["name"])
+    if stored["email"] != stored_before["email"]:
+        problems.append("the ledger update saved the session's unsaved email")
+    if stored["balance"] != round(stored_before["balance"] + 10.0, 2):
+        problems.append(f"the stored balance is {stored['balance']:.2f}, expected {stored_before['balance'] + 10.0:.2f}")
+    if user["number_of_transactions"] != count + 1:
+        problems.append(f"the session counts {user['number_of_transactions']} transaction(s), expected {count + 1}")
+    return problems
+
+
+def check_deleted_file_with_stale_lock():
+    """A transactions file deleted behind its .lock sidecar must be recreated with a newer version."""
+    import datetime
+    from pfm.file_lock import get_version
+    from pfm.models import Transaction
+    from pfm.paths import transaction_file_path
+    from pfm.transaction_manager import add_transaction, read_transaction_file
+
+    problems = []
+    user = scratch_user(transactions=20)
+    path = transaction_file_path(user)
+    with contextlib.redirect_stdout(io.StringIO()):
+        add_transaction(user, Transaction("lock-check-1", "income", user["id"], 1.0, datetime.date.today(), "other"))
+    stale = get_version(path)
+    os.remove(path)  # The sidecar keeps its version
+
+    transactions, version = read_transaction_file(user, with_version=True)
+    if not os.path.exists(path):
+        problems.append("reading did not recreate the transactions file")
+    if version <= stale:
+        problems.append(f"the recreated file has version {version}, not newer than the old {stale}")
+    with contextlib.redirect_stdout(io.StringIO()):
+        added = add_transaction(user, Transaction("lock-check-2", "income", user["id"], 1.0, datetime.date.today(),
+                                                  "other"))
+    if not added or [t.transaction_id for t in read_transaction_file(user)] != ["lock-check-2"]:
+        problems.append("adding a transaction to the recreated file failed")
+    return problems
+
+
+def check_csv_error_lines():
+    """Both CSV importers must report the file line of a bad row, whatever the chunk or range size."""
+    from pfm.parallel_import import import_transactions_from_csv_parallel
+    from pfm.transaction_manager import import_transactions_from_csv_streaming
+
+    def write_csv(filename, prefix, quoted_break):
+        lines = ["transaction_id,type,amount,date,category,description"]
+        bad = []
+        for i in range(300):
+            lines.append(f"{prefix}{i},expense,{'abc' if i in (5, 150, 290) else '1.00'},2025-01-01,food,row")
+            if i in (5, 150, 290):
+                bad.append(sum(line.count("\n") + 1 for line in lines))
+            if i == 100:
+                lines.append("")  # Blank line
+            if i == 200 and quoted_break:
+                lines.append(f'{prefix}q,expense,1.00,2025-01-01,food,"two\nlines"')
+        with open(filename, "w", newline="") as file:
+            file.write("\n".join(lines) + "\n")
+        return [f"Line {line}:" for line in bad]
+
+    def reported(run):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            run()
+        return [line.split()[1] + " " + line.split()[2] for line in output.getvalue().splitlines() if " Line " in line]
+
+    problems = []
+    user = scratch_user(transactions=20)
+    # Quoted line breaks are only supported by the streaming import
+    expected = write_csv("streaming.csv", "s", quoted_break=True)
+    found = reported(lambda: import_transactions_from_csv_streaming(user, "streaming.csv", chunk_size=50))
+    if found != expected:
+        problems.append(f"streaming import reported {found}, expected {expected}")
+    expected = write_csv("parallel.csv", "p", quoted_break=False)
+    found = reported(lambda: import_transactions_from_csv_parallel(user, "parallel.csv", workers=2, range_bytes=2000))
+    if found != expected:
+        problems.append(f"parallel import reported {found}, expected {expected}")
+    return problems
+
+
+CHECKS = {
+    "reimport_after_archive": check_reimport_after_archive,
+    "archived_history_in_reports": check_archived_history_in_reports,
+    "monthly_budget_month_label": check_monthly_budget_month_label,
+    "concurrent_registration": check_concurrent_registration,
+    "batch_uses_given_registry": check_batch_uses_given_registry,
+    "report_cache_after_outside_edit": check_report_cache_after_outside_edit,
+    "new_ids_after_lost_id_counter": check_new_ids_after_lost_id_counter,
+    "identical_lines_in_two_statements": check_identical_lines_in_two_statements,
+    "month_end_recurring_schedule": check_month_end_recurring_schedule,
+    "api_includes_archive": check_api_includes_archive,
+    "ledger_writes_only_totals": check_ledger_writes_only_totals,
+    "deleted_file_with_stale_lock": check_deleted_file_with_stale_lock,
+    "csv_error_lines": check_csv_error_lines,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the regression checks in scratch directories.")
+    parser.add_argument("--only", choices=sorted(CHECKS), action="append", help="run only this check (repeatable)")
+    args = parser.parse_args(argv)
+
+    from pfm import ledger
+
+    failures = 0
+    print("=" * 78)
+    print("🧪 REGRESSION CHECKS")
+    print("=" * 78)
+    for name in args.only or list(CHECKS):
+        with tempfile.TemporaryDirectory() as scratch:
+            os.chdir(scratch)
+            try:
+                problems = CHECKS[name]()
+            except Exception as e:  # A crash is a failed check, the others still run
+                problems = [f"{type(e).__name__}: {e}"]
+            finally:
+                if ledger._registry is not None:
+                    ledger._registry.close()
+                    ledger._registry = None
+                os.chdir(PROJECT_DIR)
+        failures += bool(problems)
+        print(f"{'❌' if problems else '✅'} {name}")
+        for problem in problems:
+            print(f"      {problem}")
+    print("=" * 78)
+    print(f"{'❌' if failures else '✅'} {failures} check(s) failed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,126 @@
+"""
+Stress test for concurrent writers on the same user's transaction file.
+
+Starts several processes that all call add_transaction() for one user at
+the same time, then checks that every transaction made it to disk and
+that the user's running totals in the registry match a full recomputation
+(no ledger delta lost). The user lives in a scratch registry.
+
+Usage (from the project root):
+    python tools/stress_file_locking.py --processes 16 --transactions 50
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+STRESS_USER = "StressUser"
+
+
+def open_registry():
+    """Open the scratch registry (in the current directory) and make the ledger use it."""
+    from pfm import ledger
+    from pfm.user_registry import User_Registry
+
+    registry = User_Registry(db_file=os.path.abspath(os.path.join("data", "users.db")))
+    ledger._registry = registry
+    return registry
+
+
+def register_user():
+    registry = open_registry()
+    registry.add_user(STRESS_USER, {
+        "id": registry.allocate_id(), "name": STRESS_USER, "number_of_transactions": 0,
+        "balance": 0.0, "total_income": 0.0, "total_expense": 0.0,
+        "ledger_verified_at": datetime.date.today().isoformat(),
+    })
+    registry.close()
+
+
+def writer(worker_id, count, start_event):
+    from pfm.transaction_manager import Transaction, add_transaction
+
+    registry = open_registry()
+    user = registry.get_user(STRESS_USER)
+    start_event.wait()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for n in range(count):
+            transaction = Transaction(
+                f"w{worker_id}-{n}", "income" if n % 3 == 0 else "expense", user["id"],
+                round(1 + worker_id + n / 100, 2), datetime.date(2025, 1, 1), "other", f"writer {worker_id}", "cash",
+            )
+            add_transaction(user, transaction)
+            registry.update_user(user["name"], user)  # As the CLI saves the record after a command
+    registry.close()
+
+
+def run(processes, transactions):
+    from pfm.ledger import compute_ledger
+    from pfm.transaction_manager import read_transaction_file
+
+    register_user()
+
+    start_event = multiprocessing.Event()
+    workers = [
+        multiprocessing.Process(target=writer, args=(i, transactions, start_event))
+        for i in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+
+    started = time.perf_counter()
+    start_event.set()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    registry = open_registry()
+    user = registry.get_user(STRESS_USER)
+    with contextlib.redirect_stdout(io.StringIO()):
+        stored = read_transaction_file(user)
+    ids = {t.transaction_id for t in stored}
+    expected = {f"w{i}-{n}" for i in range(processes) for n in range(transactions)}
+    missing = expected - ids
+    totals = compute_ledger(stored)
+    drift = {key: (user.get(key), value) for key, value in totals.items() if user.get(key) != value}
+    registry.close()
+
+    print(f"Writers: {processes} x {transactions} transactions in {elapsed:.2f}s")
+    print(f"Stored : {len(stored)} (expected {len(expected)})")
+    print(f"Ledger : balance {user.get('balance')}, income {user.get('total_income')}, "
+          f"expense {user.get('total_expense')}")
+    failed = False
+    if missing or len(stored) != len(expected):
+        print(f"❌ Lost {len(missing)} transaction(s), {len(stored) - len(ids)} duplicate(s)")
+        failed = True
+    for key, (kept, recomputed) in drift.items():
+        print(f"❌ Ledger {key} is {kept}, a full recomputation gives {recomputed}")
+        failed = True
+    if failed:
+        return 1
+    print("✅ No transactions or ledger updates lost.")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--processes", type=int, default=16)
+    parser.add_argument("--transactions", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    # Work in a scratch directory with its own registry, so the real data is never touched
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        return run(args.processes, args.transactions)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,214 @@
+"""
+Deterministic synthetic data for benchmarks and load tests.
+
+Generates users, transactions and recurring items in the same format the
+application stores them. The same seed always produces the same data, so
+results can be compared across commits.
+
+Usage (from the project root, writes into ./data of the given directory):
+    python tools/synthetic_data.py --dir /tmp/pfm-data --users 10 --transactions 100000
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import random
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+CATEGORIES = ["food", "transport", "entertainment", "other"]
+PAYMENT_METHODS = ["cash", "credit", "debit", "other"]
+INCOME_CATEGORIES = ["salary", "other"]
+
+# Fixed "today" of the generated data, so every run produces the same files
+DEFAULT_END_DATE = datetime.date(2025, 6, 30)
+BENCH_PASSWORD = "Bench123!"
+
+
+def generate_users(count, seed=0):
+    """
+    Return user records for count users (BenchUser1, BenchUser2, ...).
+
+    Args:
+        count: Number of users
+        seed: Random seed
+
+    Returns:
+        list: User dicts in the format stored by the user registry
+    """
+    rng = random.Random(seed)
+    hashed = hashlib.sha256(BENCH_PASSWORD.encode()).hexdigest()
+    return [
+        {
+            "id": n,
+            "name": f"BenchUser{n}",
+            "password": hashed,
+            "email": f"bench{n}@example.com",
+            "balance": 0.0,
+            "number_of_transactions": 0,
+            "monthly_budget_limit": float(rng.choice([500, 1000, 1500, 2000])),
+        }
+        for n in range(1, count + 1)
+    ]
+
+
+def iter_transactions(user, count, seed=0, end_date=DEFAULT_END_DATE, years=5):
+    """
+    Yield transaction records for a user, oldest first.
+
+    About one in five transactions is income. Dates are spread over the
+    given number of years before end_date.
+
+    Args:
+        user: User dict
+        count: Number of transactions
+        seed: Random seed (combined with the user id)
+        end_date: Date of the newest transaction
+        years: How far back the history goes
+
+    Yields:
+        dict: Records in Transaction.to_dict() format
+    """
+    rng = random.Random(f"{seed}-{user['id']}")
+    last_day = end_date.toordinal()
+    span = 365 * years
+    days = sorted(last_day - rng.randrange(span) for _ in range(count)) if count <= 1_000_000 else None
+    iso_cache = {}
+
+    for n in range(count):
+        day = days[n] if days is not None else last_day - span + (n * span) // count
+        date_str = iso_cache.get(day)
+        if date_str is None:
+            date_str = iso_cache[day] = datetime.date.fromordinal(day).isoformat()
+        income = rng.random() < 0.2
+        yield {
+            "transaction_id": f"{user['name']}{n + 1}",
+            "type": "income" if income else "expense",
+            "user_id": user["id"],
+            "amount_cents": round((rng.uniform(500, 4000) if income else rng.uniform(1, 300)) * 100),
+            "date": date_str,
+            "category": rng.choice(INCOME_CATEGORIES if income else CATEGORIES),
+            "description": f"Synthetic {'income' if income else 'expense'} {n + 1}",
+            "payment_method": rng.choice(PAYMENT_METHODS),
+        }
+
+
+def generate_recurring(user, count, seed=0, today=None):
+    """
+    Return recurring item records for a user; about half of them are due.
+
+    Args:
+        user: User dict
+        count: Number of recurring items
+        seed: Random seed (combined with the user id)
+        today: Reference date for "due" (defaults to the real today)
+
+    Returns:
+        list: Records in RecurringTransaction.to_dict() format
+    """
+    rng = random.Random(f"recurring-{seed}-{user['id']}")
+    today = today or datetime.date.today()
+    items = []
+    for n in range(count):
+        income = n % 5 == 0
+        next_date = today + datetime.timedelta(days=rng.randrange(-20, 30))
+        items.append({
+            "transaction": {
+                "transaction_id": f"{user['name']}R{n + 1}",
+                "type": "income" if income else "expense",
+                "user_id": user["id"],
+                "amount_cents": round((rng.uniform(1000, 3000) if income else rng.uniform(5, 200)) * 100),
+                "date": next_date.isoformat(),
+                "category": "salary" if income else rng.choice(CATEGORIES),
+                "description": f"Synthetic recurring {n + 1}",
+                "payment_method": rng.choice(PAYMENT_METHODS),
+            },
+            "frequency": rng.choice(["weekly", "monthly"]),
+            "next_date": next_date.isoformat(),
+        })
+    return items
+
+
+def write_json_array(path, records, indent=4):
+    """
+    Write an iterable of records as a JSON array without building the list.
+
+    The output is identical to json.dump(list(records), file, indent=indent).
+
+    Returns:
+        int: Number of records written
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    pad = " " * indent
+    count = 0
+    with open(path, "w") as file:
+        file.write("[")
+        for record in records:
+            file.write(("\n" if count == 0 else ",\n") + pad + json.dumps(record, indent=indent).replace("\n", "\n" + pad))
+            count += 1
+        file.write("\n]" if count else "]")
+    return count
+
+
+def populate(users=1, transactions=1000, recurring=10, seed=0, end_date=DEFAULT_END_DATE):
+    """
+    Create users, transaction files and recurring files under ./data.
+
+    Must be called from the directory the application runs in (a scratch
+    directory for benchmarks). The users go into ./data/users.db.
+
+    Returns:
+        list: The generated user dicts (running totals filled in)
+    """
+    from pfm.transaction_manager import transaction_file_path
+    from pfm.recurring_transactions_manager import recurring_transaction_file_path
+    from pfm.user_registry import User_Registry
+
+    # A registry inside the current directory, never the project's own users.db
+    registry = User_Registry(db_file=os.path.abspath(os.path.join("data", "users.db")))
+    records = generate_users(users, seed)
+    try:
+        for user in records:
+            totals = {"income": 0, "expense": 0}  # Cents
+            count = 0
+
+            def tracked(items):
+                nonlocal count
+                for item in items:
+                    totals[item["type"]] += item["amount_cents"]
+                    count += 1
+                    yield item
+
+            write_json_array(transaction_file_path(user), tracked(iter_transactions(user, transactions, seed, end_date)))
+            write_json_array(recurring_transaction_file_path(user), generate_recurring(user, recurring, seed))
+            user["balance"] = (totals["income"] - totals["expense"]) / 100
+            user["total_income"] = totals["income"] / 100
+            user["total_expense"] = totals["expense"] / 100
+            user["number_of_transactions"] = count
+            registry.save_user(user["name"], user)
+    finally:
+        registry.close()
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate deterministic synthetic finance data.")
+    parser.add_argument("--dir", default=".", help="Directory that gets the data/ folder")
+    parser.add_argument("--users", type=int, default=1)
+    parser.add_argument("--transactions", type=int, default=1000, help="Transactions per user")
+    parser.add_argument("--recurring", type=int, default=10, help="Recurring items per user")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.dir, exist_ok=True)
+    os.chdir(args.dir)
+    users = populate(args.users, args.transactions, args.recurring, args.seed)
+    print(f"✅ Generated {len(users)} user(s) x {args.transactions:,} transactions in {os.path.abspath('data')}")
+    print(f"   Password for every user: {BENCH_PASSWORD}")
+
+
+if __name__ == "__main__":
+    main()